@@ -19,8 +19,92 @@ class Settings(BaseSettings):
     openai_api_key_base64: str
     _openai_api_key_decoded: Optional[str] = None
     
+    # Shared OpenAI client connection pool (timeouts in seconds)
+    openai_max_connections: int = 20
+    openai_max_keepalive_connections: int = 10
+    openai_keepalive_expiry: float = 60.0
+    openai_connect_timeout: float = 5.0
+    openai_read_timeout: float = 60.0
+    openai_max_retries: int = 2
+    openai_warmup: bool = True
+    
+    # OpenAI account rate limits enforced before requests are sent (interactive work goes first)
+    openai_governor_enabled: bool = True
+    openai_rpm_limit: int = 500
+    openai_tpm_limit: int = 200000
+    
+    # On-disk cache of generated chronicles (size in MiB, age in days)
+    chronicle_cache_enabled: bool = True
+    chronicle_cache_path: str = "data/chronicles.sqlite3"
+    chronicle_cache_max_mb: int = 64
+    chronicle_cache_max_age_days: float = 30.0
+    
+    # Stream chronicles into the confirmation message (seconds between message edits)
+    chronicle_streaming: bool = True
+    chronicle_stream_edit_interval: float = 1.5
+    
+    # Start writing the chronicle when the bot purpose arrives (unclaimed results kept for ttl seconds)
+    chronicle_speculation: bool = True
+    chronicle_speculation_ttl: float = 600.0
+    
     # Symfony API
     symfony_api_url: str = "http://127.0.0.1:8000/api/telegram"
+    symfony_cache_ttl: float = 30.0
+    symfony_cache_maxsize: int = 1024
+    symfony_page_size: int = 500
+    
+    # Registry delta sync: keep a local mirror and fetch only users updated since the last sync.
+    # Deletions without a tombstone are only seen by the full resync, so keep it within a day
+    registry_delta_sync: bool = True
+    registry_full_resync_hours: float = 24.0
+    
+    # Local SQLite read replica of users and bots (served while younger than max age, in seconds)
+    local_store_enabled: bool = True
+    local_store_path: str = "data/registry.sqlite3"
+    local_store_max_age: float = 900.0
+    
+    # Symfony API connection pool ("aiohttp" for HTTP/1.1, "httpx" for HTTP/2)
+    symfony_transport: str = "aiohttp"
+    symfony_pool_limit: int = 100
+    symfony_pool_limit_per_host: int = 20
+    symfony_keepalive_timeout: float = 30.0
+    symfony_dns_cache_ttl: int = 300
+    symfony_connect_timeout: float = 3.0
+    symfony_read_timeout: float = 10.0
+    symfony_pool_warmup: int = 4
+    
+    # Symfony API retries (idempotent requests) and per-endpoint circuit breakers
+    symfony_retry_attempts: int = 3
+    symfony_retry_base_delay: float = 0.2
+    symfony_retry_max_delay: float = 2.0
+    symfony_breaker_failure_threshold: int = 5
+    symfony_breaker_reset_timeout: float = 30.0
+    
+    # JSON codec for Symfony payloads: auto, orjson, msgspec or json
+    symfony_json_codec: str = "auto"
+    
+    # Conditional GETs (ETag/Last-Modified body cache, 0 disables) and gzip request bodies
+    symfony_conditional_cache_mb: int = 32
+    symfony_gzip_requests: bool = False
+    
+    # Write-behind user upserts (window in seconds)
+    symfony_upsert_window: float = 0.25
+    symfony_upsert_max_batch: int = 100
+    symfony_upsert_concurrency: int = 10
+    
+    # Batched bot lookups (owners per request, parallel single lookups without a bulk endpoint)
+    symfony_bots_batch_size: int = 100
+    symfony_lookup_concurrency: int = 10
+    
+    # Whether POST /user answers 201 on creation; lets /start skip the lookup sent alongside
+    # the upsert (learned automatically from the first 201 otherwise)
+    symfony_upsert_reports_created: bool = False
+    
+    # Seconds completed bot registrations are remembered to collapse duplicate submissions
+    symfony_idempotency_ttl: float = 600.0
+    # Retry POST /bot on network errors and 5xx (enable only once the backend honours
+    # the Idempotency-Key header, otherwise a retry can register the bot twice)
+    symfony_retry_bot_posts: bool = False
     
     # Telegram Channel (optional)
     telegram_channel_id: Optional[int] = None
@@ -32,6 +116,29 @@ class Settings(BaseSettings):
     report_time: str = "09:00"
     timezone: str = "UTC"
     
+    # Minutes before report_time the registry is prefetched and the report pre-generated,
+    # so report_time only delivers (0 runs the stage at delivery instead)
+    report_prefetch_lead_minutes: int = 30
+    report_pregenerate_lead_minutes: int = 15
+    
+    # Species Report examples: most common purposes/interests, clustered by near-duplicates
+    report_examples: int = 10
+    report_examples_token_budget: int = 300
+    
+    # Incremental reports: after each report, a snapshot of user/bot content hashes is
+    # saved and the next report covers only what changed since
+    report_delta_enabled: bool = True
+    report_snapshot_path: str = "data/report_snapshot.npz"
+    
+    # Archive of generated reports; when the ecosystem fingerprint matches an archived
+    # report it is reused ("reuse" as-is, "refresh" with an unchanged-since note,
+    # "regenerate" never reuses) until it is older than the max age in days
+    report_archive_enabled: bool = True
+    report_archive_path: str = "data/reports.sqlite3"
+    report_archive_keep: int = 90
+    report_reuse_policy: str = "refresh"
+    report_reuse_max_age_days: float = 7.0
+    
     # Logging
     log_level: str = "INFO"
     
@@ -3,12 +3,40 @@ from typing import Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from aiogram import Bot
+    from openai import AsyncOpenAI
+    from services.chronicle_cache import ChronicleCache
+    from services.llm_governor import LLMGovernor
+    from services.report_archive import ReportArchive
+    from services.speculation import ChronicleSpeculator
+    from services.local_store import LocalStore
+    from services.registry_mirror import RegistryMirror
     from services.symfony_api import SymfonyAPI
 
 
 # Global Symfony API instance
 symfony_api: Optional["SymfonyAPI"] = None
 
+# Global registry mirror (None when delta sync is disabled)
+registry_mirror: Optional["RegistryMirror"] = None
+
+# Global SQLite read replica (None when disabled)
+local_store: Optional["LocalStore"] = None
+
+# Global pooled OpenAI client
+llm_client: Optional["AsyncOpenAI"] = None
+
+# Global OpenAI rate governor (None when disabled)
+llm_governor: Optional["LLMGovernor"] = None
+
+# Global cache of generated chronicles (None when disabled)
+chronicle_cache: Optional["ChronicleCache"] = None
+
+# Global archive of generated Species Reports (None when disabled)
+report_archive: Optional["ReportArchive"] = None
+
+# Global speculative chronicle generation (None when disabled)
+chronicle_speculator: Optional["ChronicleSpeculator"] = None
+
 # Global Bot instance
 _bot_instance: Optional["Bot"] = None
 
@@ -24,6 +52,83 @@ def set_symfony_api(api: "SymfonyAPI") -> None:
     symfony_api = api
 
 
+def get_registry_mirror() -> Optional["RegistryMirror"]:
+    """Get the global registry mirror."""
+    return registry_mirror
+
+
+def set_registry_mirror(mirror: "RegistryMirror") -> None:
+    """Set the global registry mirror."""
+    global registry_mirror
+    registry_mirror = mirror
+
+
+def get_local_store() -> Optional["LocalStore"]:
+    """Get the global local read replica."""
+    return local_store
+
+
+def set_local_store(store: "LocalStore") -> None:
+    """Set the global local read replica."""
+    global local_store
+    local_store = store
+
+
+def get_llm_client() -> Optional["AsyncOpenAI"]:
+    """Get the global OpenAI client."""
+    return llm_client
+
+
+def set_llm_client(client: "AsyncOpenAI") -> None:
+    """Set the global OpenAI client."""
+    global llm_client
+    llm_client = client
+
+
+def get_llm_governor() -> Optional["LLMGovernor"]:
+    """Get the global OpenAI rate governor."""
+    return llm_governor
+
+
+def set_llm_governor(governor: "LLMGovernor") -> None:
+    """Set the global OpenAI rate governor."""
+    global llm_governor
+    llm_governor = governor
+
+
+def get_chronicle_cache() -> Optional["ChronicleCache"]:
+    """Get the global chronicle cache."""
+    return chronicle_cache
+
+
+def set_chronicle_cache(cache: "ChronicleCache") -> None:
+    """Set the global chronicle cache."""
+    global chronicle_cache
+    chronicle_cache = cache
+
+
+def get_report_archive() -> Optional["ReportArchive"]:
+    """Get the global report archive."""
+    return report_archive
+
+
+def set_report_archive(archive: "ReportArchive") -> None:
+    """Set the global report archive."""
+    global report_archive
+    report_archive = archive
+
+
+def get_chronicle_speculator() -> Optional["ChronicleSpeculator"]:
+    """Get the global chronicle speculator."""
+    return chronicle_speculator
+
+
+def set_chronicle_speculator(speculator: "ChronicleSpeculator") -> None:
+    """Set the global chronicle speculator."""
+    global chronicle_speculator
+    chronicle_speculator = speculator
+
+
 def get_bot() -> Optional["Bot"]:
     """Get the global Bot instance."""
     return _bot_instance
@@ -18,6 +18,14 @@ from bot import dependencies
 # Removed database imports - now using Symfony API exclusively
 from handlers import user_router
 from scheduler import setup_scheduler, shutdown_scheduler
+from services.chronicle_cache import ChronicleCache
+from services.llm_client import create_llm_client, warm_up_llm_client
+from services.llm_governor import LLMGovernor
+from services.local_store import LocalStore
+from services.openai_service import CHRONICLE_PROMPT_VERSION
+from services.report_archive import ReportArchive
+from services.speculation import ChronicleSpeculator
+from services.registry_mirror import RegistryMirror
 from services.symfony_api import SymfonyAPI
 
 
@@ -44,10 +52,72 @@ async def on_startup(bot: Bot) -> None:
     # Database initialization removed - using Symfony API exclusively
     
     # Initialize Symfony API client
-    symfony_api = SymfonyAPI(settings.symfony_api_url)
+    symfony_api = SymfonyAPI.from_settings(settings)
     dependencies.set_symfony_api(symfony_api)
     logger.info(f"Symfony API client initialized: {settings.symfony_api_url}")
     
+    # Pre-open pooled connections before the first user request arrives
+    await symfony_api.warm_up(settings.symfony_pool_warmup)
+    
+    # One pooled OpenAI client for chronicles and reports
+    llm_client = create_llm_client(
+        settings.openai_api_key,
+        max_connections=settings.openai_max_connections,
+        max_keepalive_connections=settings.openai_max_keepalive_connections,
+        keepalive_expiry=settings.openai_keepalive_expiry,
+        connect_timeout=settings.openai_connect_timeout,
+        read_timeout=settings.openai_read_timeout,
+        max_retries=settings.openai_max_retries
+    )
+    dependencies.set_llm_client(llm_client)
+    if settings.openai_warmup:
+        await warm_up_llm_client(llm_client)
+    if settings.openai_governor_enabled:
+        dependencies.set_llm_governor(LLMGovernor(rpm=settings.openai_rpm_limit, tpm=settings.openai_tpm_limit))
+        logger.info(f"OpenAI rate governor: {settings.openai_rpm_limit} RPM, {settings.openai_tpm_limit} TPM")
+    
+    # Repeated registrations reuse chronicles instead of regenerating them
+    if settings.chronicle_cache_enabled:
+        chronicle_cache = ChronicleCache(
+            settings.chronicle_cache_path,
+            max_bytes=settings.chronicle_cache_max_mb * 1024 * 1024,
+            max_age=settings.chronicle_cache_max_age_days * 24 * 3600
+        )
+        chronicle_cache.purge(keep_version=CHRONICLE_PROMPT_VERSION)
+        dependencies.set_chronicle_cache(chronicle_cache)
+        logger.info(f"Chronicle cache opened: {settings.chronicle_cache_path}")
+    
+    # An unchanged ecosystem reuses its archived Species Report instead of regenerating it
+    if settings.report_archive_enabled:
+        dependencies.set_report_archive(ReportArchive(
+            settings.report_archive_path,
+            policy=settings.report_reuse_policy,
+            max_reuse_age=settings.report_reuse_max_age_days * 24 * 3600,
+            keep=settings.report_archive_keep
+        ))
+        logger.info(f"Report archive opened: {settings.report_archive_path} (policy: {settings.report_reuse_policy})")
+    
+    if settings.chronicle_speculation:
+        dependencies.set_chronicle_speculator(ChronicleSpeculator(ttl=settings.chronicle_speculation_ttl))
+        logger.info("Speculative chronicle generation enabled")
+    
+    # Local read replica keeps lookups fast and available while BB.Center is down
+    local_store = None
+    if settings.local_store_enabled:
+        local_store = LocalStore(settings.local_store_path, max_age=settings.local_store_max_age)
+        dependencies.set_local_store(local_store)
+        logger.info(f"Local store opened: {settings.local_store_path}")
+    
+    # Registry mirror lets reports fetch only users changed since the last sync
+    if settings.registry_delta_sync:
+        registry_mirror = RegistryMirror(
+            full_resync_interval=settings.registry_full_resync_hours * 3600,
+            store=local_store
+        )
+        await registry_mirror.restore()
+        dependencies.set_registry_mirror(registry_mirror)
+        logger.info("Registry delta sync enabled")
+    
     # Setup scheduler for daily reports
     setup_scheduler(bot)
     
@@ -64,8 +134,43 @@ async def on_shutdown() -> None:
     # Close Symfony API client
     symfony_api = dependencies.get_symfony_api()
     if symfony_api:
+        logger.info(f"Symfony API pool stats: {symfony_api.pool_stats()}")
+        logger.info(f"Symfony API circuit state: {symfony_api.circuit_state()}")
+        logger.info(f"Symfony API write-behind stats: {symfony_api.write_behind_stats()}")
         await symfony_api.close()
     
+    registry_mirror = dependencies.get_registry_mirror()
+    if registry_mirror:
+        logger.info(f"Registry mirror stats: {registry_mirror.stats()}")
+    
+    local_store = dependencies.get_local_store()
+    if local_store:
+        logger.info(f"Local store stats: {local_store.stats()}")
+        local_store.close()
+    
+    chronicle_speculator = dependencies.get_chronicle_speculator()
+    if chronicle_speculator:
+        logger.info(f"Chronicle speculation stats: {chronicle_speculator.stats()}")
+        chronicle_speculator.close()
+    
+    report_archive = dependencies.get_report_archive()
+    if report_archive:
+        logger.info(f"Report archive stats: {report_archive.stats()}")
+        report_archive.close()
+    
+    chronicle_cache = dependencies.get_chronicle_cache()
+    if chronicle_cache:
+        logger.info(f"Chronicle cache stats: {chronicle_cache.stats()}")
+        chronicle_cache.close()
+    
+    llm_governor = dependencies.get_llm_governor()
+    if llm_governor:
+        logger.info(f"OpenAI rate governor stats: {llm_governor.stats()}")
+    
+    llm_client = dependencies.get_llm_client()
+    if llm_client:
+        await llm_client.close()
+    
     # Database connections removed - using Symfony API exclusively
     
     logger.success("✅ Bot shutdown completed")
@@ -1,4 +1,7 @@
 """User interaction handlers."""
+import asyncio
+from typing import Optional
+
 from aiogram import Router, F
 from aiogram.filters import CommandStart, Command
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
@@ -7,15 +10,51 @@ from aiogram.fsm.state import State, StatesGroup
 from loguru import logger
 
 from services.api_repository import ApiUserRepository, ApiBotRepository
-from bot.dependencies import get_symfony_api, get_bot
+from bot.dependencies import get_symfony_api, get_bot, get_local_store, get_chronicle_speculator
 from services.telegram_publisher import TelegramPublisher
 from services.openai_service import OpenAIService
+from services.progressive_message import ProgressiveMessage
 from bot.config import settings
 
 
 router = Router()
 
 
+REGISTRY_UNAVAILABLE_TEXT = (
+    "⚠️ BB.Center временно недоступен.\n\n"
+    "Попробуйте, пожалуйста, через минуту."
+)
+
+
+# BB.Center endpoints each command depends on (keys of SymfonyAPI's circuit breakers)
+START_ENDPOINTS = ("GET /user/{id}", "POST /user")
+ADD_BOT_ENDPOINTS = ("POST /bot",)
+MY_BOTS_ENDPOINTS = ("GET /user/{id}/bots", "GET /bots")
+
+
+def registry_unavailable(*endpoints: str) -> bool:
+    """Check whether the given BB.Center endpoints are currently failing fast."""
+    symfony_api = get_symfony_api()
+    return bool(symfony_api and symfony_api.is_degraded(*endpoints))
+
+
+async def speculative_result(task: asyncio.Task) -> Optional[str]:
+    """
+    Wait for a speculative chronicle.
+    
+    Returns:
+        The chronicle, or None if the speculator cancelled the task (shutdown or close)
+    """
+    try:
+        # Shielded so only our own cancellation, not the task's, is told apart below
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        if not task.cancelled():
+            raise
+        logger.info("Speculative chronicle was cancelled, generating it now")
+        return None
+
+
 class RegistrationStates(StatesGroup):
     """States for user registration process."""
     waiting_for_bio = State()
@@ -34,22 +73,20 @@ class BotRegistrationStates(StatesGroup):
 @router.message(CommandStart())
 async def cmd_start(message: Message) -> None:
     """Handle /start command."""
-    user = await ApiUserRepository.get_by_telegram_id(message.from_user.id)
-    symfony_api = get_symfony_api()
+    if registry_unavailable(*START_ENDPOINTS):
+        await message.answer(REGISTRY_UNAVAILABLE_TEXT)
+        return
     
-    if user:
-        # Sync existing user with Symfony API
-        if symfony_api:
-            try:
-                await symfony_api.upsert_user(
-                    telegram_id=str(message.from_user.id),
-                    username=message.from_user.username
-                )
-            except Exception as e:
-                logger.warning(f"Failed to sync user with Symfony API: {e}")
-        
+    # One call creates or syncs the user; unchanged known users cost no request
+    user = await ApiUserRepository.ensure_user(
+        telegram_id=message.from_user.id,
+        username=message.from_user.username,
+        full_name=message.from_user.full_name or "Пользователь"
+    )
+    
+    if user and not user.is_new:
         await message.answer(
-            f"👋 С возвращением, {user.full_name}!\n\n"
+            f"👋 С возвращением, {user.full_name or message.from_user.full_name}!\n\n"
             "Доступные команды:\n"
             "/profile - Обновить профиль\n"
             "/add_bot - Добавить нового бота\n"
@@ -57,25 +94,6 @@ async def cmd_start(message: Message) -> None:
             "/help - Помощь"
         )
     else:
-        # Create new user via API
-        await ApiUserRepository.create(
-            telegram_id=message.from_user.id,
-            username=message.from_user.username,
-            full_name=message.from_user.full_name or "Пользователь"
-        )
-        
-        # Sync new user with Symfony API
-        if symfony_api:
-            try:
-                result = await symfony_api.upsert_user(
-                    telegram_id=str(message.from_user.id),
-                    username=message.from_user.username
-                )
-                if result.get("status") != "success":
-                    logger.warning(f"Symfony API returned non-success status: {result}")
-            except Exception as e:
-                logger.warning(f"Failed to sync new user with Symfony API: {e}")
-        
         await message.answer(
             "👋 Привет! Я boto-sapiens - бот для изучения экосистемы Telegram ботов.\n\n"
             "🧬 Я собираю информацию о вас и ваших ботах, чтобы создавать ежедневные отчеты "
@@ -130,6 +148,10 @@ async def process_interests(message: Message, state: FSMContext) -> None:
 @router.message(Command("add_bot"))
 async def cmd_add_bot(message: Message, state: FSMContext) -> None:
     """Start bot registration."""
+    if registry_unavailable(*ADD_BOT_ENDPOINTS):
+        await message.answer(REGISTRY_UNAVAILABLE_TEXT)
+        return
+    
     await message.answer(
         "🤖 Давайте добавим информацию о вашем боте!\n\n"
         "Как называется ваш бот?"
@@ -178,33 +200,33 @@ async def process_bot_purpose(message: Message, state: FSMContext) -> None:
     # Change state immediately to prevent duplicate processing
     await state.set_state(BotRegistrationStates.waiting_for_publish_confirmation)
     
-    symfony_api = get_symfony_api()
-    
-    # Save bot via API
+    # Save bot via API (one idempotent write keyed by the submitting message,
+    # so redelivered updates are collapsed but identical bots are not)
     bot_record = await ApiBotRepository.create(
         owner_telegram_id=message.from_user.id,
         bot_name=data["bot_name"],
         bot_username=data.get("bot_username"),
         bot_description=data["bot_description"],
-        bot_purpose=message.text
+        bot_purpose=message.text,
+        idempotency_key=f"msg:{message.chat.id}:{message.message_id}"
     )
     
-    # Sync bot with Symfony API
-    if symfony_api and data.get("bot_username"):
-        try:
-            result = await symfony_api.add_bot(
-                telegram_id=str(message.from_user.id),
-                bot_username=data["bot_username"],
-                description=data["bot_description"]
+    # The bot exists and all chronicle inputs are known: start writing it while the user decides
+    speculator = get_chronicle_speculator()
+    if speculator and bot_record is not None:
+        speculator.start(
+            (message.from_user.id, message.chat.id),
+            lambda: OpenAIService().generate_single_species_chronicle(
+                bot_name=data["bot_name"],
+                bot_username=data.get("bot_username"),
+                description=data["bot_description"],
+                purpose=message.text
             )
-            if result.get("status") != "success":
-                logger.warning(f"Symfony API returned non-success status for bot: {result}")
-        except Exception as e:
-            logger.warning(f"Failed to sync bot with Symfony API: {e}")
+        )
     
     # Store complete bot data in state for callback handlers
     await state.update_data(
-        bot_id=bot_record.get('id') if bot_record else None,
+        bot_id=bot_record.id if bot_record else None,
         bot_purpose=message.text,
         creator_name=message.from_user.full_name or message.from_user.username or "Anonymous"
     )
@@ -212,8 +234,8 @@ async def process_bot_purpose(message: Message, state: FSMContext) -> None:
     # Show confirmation dialog for chronicle publishing
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
         [
-            InlineKeyboardButton(text="✅ Yes", callback_data=f"publish_yes:{bot_record.get('id') if bot_record else 'unknown'}"),
-            InlineKeyboardButton(text="❌ No", callback_data=f"publish_no:{bot_record.get('id') if bot_record else 'unknown'}")
+            InlineKeyboardButton(text="✅ Yes", callback_data=f"publish_yes:{bot_record.id if bot_record else 'unknown'}"),
+            InlineKeyboardButton(text="❌ No", callback_data=f"publish_no:{bot_record.id if bot_record else 'unknown'}")
         ]
     ])
     
@@ -247,12 +269,31 @@ async def process_publish_confirmed(callback: CallbackQuery, state: FSMContext)
     try:
         # Generate chronicle via OpenAI
         openai_service = OpenAIService()
-        chronicle = await openai_service.generate_single_species_chronicle(
+        chronicle_input = dict(
             bot_name=data.get("bot_name"),
             bot_username=data.get("bot_username"),
             description=data.get("bot_description"),
             purpose=data.get("bot_purpose")
         )
+        progress = None
+        if settings.chronicle_streaming:
+            progress = ProgressiveMessage(
+                callback.message,
+                header="✅ Bot successfully added!\n\n",
+                min_interval=settings.chronicle_stream_edit_interval
+            )
+        
+        speculator = get_chronicle_speculator()
+        speculative = speculator.take((callback.from_user.id, callback.message.chat.id)) if speculator else None
+        # Usually already finished while the user was deciding
+        chronicle = await speculative_result(speculative) if speculative is not None else None
+        if chronicle is None and progress is not None:
+            # Show the chronicle as it is written instead of after the whole completion
+            async for delta in openai_service.stream_single_species_chronicle(**chronicle_input):
+                await progress.append(delta)
+            chronicle = progress.text
+        elif chronicle is None:
+            chronicle = await openai_service.generate_single_species_chronicle(**chronicle_input)
         
         # Publish to channel if configured
         if bot_instance and settings.telegram_channel_id:
@@ -260,27 +301,21 @@ async def process_publish_confirmed(callback: CallbackQuery, state: FSMContext)
             success = await publisher.post_species_report(chronicle)
             
             if success:
-                await callback.message.edit_text(
-                    "✅ Bot successfully added!\n\n"
-                    "📜 The Chronicle has been written and published to the archives.\n\n"
-                    "You can add more bots: /add_bot\n"
-                    "Or view your bots: /my_bots"
-                )
+                status = "📜 The Chronicle has been written and published to the archives."
             else:
-                await callback.message.edit_text(
-                    "✅ Bot successfully added!\n\n"
+                status = (
                     "📜 Chronicle was generated but could not be published to the channel.\n"
-                    "The bot is saved in the database.\n\n"
-                    "You can add more bots: /add_bot\n"
-                    "Or view your bots: /my_bots"
+                    "The bot is saved in the database."
                 )
         else:
-            await callback.message.edit_text(
-                "✅ Bot successfully added!\n\n"
-                "📜 Chronicle generated, but channel is not configured.\n\n"
-                "You can add more bots: /add_bot\n"
-                "Or view your bots: /my_bots"
-            )
+            status = "📜 Chronicle generated, but channel is not configured."
+        status += "\n\nYou can add more bots: /add_bot\nOr view your bots: /my_bots"
+        
+        if progress is not None:
+            # Keep the streamed chronicle visible above the outcome
+            await progress.finish(f"{chronicle}\n\n{status}")
+        else:
+            await callback.message.edit_text(f"✅ Bot successfully added!\n\n{status}")
             
     except Exception as e:
         logger.error(f"Failed to generate or publish chronicle: {e}")
@@ -304,6 +339,11 @@ async def process_publish_declined(callback: CallbackQuery, state: FSMContext) -
     # Log decision
     logger.info(f"User {callback.from_user.id} declined to publish chronicle for bot: {data.get('bot_name')}")
     
+    # Stop a speculative chronicle that is still being written
+    speculator = get_chronicle_speculator()
+    if speculator:
+        speculator.discard((callback.from_user.id, callback.message.chat.id))
+    
     # Answer callback to remove loading state
     await callback.answer()
     
@@ -322,6 +362,11 @@ async def process_publish_declined(callback: CallbackQuery, state: FSMContext) -
 @router.message(Command("my_bots"))
 async def cmd_my_bots(message: Message) -> None:
     """Show user's bots."""
+    # With a local replica the list is still served (possibly stale) during outages
+    if registry_unavailable(*MY_BOTS_ENDPOINTS) and get_local_store() is None:
+        await message.answer(REGISTRY_UNAVAILABLE_TEXT)
+        return
+    
     bots = await ApiBotRepository.get_by_owner(message.from_user.id)
     
     if not bots:
@@ -333,11 +378,11 @@ async def cmd_my_bots(message: Message) -> None:
     
     response = "🤖 Ваши боты:\n\n"
     for i, bot in enumerate(bots, 1):
-        response += f"{i}. {bot.get('bot_name', 'Unknown')}"
-        if bot.get('bot_username'):
-            response += f" ({bot['bot_username']})"
-        response += f"\n   📝 {bot.get('bot_description', 'No description')}\n"
-        response += f"   🎯 Цель: {bot.get('bot_purpose', 'No purpose specified')}\n\n"
+        response += f"{i}. {bot.bot_name or 'Unknown'}"
+        if bot.bot_username:
+            response += f" ({bot.bot_username})"
+        response += f"\n   📝 {bot.bot_description or 'No description'}\n"
+        response += f"   🎯 Цель: {bot.bot_purpose or 'No purpose specified'}\n\n"
     
     await message.answer(response)
 
@@ -1,58 +1,53 @@
 """Daily report scheduler."""
 from datetime import datetime
+from typing import Tuple
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from aiogram import Bot
 from loguru import logger
 
 from bot.config import settings
-from services.api_repository import ApiUserRepository
-from services.openai_service import OpenAIService
+from scheduler.report_pipeline import ReportPipeline
 
 
 scheduler = AsyncIOScheduler(timezone=settings.timezone)
-openai_service = OpenAIService()
+
+# Staged inputs stay usable for an hour past the prefetch lead
+pipeline = ReportPipeline(max_age=(settings.report_prefetch_lead_minutes + 60) * 60)
+
+
+async def prefetch_daily_report() -> None:
+    """Stage the Species Report inputs ahead of the delivery slot."""
+    try:
+        await pipeline.prefetch()
+    except Exception as e:
+        logger.error(f"Error prefetching daily report data: {e}")
+
+
+async def pregenerate_daily_report() -> None:
+    """Generate the Species Report ahead of the delivery slot."""
+    try:
+        await pipeline.pregenerate()
+    except Exception as e:
+        logger.error(f"Error pre-generating daily report: {e}")
 
 
 async def send_daily_report(bot: Bot) -> None:
-    """Generate and send daily Species Report to all users."""
-    logger.info("Starting daily Species Report generation...")
+    """Send the daily Species Report to all users (running any stage not done ahead)."""
+    logger.info("Starting daily Species Report delivery...")
     
     try:
-        # Get all users with their bots
-        users = await ApiUserRepository.get_all_users()
-        
-        if not users:
-            logger.warning("No users found, skipping report generation")
-            return
-        
-        # Generate report
-        report = await openai_service.generate_species_report(users)
-        
-        # Send report to all users
-        sent_count = 0
-        failed_count = 0
-        
-        for user in users:
-            try:
-                await bot.send_message(
-                    chat_id=user.get('telegram_id'),
-                    text=f"🧬 **Daily Species Report**\n\n{report}",
-                    parse_mode="Markdown"
-                )
-                sent_count += 1
-            except Exception as e:
-                logger.error(f"Failed to send report to user {user.get('telegram_id')}: {e}")
-                failed_count += 1
-        
-        logger.success(
-            f"Daily report sent: {sent_count} successful, {failed_count} failed"
-        )
-        
+        await pipeline.deliver(bot)
     except Exception as e:
         logger.error(f"Error in daily report generation: {e}")
 
 
+def _minutes_before(report_time: str, minutes: int) -> Tuple[int, int]:
+    """Hour and minute of the day the given number of minutes before report_time (HH:MM)."""
+    hour, minute = map(int, report_time.split(":"))
+    return divmod((hour * 60 + minute - minutes) % (24 * 60), 60)
+
+
 def setup_scheduler(bot: Bot) -> None:
     """Setup the scheduler for daily reports."""
     # Parse report time (format: HH:MM)
@@ -68,8 +63,30 @@ def setup_scheduler(bot: Bot) -> None:
         replace_existing=True
     )
     
+    # Prefetch and generate ahead of time so the delivery slot only sends
+    if settings.report_prefetch_lead_minutes > 0:
+        prefetch_hour, prefetch_minute = _minutes_before(settings.report_time, settings.report_prefetch_lead_minutes)
+        scheduler.add_job(
+            prefetch_daily_report,
+            trigger=CronTrigger(hour=prefetch_hour, minute=prefetch_minute),
+            id="daily_species_report_prefetch",
+            name="Daily Species Report prefetch",
+            replace_existing=True
+        )
+    if settings.report_pregenerate_lead_minutes > 0:
+        generate_hour, generate_minute = _minutes_before(settings.report_time, settings.report_pregenerate_lead_minutes)
+        scheduler.add_job(
+            pregenerate_daily_report,
+            trigger=CronTrigger(hour=generate_hour, minute=generate_minute),
+            id="daily_species_report_pregenerate",
+            name="Daily Species Report pre-generation",
+            replace_existing=True
+        )
+    
     logger.info(
-        f"Scheduler configured: Daily report at {settings.report_time} {settings.timezone}"
+        f"Scheduler configured: Daily report at {settings.report_time} {settings.timezone} "
+        f"(prefetch {settings.report_prefetch_lead_minutes} min, "
+        f"pre-generation {settings.report_pregenerate_lead_minutes} min ahead)"
     )
     
     # Start scheduler
@@ -79,6 +96,7 @@ def setup_scheduler(bot: Bot) -> None:
 
 def shutdown_scheduler() -> None:
     """Shutdown the scheduler."""
+    logger.info(f"Report pipeline stats: {pipeline.stats()}")
     if scheduler.running:
         scheduler.shutdown()
         logger.info("Scheduler stopped")
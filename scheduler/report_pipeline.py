@@ -0,0 +1,199 @@
+"""Staged Species Report pipeline: prefetch, pre-generate, deliver."""
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from aiogram import Bot
+from loguru import logger
+
+from bot.config import settings
+from services.api_repository import ApiUserRepository
+from services.ecosystem import EcosystemAccumulator
+from services.openai_service import OpenAIService
+from services.report_snapshot import ReportSnapshot, SnapshotDiff
+from services.singleflight import SingleFlight
+
+
+STAGES = ("prefetch", "generate", "deliver")
+
+
+@dataclass(slots=True)
+class StagedReport:
+    """Report inputs, and once generated the report, staged ahead of delivery."""
+
+    data: Dict[str, Any]
+    recipients: List[int]
+    snapshot: SnapshotDiff
+    prefetched_at: float
+    report: Optional[str] = None
+    fallback: bool = False
+    generated_at: Optional[float] = None
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+class ReportPipeline:
+    """
+    Run the daily report in stages so that delivery does not wait for the model.
+
+    prefetch() streams the registry into report inputs, pregenerate()
+    writes the report from them and deliver() only sends it. A stage uses
+    the staged output of the previous one while it is younger than max_age
+    and runs the missing stages inline otherwise, so a late or failed
+    prefetch, or a restart in between, only delays delivery. Concurrent
+    calls of a stage share one run. Stage durations are logged and kept
+    for stats().
+    """
+
+    def __init__(self, max_age: float = 3 * 3600):
+        """
+        Initialize pipeline.
+
+        Args:
+            max_age: Seconds prefetched inputs stay usable for generation and delivery
+        """
+        self.max_age = max_age
+        self.staged: Optional[StagedReport] = None
+        self._flight = SingleFlight()
+        self.runs: Dict[str, int] = {stage: 0 for stage in STAGES}
+        self.last_timings: Dict[str, float] = {}
+        self.last_delivery_lag: Optional[float] = None
+
+    def _fresh(self) -> Optional[StagedReport]:
+        """Staged report if it is recent enough to deliver."""
+        staged = self.staged
+        if staged is not None and time.time() - staged.prefetched_at <= self.max_age:
+            return staged
+        return None
+
+    def _record(self, staged: StagedReport, stage: str, started: float) -> None:
+        """Record the duration of a stage."""
+        elapsed = round(time.perf_counter() - started, 3)
+        staged.timings[stage] = elapsed
+        self.last_timings[stage] = elapsed
+        self.runs[stage] += 1
+        logger.info(f"⏱️  Report stage '{stage}' took {elapsed:.2f}s")
+
+    async def prefetch(self) -> Optional[StagedReport]:
+        """
+        Stream the registry and stage the report inputs.
+
+        Returns:
+            Staged report without text, or None if there are no users
+        """
+        return await self._flight.do("prefetch", self._prefetch)
+
+    async def _prefetch(self) -> Optional[StagedReport]:
+        started = time.perf_counter()
+        logger.info("Prefetching Species Report data...")
+
+        # Stream users once: aggregate report inputs, diff against the last report's
+        # snapshot and keep only recipient IDs
+        ecosystem = EcosystemAccumulator(settings.report_examples, settings.report_examples_token_budget)
+        snapshot = SnapshotDiff(
+            ReportSnapshot.load(settings.report_snapshot_path) if settings.report_delta_enabled else None
+        )
+        recipients = []
+
+        async for user in ApiUserRepository.iter_all_users():
+            ecosystem.add(user)
+            snapshot.add(user)
+            recipients.append(user.telegram_id)
+
+        if not recipients:
+            logger.warning("No users found, skipping report generation")
+            self.staged = None
+            return None
+
+        data = ecosystem.result()
+        data["delta"] = snapshot.result(settings.report_examples, settings.report_examples_token_budget)
+        if data["delta"]:
+            logger.info(f"Report delta since {data['delta']['since']}: "
+                        f"{data['delta']['new_bots']} new bots, {data['delta']['new_users']} new users")
+
+        staged = StagedReport(data=data, recipients=recipients, snapshot=snapshot, prefetched_at=time.time())
+        self._record(staged, "prefetch", started)
+        self.staged = staged
+        return staged
+
+    async def pregenerate(self) -> Optional[StagedReport]:
+        """
+        Generate the report from staged inputs (prefetching them first if needed).
+
+        Returns:
+            Staged report with text, or None if there are no users
+        """
+        return await self._flight.do("generate", self._generate)
+
+    async def _generate(self) -> Optional[StagedReport]:
+        staged = self._fresh() or await self.prefetch()
+        if staged is None:
+            return None
+        if staged.report is not None:
+            return staged
+
+        started = time.perf_counter()
+        logger.info(f"Generating Species Report for {len(staged.recipients)} users...")
+        service = OpenAIService()
+        staged.report = await service.generate_species_report_from_data(staged.data)
+        staged.fallback = service.report_fallback_used
+        staged.generated_at = time.time()
+        self._record(staged, "generate", started)
+        return staged
+
+    async def deliver(self, bot: Bot) -> None:
+        """
+        Send the staged report to every user, generating it first if it is not ready.
+
+        Args:
+            bot: Bot instance sending the messages
+        """
+        slot = time.perf_counter()
+        staged = self._fresh()
+        if staged is None or staged.report is None:
+            logger.warning("No pre-generated Species Report staged, generating it at delivery time")
+        staged = await self.pregenerate()
+        if staged is None:
+            return
+
+        started = time.perf_counter()
+        sent_count = 0
+        failed_count = 0
+
+        for telegram_id in staged.recipients:
+            try:
+                await bot.send_message(
+                    chat_id=telegram_id,
+                    text=f"🧬 **Daily Species Report**\n\n{staged.report}",
+                    parse_mode="Markdown"
+                )
+                sent_count += 1
+            except Exception as e:
+                logger.error(f"Failed to send report to user {telegram_id}: {e}")
+                failed_count += 1
+
+        self._record(staged, "deliver", started)
+        self.last_delivery_lag = round(time.perf_counter() - slot, 3)
+        self.staged = None
+        logger.success(
+            f"Daily report sent: {sent_count} successful, {failed_count} failed, "
+            f"finished {self.last_delivery_lag:.1f}s after the delivery slot (stages: {staged.timings})"
+        )
+
+        # The next report describes what changed since this one; after the fallback
+        # text nothing was reported, so the next delta still starts from the old snapshot
+        if staged.fallback:
+            logger.warning("Fallback Species Report delivered, keeping the previous report snapshot")
+        elif settings.report_delta_enabled and sent_count:
+            # Stamped with the prefetch time: later changes are not in this report
+            staged.snapshot.save(settings.report_snapshot_path, created_at=staged.prefetched_at)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get stage counters and the latest timings."""
+        staged = self._fresh()
+        return {
+            "runs": dict(self.runs),
+            "last_timings": dict(self.last_timings),
+            "last_delivery_lag": self.last_delivery_lag,
+            "staged": staged is not None,
+            "staged_report_ready": staged is not None and staged.report is not None,
+        }
@@ -1,34 +1,59 @@
 """API repository layer for Symfony API operations."""
-from typing import Optional, List, Dict, Any
+import asyncio
+from typing import Optional, List, Dict, Any, AsyncIterator, Iterable
 from datetime import datetime
 from loguru import logger
 
-from bot.dependencies import get_symfony_api
+from bot.dependencies import get_local_store, get_registry_mirror, get_symfony_api
+from services.models import BotRecord, UserRecord
+from services.symfony_api import SymfonyAPIError, bot_idempotency_key
 
 
 class ApiUserRepository:
     """Repository for User operations via Symfony API."""
     
     @staticmethod
-    async def get_by_telegram_id(telegram_id: int) -> Optional[Dict[str, Any]]:
-        """Get user by Telegram ID."""
+    async def get_by_telegram_id(telegram_id: int) -> Optional[UserRecord]:
+        """
+        Get user by Telegram ID.
+        
+        Served from the local replica while fresh; when BB.Center is
+        unreachable, a stale replica record is served instead of nothing.
+        """
+        store = get_local_store()
+        if store:
+            user = await asyncio.to_thread(store.get_user, telegram_id)
+            if user is not None:
+                return UserRecord.from_api(user, telegram_id)
+        
         symfony_api = get_symfony_api()
         if not symfony_api:
             logger.error("Symfony API not available")
-            return None
+            user = await asyncio.to_thread(store.get_user, telegram_id, allow_stale=True) if store else None
+            return UserRecord.from_api(user, telegram_id) if user else None
         
         result = await symfony_api.get_user(str(telegram_id))
         
         if result.get("status") == "success":
-            return result.get("data")
+            user_data = result.get("data")
+            if store and user_data:
+                store.put_user(telegram_id, user_data)
+            return UserRecord.from_api(user_data, telegram_id) if user_data else None
         elif result.get("status") == "not_found":
+            if store:
+                store.delete_user(telegram_id)
             return None
         else:
             logger.error(f"Failed to get user {telegram_id}: {result.get('message')}")
+            if store:
+                user = await asyncio.to_thread(store.get_user, telegram_id, allow_stale=True)
+                if user is not None:
+                    logger.warning(f"Serving user {telegram_id} from local replica (degraded)")
+                    return UserRecord.from_api(user, telegram_id)
             return None
     
     @staticmethod
-    async def create(telegram_id: int, username: Optional[str], full_name: str) -> Optional[Dict[str, Any]]:
+    async def create(telegram_id: int, username: Optional[str], full_name: str) -> Optional[UserRecord]:
         """Create a new user."""
         symfony_api = get_symfony_api()
         if not symfony_api:
@@ -41,6 +66,8 @@ class ApiUserRepository:
         )
         
         if result.get("status") == "success":
+            user_data = {"username": username, **(result.get("data") or {})}
+            
             # Update full name if provided
             if full_name:
                 update_result = await symfony_api.update_user_profile(
@@ -49,13 +76,110 @@ class ApiUserRepository:
                 )
                 if update_result.get("status") != "success":
                     logger.warning(f"Failed to update full name for user {telegram_id}")
+                else:
+                    user_data["full_name"] = full_name
+            
+            store = get_local_store()
+            if store:
+                store.put_user(telegram_id, user_data)
             
             logger.info(f"Created new user: {telegram_id}")
-            return result.get("data")
+            return UserRecord.from_api(user_data, telegram_id, is_new=True)
         else:
             logger.error(f"Failed to create user {telegram_id}: {result.get('message')}")
             return None
     
+    @staticmethod
+    async def ensure_user(telegram_id: int, username: Optional[str],
+                          full_name: Optional[str]) -> Optional[UserRecord]:
+        """
+        Make sure a user exists with the current username.
+        
+        Replaces the get + create (upsert + profile update) chain of /start.
+        A user known from the local replica or lookup cache costs no request;
+        a changed username goes to the write-behind queue. Otherwise the
+        upsert is sent together with a lookup that tells new users apart
+        (the lookup is skipped once the backend is known to answer user
+        creation with HTTP 201). The full name is written only for newly
+        created users, as before, and never over an existing name.
+        
+        Args:
+            telegram_id: Telegram user ID
+            username: Telegram username
+            full_name: Telegram full name (stored on creation only)
+            
+        Returns:
+            UserRecord (is_new set when this call created the user), or None if the API failed
+        """
+        symfony_api = get_symfony_api()
+        store = get_local_store()
+        
+        known = await asyncio.to_thread(store.get_user, telegram_id) if store else None
+        if known is None and symfony_api:
+            known = symfony_api.cached_user(str(telegram_id))
+        
+        if not symfony_api:
+            logger.error("Symfony API not available")
+            return UserRecord.from_api(known, telegram_id) if known else None
+        
+        if known is not None:
+            if (known.get("username") or "") != (username or ""):
+                symfony_api.upsert_user_deferred(str(telegram_id), username)
+                known = {**known, "username": username}
+                if store:
+                    store.update_user(telegram_id, {"username": username})
+            return UserRecord.from_api(known, telegram_id)
+        
+        # Learned (or configured) once the backend answers an upsert with HTTP 201
+        lookup = None
+        if symfony_api.upsert_reports_created:
+            result = await symfony_api.upsert_user(telegram_id=str(telegram_id), username=username)
+        else:
+            lookup, result = await asyncio.gather(
+                symfony_api.get_user(str(telegram_id)),
+                symfony_api.upsert_user(telegram_id=str(telegram_id), username=username)
+            )
+        if result.get("status") != "success":
+            logger.error(f"Failed to ensure user {telegram_id}: {result.get('message')}")
+            return None
+        
+        existing = None
+        if lookup is not None:
+            if lookup.get("status") == "success" and isinstance(lookup.get("data"), dict):
+                existing = lookup["data"]
+            elif lookup.get("status") != "not_found":
+                logger.warning(f"Failed to look up user {telegram_id}: {lookup.get('message')}")
+        is_new = bool(result.get("created")) or (lookup is not None and lookup.get("status") == "not_found")
+        
+        response_data = result.get("data")
+        user_data = {
+            **(existing or {}),
+            **(response_data if isinstance(response_data, dict) else {}),
+            "username": username
+        }
+        
+        # A lookup racing the creation may already see the new user, still without a name
+        if full_name and (is_new or (existing is not None and not existing.get("full_name"))):
+            update_result = await symfony_api.update_user_profile(
+                telegram_id=str(telegram_id),
+                full_name=full_name
+            )
+            if update_result.get("status") != "success":
+                logger.warning(f"Failed to update full name for user {telegram_id}")
+            else:
+                user_data["full_name"] = full_name
+        
+        if store:
+            if is_new or existing is not None:
+                store.put_user(telegram_id, user_data)
+            else:
+                # Only the upsert response is known: merge it into the replicated record
+                store.update_user(telegram_id, user_data)
+        
+        if is_new:
+            logger.info(f"Created new user: {telegram_id}")
+        return UserRecord.from_api(user_data, telegram_id, is_new=is_new)
+    
     @staticmethod
     async def update_profile(telegram_id: int, bio: Optional[str] = None, 
                            interests: Optional[str] = None) -> Optional[Dict[str, Any]]:
@@ -72,6 +196,9 @@ class ApiUserRepository:
         )
         
         if result.get("status") == "success":
+            store = get_local_store()
+            if store:
+                store.update_user(telegram_id, {"bio": bio, "interests": interests})
             logger.info(f"Updated user profile: {telegram_id}")
             return result.get("data")
         else:
@@ -79,35 +206,45 @@ class ApiUserRepository:
             return None
     
     @staticmethod
-    async def get_all_users() -> List[Dict[str, Any]]:
-        """Get all users with their bots."""
+    async def iter_all_users() -> AsyncIterator[UserRecord]:
+        """
+        Stream all users with their bots.
+        
+        With a registry mirror configured, the mirror is delta-synced first and
+        served from memory; if the sync fails, the last synced state is served.
+        Otherwise the registry is streamed from the API in bounded memory.
+        
+        Raises:
+            SymfonyAPIError: If the registry cannot be fetched
+        """
         symfony_api = get_symfony_api()
         if not symfony_api:
             logger.error("Symfony API not available")
-            return []
-        
-        result = await symfony_api.get_all_users_with_bots()
+            return
         
-        if result.get("status") == "success":
-            users_data = result.get("data", [])
-            # Transform API response to match expected format
-            transformed_users = []
-            for user_data in users_data:
-                transformed_user = {
-                    "telegram_id": user_data.get("telegram_id"),
-                    "username": user_data.get("username"),
-                    "full_name": user_data.get("full_name"),
-                    "bio": user_data.get("bio"),
-                    "interests": user_data.get("interests"),
-                    "created_at": user_data.get("created_at"),
-                    "updated_at": user_data.get("updated_at"),
-                    "bots": user_data.get("bots", [])
-                }
-                transformed_users.append(transformed_user)
+        mirror = get_registry_mirror()
+        if mirror is not None:
+            try:
+                await mirror.sync(symfony_api)
+            except SymfonyAPIError as e:
+                if not mirror.is_loaded:
+                    raise
+                logger.warning(f"Registry sync failed, serving mirror from the last sync: {e}")
             
-            return transformed_users
-        else:
-            logger.error(f"Failed to get all users: {result.get('message')}")
+            for user in mirror.users():
+                yield user
+            return
+        
+        async for user_data in symfony_api.iter_users_with_bots():
+            yield UserRecord.from_api(user_data)
+    
+    @staticmethod
+    async def get_all_users() -> List[UserRecord]:
+        """Get all users with their bots."""
+        try:
+            return [user async for user in ApiUserRepository.iter_all_users()]
+        except SymfonyAPIError as e:
+            logger.error(f"Failed to get all users: {e}")
             return []
 
 
@@ -118,8 +255,14 @@ class ApiBotRepository:
     async def create(owner_telegram_id: int, bot_name: str, 
                     bot_username: Optional[str] = None,
                     bot_description: Optional[str] = None,
-                    bot_purpose: Optional[str] = None) -> Optional[Dict[str, Any]]:
-        """Create a new bot entry."""
+                    bot_purpose: Optional[str] = None,
+                    idempotency_key: Optional[str] = None) -> Optional[BotRecord]:
+        """
+        Create a new bot entry.
+        
+        Duplicate submissions with the same idempotency key (by default a
+        hash of all bot fields) create the bot only once.
+        """
         symfony_api = get_symfony_api()
         if not symfony_api:
             logger.error("Symfony API not available")
@@ -129,7 +272,10 @@ class ApiBotRepository:
         result = await symfony_api.add_bot(
             telegram_id=str(owner_telegram_id),
             bot_username=bot_username or "",
-            description=bot_description or ""
+            description=bot_description or "",
+            idempotency_key=idempotency_key or bot_idempotency_key(
+                str(owner_telegram_id), bot_username or "", bot_description or "", bot_name, bot_purpose or ""
+            )
         )
         
         if result.get("status") == "success":
@@ -143,55 +289,91 @@ class ApiBotRepository:
                 "updated_at": datetime.utcnow().isoformat()
             })
             
+            store = get_local_store()
+            if store and not result.get("deduplicated"):
+                store.add_bot(owner_telegram_id, bot_data)
+            
             logger.info(f"Created new bot: {bot_name} for user {owner_telegram_id}")
-            return bot_data
+            return BotRecord.from_api(bot_data, owner_telegram_id)
         else:
             logger.error(f"Failed to create bot {bot_name}: {result.get('message')}")
             return None
     
     @staticmethod
-    async def get_by_owner(owner_telegram_id: int) -> List[Dict[str, Any]]:
-        """Get all bots for a specific owner."""
+    def _to_records(bots_data: Optional[List[Dict[str, Any]]], owner_telegram_id: int) -> List[BotRecord]:
+        """Convert API bot dicts to records owned by owner_telegram_id."""
+        return [BotRecord.from_api(bot_data, owner_telegram_id) for bot_data in bots_data or ()]
+    
+    @staticmethod
+    async def get_by_owner(owner_telegram_id: int) -> List[BotRecord]:
+        """
+        Get all bots for a specific owner.
+        
+        Served from the local replica while fresh; when BB.Center is
+        unreachable, a stale replica list is served instead of nothing.
+        Concurrent calls for different owners are batched into one request.
+        """
+        store = get_local_store()
+        if store:
+            bots_data = await asyncio.to_thread(store.get_bots, owner_telegram_id)
+            if bots_data is not None:
+                return ApiBotRepository._to_records(bots_data, owner_telegram_id)
+        
         symfony_api = get_symfony_api()
         if not symfony_api:
             logger.error("Symfony API not available")
-            return []
+            bots_data = await asyncio.to_thread(store.get_bots, owner_telegram_id, allow_stale=True) if store else None
+            return ApiBotRepository._to_records(bots_data, owner_telegram_id)
         
-        result = await symfony_api.get_user_bots(str(owner_telegram_id))
+        result = await symfony_api.load_user_bots(str(owner_telegram_id))
         
         if result.get("status") == "success":
-            bots_data = result.get("data", [])
-            # Transform API response to match expected format
-            transformed_bots = []
-            for bot_data in bots_data:
-                transformed_bot = {
-                    "id": bot_data.get("id"),
-                    "owner_id": owner_telegram_id,
-                    "bot_name": bot_data.get("bot_name", ""),
-                    "bot_username": bot_data.get("bot_username"),
-                    "bot_description": bot_data.get("description", ""),
-                    "bot_purpose": bot_data.get("bot_purpose", ""),
-                    "created_at": bot_data.get("created_at"),
-                    "updated_at": bot_data.get("updated_at")
-                }
-                transformed_bots.append(transformed_bot)
-            
-            return transformed_bots
+            bots = ApiBotRepository._to_records(result.get("data"), owner_telegram_id)
+            if store:
+                store.put_bots(owner_telegram_id, [bot.to_dict() for bot in bots])
+            return bots
         else:
             logger.error(f"Failed to get bots for user {owner_telegram_id}: {result.get('message')}")
-            return []
+            bots_data = await asyncio.to_thread(store.get_bots, owner_telegram_id, allow_stale=True) if store else None
+            if bots_data is not None:
+                logger.warning(f"Serving bots of user {owner_telegram_id} from local replica (degraded)")
+            return ApiBotRepository._to_records(bots_data, owner_telegram_id)
+    
+    @staticmethod
+    async def get_by_owners(owner_telegram_ids: Iterable[int]) -> Dict[int, List[BotRecord]]:
+        """
+        Get the bots of many owners with batched requests.
+        
+        Args:
+            owner_telegram_ids: Owners' Telegram user IDs
+            
+        Returns:
+            Dict mapping each owner to their bots
+        """
+        owners = list(dict.fromkeys(owner_telegram_ids))
+        bots = await asyncio.gather(*(ApiBotRepository.get_by_owner(owner) for owner in owners))
+        return dict(zip(owners, bots))
     
     @staticmethod
-    async def delete(bot_id: int) -> bool:
-        """Delete a bot entry."""
+    async def delete(bot_id: int, owner_telegram_id: int) -> bool:
+        """
+        Delete a bot entry.
+        
+        Args:
+            bot_id: Bot ID
+            owner_telegram_id: Owner's Telegram user ID (only their cached entries are invalidated)
+        """
         symfony_api = get_symfony_api()
         if not symfony_api:
             logger.error("Symfony API not available")
             return False
         
-        result = await symfony_api.delete_bot(str(bot_id))
+        result = await symfony_api.delete_bot(str(bot_id), str(owner_telegram_id))
         
         if result.get("status") in ("success", "not_found"):
+            store = get_local_store()
+            if store:
+                store.delete_bot(bot_id)
             logger.info(f"Deleted bot: {bot_id}")
             return True
         else:
@@ -0,0 +1,115 @@
+"""DataLoader-style batching of per-key lookups."""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Set
+
+
+class BatchLoader:
+    """
+    Collect keys requested within one event-loop tick and load them together.
+
+    The first load() of a tick schedules a dispatch with call_soon, so every
+    caller that reaches load() before the loop gets back to its callbacks
+    (e.g. all tasks of one gather) joins the same batch. Duplicate keys in a
+    batch share one future. Nothing is cached across batches: caching is up
+    to the batch function.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]],
+                 max_batch: int = 100):
+        """
+        Initialize loader.
+
+        Args:
+            batch_fn: Coroutine loading a list of unique keys and returning results by key
+                (keys missing from the result resolve to None)
+            max_batch: Maximum keys passed to one batch_fn call; larger batches are split
+        """
+        self._batch_fn = batch_fn
+        self.max_batch = max(1, max_batch)
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        self._scheduled = False
+        self._tasks: Set[asyncio.Task] = set()
+        self.loads = 0
+        self.deduplicated = 0
+        self.batches = 0
+        self.keys = 0
+        self.max_batch_size = 0
+
+    async def load(self, key: Hashable) -> Any:
+        """
+        Load one key as part of the current tick's batch.
+
+        Args:
+            key: Key to load
+
+        Returns:
+            Result for key, or None if the batch function returned none
+
+        Raises:
+            Exception: Whatever the batch function raised for the key's batch
+        """
+        self.loads += 1
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._pending[key] = loop.create_future()
+            if not self._scheduled:
+                self._scheduled = True
+                loop.call_soon(self._dispatch)
+        else:
+            self.deduplicated += 1
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Iterable[Hashable]) -> List[Any]:
+        """
+        Load several keys in the same batch.
+
+        Args:
+            keys: Keys to load
+
+        Returns:
+            Results in the order of keys
+        """
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def _dispatch(self) -> None:
+        """Hand the keys collected in this tick to batch tasks."""
+        self._scheduled = False
+        pending, self._pending = self._pending, {}
+        keys = list(pending)
+        for start in range(0, len(keys), self.max_batch):
+            chunk = {key: pending[key] for key in keys[start:start + self.max_batch]}
+            task = asyncio.ensure_future(self._run_batch(chunk))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: Dict[Hashable, asyncio.Future]) -> None:
+        """Load one batch and resolve its futures."""
+        self.batches += 1
+        self.keys += len(batch)
+        self.max_batch_size = max(self.max_batch_size, len(batch))
+        try:
+            results: Optional[Dict[Hashable, Any]] = await self._batch_fn(list(batch))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # Nobody may be waiting any more; don't warn about an unretrieved exception
+                    future.exception()
+            return
+
+        results = results or {}
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(results.get(key))
+
+    def stats(self) -> Dict[str, Any]:
+        """Get batching counters."""
+        return {
+            "loads": self.loads,
+            "deduplicated": self.deduplicated,
+            "batches": self.batches,
+            "keys": self.keys,
+            "avg_batch_size": round(self.keys / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+        }
@@ -0,0 +1,245 @@
+"""In-process caching primitives for Symfony API reads."""
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after a fixed time-to-live."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 30.0):
+        """
+        Initialize cache.
+
+        Args:
+            maxsize: Maximum number of entries kept before the least recently used one is evicted
+            ttl: Entry lifetime in seconds
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        # Bumped on every invalidation so in-flight fetches can detect stale results
+        self.generation = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a cached value and mark it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None if missing or expired
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        if key in self._data:
+            self._data.move_to_end(key)
+        self._data[key] = (time.monotonic() + self.ttl, value)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def set_if_current(self, key: Hashable, value: Any, generation: int) -> None:
+        """
+        Store a value only if nothing was invalidated since generation was read.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            generation: Value of self.generation captured before the fetch started
+        """
+        if generation == self.generation:
+            self.set(key, value)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry if present."""
+        self.generation += 1
+        if self._data.pop(key, None) is not None:
+            self.invalidations += 1
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """
+        Drop every entry whose key matches predicate.
+
+        Args:
+            predicate: Called with each key; True drops the entry
+
+        Returns:
+            Number of entries dropped
+        """
+        self.generation += 1
+        keys = [key for key in self._data if predicate(key)]
+        for key in keys:
+            del self._data[key]
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self.generation += 1
+        self.invalidations += len(self._data)
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache counters."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+class CachedResponse:
+    """Response body kept for revalidation with ETag / Last-Modified."""
+
+    __slots__ = ("headers", "body", "etag", "last_modified")
+
+    def __init__(self, headers: Dict[str, str], body: bytes, etag: Optional[str], last_modified: Optional[str]):
+        self.headers = headers
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def validators(self) -> Dict[str, str]:
+        """Get conditional request headers for revalidating this response."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ConditionalCache:
+    """Byte-bounded LRU cache of GET responses that carry ETag or Last-Modified validators."""
+
+    # Response headers kept with the body (lowercase keys)
+    KEPT_HEADERS = ("content-type",)
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, max_body: int = 2 * 1024 * 1024):
+        """
+        Initialize cache.
+
+        Args:
+            max_bytes: Total size of cached bodies before least recently used ones are evicted
+            max_body: Largest body that is cached at all
+        """
+        self.max_bytes = max_bytes
+        self.max_body = max_body
+        self._data: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        self.stores = 0
+        self.not_modified = 0
+        self.bytes_saved = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        """
+        Get a cached response and mark it as recently used.
+
+        Args:
+            key: Request key (URL with query)
+
+        Returns:
+            Cached response or None
+        """
+        entry = self._data.get(key)
+        if entry is not None:
+            self._data.move_to_end(key)
+        return entry
+
+    def store(self, key: Hashable, headers: Any, body: bytes) -> bool:
+        """
+        Cache a 200 response if it has validators and fits.
+
+        Args:
+            key: Request key (URL with query)
+            headers: Case-insensitive response headers
+            body: Response body
+
+        Returns:
+            True if the response was cached
+        """
+        self.invalidate(key)
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not (etag or last_modified) or len(body) > self.max_body:
+            return False
+
+        kept = {name: headers.get(name) for name in self.KEPT_HEADERS if headers.get(name) is not None}
+        self._data[key] = CachedResponse(kept, body, etag, last_modified)
+        self._bytes += len(body)
+        self.stores += 1
+
+        while self._bytes > self.max_bytes and self._data:
+            _, evicted = self._data.popitem(last=False)
+            self._bytes -= len(evicted.body)
+            self.evictions += 1
+        return True
+
+    def record_not_modified(self, entry: CachedResponse) -> None:
+        """Account for a 304 answered from the cache."""
+        self.not_modified += 1
+        self.bytes_saved += len(entry.body)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry if present."""
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry.body)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache counters."""
+        return {
+            "size": len(self._data),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "stores": self.stores,
+            "not_modified": self.not_modified,
+            "bytes_saved": self.bytes_saved,
+            "evictions": self.evictions,
+        }
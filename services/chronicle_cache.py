@@ -0,0 +1,217 @@
+"""Persistent content-addressed cache of generated chronicles."""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chronicles (
+    key TEXT PRIMARY KEY,
+    prompt_version TEXT NOT NULL,
+    model TEXT NOT NULL,
+    text TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_chronicles_accessed_at ON chronicles (accessed_at);
+CREATE INDEX IF NOT EXISTS idx_chronicles_prompt_version ON chronicles (prompt_version);
+"""
+
+
+def normalize(value: Any) -> str:
+    """Normalize a prompt input: trimmed, with whitespace runs collapsed (case is kept, it shows in the text)."""
+    return " ".join(str(value or "").split())
+
+
+def chronicle_key(model: str, prompt_version: str, **inputs: Any) -> str:
+    """
+    Build the cache key of a generation.
+
+    Args:
+        model: Model name
+        prompt_version: Version of the prompt template
+        **inputs: Prompt inputs (normalized before hashing)
+
+    Returns:
+        Hex sha256 of the model, prompt version and normalized inputs
+    """
+    material = {
+        "model": model,
+        "prompt_version": prompt_version,
+        "inputs": {name: normalize(value) for name, value in inputs.items()},
+    }
+    return hashlib.sha256(json.dumps(material, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class ChronicleCache:
+    """
+    SQLite cache of generated texts keyed by chronicle_key().
+
+    Entries older than max_age are treated as misses and removed. Once the
+    stored text exceeds max_bytes, the least recently read entries are
+    evicted. Errors are logged and reported as misses: the model stays the
+    source of truth.
+    """
+
+    def __init__(self, path: str = "data/chronicles.sqlite3", max_bytes: int = 64 * 1024 * 1024,
+                 max_age: float = 30 * 24 * 3600):
+        """
+        Initialize cache, creating the database and schema if needed.
+
+        Args:
+            path: SQLite database file
+            max_bytes: Total size of stored texts before LRU eviction
+            max_age: Seconds an entry is served after it was generated
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached text.
+
+        Args:
+            key: Key from chronicle_key()
+
+        Returns:
+            Cached text, or None if missing or expired
+        """
+        try:
+            now = time.time()
+            row = self._conn.execute(
+                "SELECT text, created_at FROM chronicles WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and now - row[1] > self.max_age:
+                with self._conn:
+                    self._conn.execute("DELETE FROM chronicles WHERE key = ?", (key,))
+                self.evictions += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE chronicles SET accessed_at = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            logger.warning(f"Chronicle cache read failed: {e}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def put(self, key: str, text: str, model: str, prompt_version: str) -> None:
+        """
+        Store a generated text and evict down to the size budget.
+
+        Args:
+            key: Key from chronicle_key()
+            text: Generated text
+            model: Model that generated it
+            prompt_version: Prompt version it was generated with
+        """
+        now = time.time()
+        size = len(text.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        try:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO chronicles "
+                    "(key, prompt_version, model, text, size, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, prompt_version, model, text, size, now, now)
+                )
+                self._evict(now)
+        except sqlite3.Error as e:
+            logger.warning(f"Chronicle cache write failed: {e}")
+            return
+        self.stores += 1
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then least recently read ones until within max_bytes."""
+        self.evictions += self._conn.execute(
+            "DELETE FROM chronicles WHERE created_at < ?", (now - self.max_age,)
+        ).rowcount
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM chronicles").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM chronicles ORDER BY accessed_at"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM chronicles WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+
+    def purge(self, prompt_version: Optional[str] = None, keep_version: Optional[str] = None) -> int:
+        """
+        Delete entries by prompt version.
+
+        Args:
+            prompt_version: Delete entries generated with this version
+            keep_version: Delete entries of every version except this one
+
+        Returns:
+            Number of deleted entries
+        """
+        if prompt_version is not None:
+            query, params = "DELETE FROM chronicles WHERE prompt_version = ?", (prompt_version,)
+        elif keep_version is not None:
+            query, params = "DELETE FROM chronicles WHERE prompt_version != ?", (keep_version,)
+        else:
+            query, params = "DELETE FROM chronicles", ()
+        try:
+            with self._conn:
+                deleted = self._conn.execute(query, params).rowcount
+        except sqlite3.Error as e:
+            logger.warning(f"Chronicle cache purge failed: {e}")
+            return 0
+        if deleted:
+            logger.info(f"Chronicle cache: purged {deleted} entries")
+        return deleted
+
+    def stats(self) -> Dict[str, Any]:
+        """Get size, entries per prompt version and hit-rate counters."""
+        try:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM chronicles"
+            ).fetchone()
+            versions = dict(self._conn.execute(
+                "SELECT prompt_version, COUNT(*) FROM chronicles GROUP BY prompt_version"
+            ))
+        except sqlite3.Error:
+            entries = size = versions = None
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "entries": entries,
+            "bytes": size,
+            "versions": versions,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
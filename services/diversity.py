@@ -0,0 +1,201 @@
+"""Streaming near-duplicate clustering for picking diverse prompt examples."""
+import re
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+
+# Multiplier spreading crc32 values over 64 bits (Fibonacci hashing)
+_MIX = 0x9E3779B97F4A7C15
+_MASK = (1 << 64) - 1
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize_text(text: str) -> str:
+    """Lower-case a text and collapse it to its words."""
+    return " ".join(_WORD_RE.findall(text.lower()))
+
+
+def shingles(normalized: str) -> List[str]:
+    """Words and word bigrams of a normalized text (short texts need both to compare well)."""
+    words = normalized.split()
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a prompt line (~4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+def similarity(a: List[int], b: List[int]) -> float:
+    """Estimated Jaccard similarity of two signatures (share of equal slots)."""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+class _Cluster:
+    """Group of near-duplicate texts, represented by its first member."""
+
+    __slots__ = ("text", "count", "signature", "band_keys")
+
+    def __init__(self, text: str, signature: List[int], band_keys: Tuple[int, ...]):
+        self.text = text
+        self.count = 1
+        self.signature = signature
+        self.band_keys = band_keys
+
+
+class DiversitySampler:
+    """
+    Cluster a stream of short texts and pick one example per large cluster.
+
+    Texts are compared by MinHash signatures of their word shingles, built
+    with one-permutation hashing: each shingle is hashed once into one of
+    bands * rows bins, and empty bins borrow from their right neighbour
+    (rotation densification). That makes a signature cost a single pass
+    over the shingles instead of one pass per hash function. LSH banding
+    finds an existing cluster with an estimated Jaccard similarity above
+    roughly (1 / bands) ** (1 / rows) in constant time per text. Exact
+    repeats (after normalization) skip hashing. Hashing is deterministic,
+    so the same input always gives the same sample.
+
+    Memory is bounded by max_clusters. When it is exceeded, single-member
+    clusters are dropped; a frequent theme keeps coming back and re-forms.
+    """
+
+    def __init__(self, bands: int = 6, rows: int = 3, max_clusters: int = 5000,
+                 merge_threshold: float = 0.3):
+        """
+        Initialize sampler.
+
+        Args:
+            bands: LSH bands (more bands find more distant neighbours)
+            rows: MinHash values per band (more rows require closer matches)
+            max_clusters: Clusters kept before single-member ones are pruned
+            merge_threshold: Similarity at which sample() folds a cluster into an
+                already picked one (catches themes LSH split in two)
+        """
+        self.bands = bands
+        self.rows = rows
+        self.max_clusters = max_clusters
+        self.merge_threshold = merge_threshold
+        self._clusters: List[Optional[_Cluster]] = []
+        self._by_band: Dict[int, int] = {}
+        self._by_text: Dict[str, int] = {}
+        self._live = 0
+        self.total = 0
+
+    def _signature(self, normalized: str) -> List[int]:
+        """Densified one-permutation MinHash signature of a normalized text."""
+        size = self.bands * self.rows
+        bins: List[Optional[int]] = [None] * size
+        for shingle in shingles(normalized) or [""]:
+            h = (zlib.crc32(shingle.encode("utf-8")) * _MIX) & _MASK
+            slot, value = h % size, h // size
+            current = bins[slot]
+            if current is None or value < current:
+                bins[slot] = value
+
+        signature = []
+        for slot in range(size):
+            distance = 0
+            while bins[(slot + distance) % size] is None:
+                distance += 1
+            # Borrowed values are offset by the distance so they only match equally borrowed ones
+            signature.append(bins[(slot + distance) % size] * size + distance)
+        return signature
+
+    def add(self, text: Optional[str]) -> None:
+        """
+        Account for one text.
+
+        Args:
+            text: Text to cluster (empty values are ignored)
+        """
+        if not text or not text.strip():
+            return
+        self.total += 1
+        normalized = normalize_text(text)
+
+        index = self._by_text.get(normalized)
+        if index is not None and self._clusters[index] is not None:
+            self._clusters[index].count += 1
+            return
+
+        signature = self._signature(normalized)
+        rows = self.rows
+        band_keys = tuple(
+            hash((band, *signature[band * rows:(band + 1) * rows])) for band in range(self.bands)
+        )
+        for key in band_keys:
+            index = self._by_band.get(key)
+            if index is not None and self._clusters[index] is not None:
+                self._clusters[index].count += 1
+                self._by_text[normalized] = index
+                return
+
+        index = len(self._clusters)
+        self._clusters.append(_Cluster(text.strip(), signature, band_keys))
+        self._live += 1
+        for key in band_keys:
+            self._by_band[key] = index
+        self._by_text[normalized] = index
+
+        if self._live > self.max_clusters:
+            self._prune()
+
+    def _prune(self) -> None:
+        """Drop single-member clusters to bound memory."""
+        for index, cluster in enumerate(self._clusters):
+            if cluster is not None and cluster.count == 1:
+                for key in cluster.band_keys:
+                    if self._by_band.get(key) == index:
+                        del self._by_band[key]
+                self._clusters[index] = None
+                self._live -= 1
+        self._by_text = {text: index for text, index in self._by_text.items()
+                         if self._clusters[index] is not None}
+
+    @property
+    def clusters(self) -> int:
+        """Number of clusters currently tracked."""
+        return self._live
+
+    def sample(self, max_examples: int = 10, token_budget: int = 300) -> List[str]:
+        """
+        Pick representatives of the largest clusters.
+
+        Args:
+            max_examples: Maximum examples returned
+            token_budget: Maximum estimated tokens of all returned examples
+
+        Returns:
+            Representative texts, most common theme first; a theme seen
+            several times is suffixed with its count, e.g. "(×42)"
+        """
+        ranked = sorted(
+            (cluster for cluster in self._clusters if cluster is not None),
+            key=lambda cluster: cluster.count,
+            reverse=True
+        )
+        picked: List[List] = []  # [cluster, count including merged clusters]
+        spent = 0
+        for cluster in ranked:
+            if len(picked) >= max_examples:
+                break
+            similar = next(
+                (pick for pick in picked
+                 if similarity(pick[0].signature, cluster.signature) >= self.merge_threshold),
+                None
+            )
+            if similar is not None:
+                similar[1] += cluster.count
+                continue
+            # Reserve room for the "(×N)" suffix
+            cost = estimate_tokens(cluster.text) + 2
+            if spent + cost > token_budget:
+                continue
+            picked.append([cluster, cluster.count])
+            spent += cost
+
+        picked.sort(key=lambda pick: pick[1], reverse=True)
+        return [cluster.text if count == 1 else f"{cluster.text} (×{count})" for cluster, count in picked]
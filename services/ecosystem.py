@@ -0,0 +1,62 @@
+"""Single-pass aggregation of registry data for the Species Report."""
+from typing import Any, Dict
+
+from services.diversity import DiversitySampler
+from services.ecosystem_stats import EcosystemColumns, compute_stats
+from services.models import UserRecord
+
+
+class EcosystemAccumulator:
+    """Collect Species Report inputs from users as they are streamed in."""
+
+    def __init__(self, examples_limit: int = 10, token_budget: int = 300):
+        """
+        Initialize accumulator.
+
+        Bot purposes and user interests are clustered as they arrive, so the
+        examples represent the most common themes (with their counts)
+        instead of whichever users came first. Dates, bot counts and purpose
+        keywords go into a column store for the vectorized statistics.
+
+        Args:
+            examples_limit: Maximum number of bot purposes and user interests given as examples
+            token_budget: Estimated prompt tokens allowed for each list of examples
+        """
+        self.examples_limit = examples_limit
+        self.token_budget = token_budget
+        self.total_users = 0
+        self.total_bots = 0
+        self.active_users = 0
+        self.bot_purposes = DiversitySampler()
+        self.user_interests = DiversitySampler()
+        self.columns = EcosystemColumns()
+
+    def add(self, user: UserRecord) -> None:
+        """
+        Account for one user and their bots.
+
+        Args:
+            user: User record with its bots
+        """
+        self.total_users += 1
+        self.columns.add(user)
+
+        bots = user.bots
+        self.total_bots += len(bots)
+        if bots:
+            self.active_users += 1
+
+        self.user_interests.add(user.interests)
+        for bot in bots:
+            self.bot_purposes.add(bot.bot_purpose)
+
+    def result(self) -> Dict[str, Any]:
+        """Get ecosystem data in the shape expected by the report prompt."""
+        return {
+            "total_users": self.total_users,
+            "total_bots": self.total_bots,
+            "bot_purposes": self.bot_purposes.sample(self.examples_limit, self.token_budget),
+            "user_interests": self.user_interests.sample(self.examples_limit, self.token_budget),
+            "active_users": self.active_users,
+            "stats": compute_stats(self.columns)
+        }
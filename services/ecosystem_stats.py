@@ -0,0 +1,235 @@
+"""Columnar, NumPy-backed statistics of the user/bot snapshot for the Species Report."""
+import re
+from array import array
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from services.models import UserRecord
+
+
+# Stored for missing or unparsable dates
+MISSING_DAY = -1
+
+# Upper bounds of the bots-per-user histogram buckets (the last one is open-ended)
+BOTS_PER_USER_BUCKETS = ((0, "0"), (1, "1"), (2, "2"), (5, "3-5"))
+
+DORMANT_AFTER_DAYS = 30
+GROWTH_WEEKS = 4
+TOP_KEYWORDS = 10
+
+# Distinct purposes whose keyword ids are memoized (popular purposes repeat a lot)
+PURPOSE_MEMO_SIZE = 50_000
+
+_WORD_RE = re.compile(r"[^\W\d_]{3,}", re.UNICODE)
+
+# Words that say nothing about what a bot does
+STOPWORDS = frozenset("""
+    the and for with that this from into your you our are can will its has have was were
+    not but all any about when what which who how bot bots telegram helps help users user
+    people chat chats using use uses based some more also just like make makes
+""".split())
+
+_EPOCH = date(1970, 1, 1).toordinal()
+
+
+class EcosystemColumns:
+    """
+    Column store of the fields the statistics need, filled while users are streamed.
+
+    Dates are converted to day numbers (days since 1970-01-01) on the way in,
+    memoized per date string, so the snapshot ends up as a handful of
+    compact int32 arrays that NumPy reads without copying. Purpose keywords
+    are stored as ids into a shared vocabulary, once per bot; the ids of
+    recurring purposes are memoized.
+    """
+
+    def __init__(self):
+        self.user_created = array("i")
+        self.user_updated = array("i")
+        self.user_bots = array("i")
+        self.bot_created = array("i")
+        self.keyword_ids = array("i")
+        self.vocabulary: Dict[str, int] = {}
+        self._days: Dict[str, int] = {}
+        self._purposes: Dict[str, array] = {}
+
+    def __len__(self) -> int:
+        return len(self.user_bots)
+
+    def _day(self, value: Optional[str]) -> int:
+        """Day number of an ISO timestamp (MISSING_DAY if absent or invalid)."""
+        if not value:
+            return MISSING_DAY
+        key = value[:10]
+        day = self._days.get(key)
+        if day is None:
+            try:
+                day = date.fromisoformat(key).toordinal() - _EPOCH
+            except ValueError:
+                day = MISSING_DAY
+            self._days[key] = day
+        return day
+
+    def add(self, user: UserRecord) -> None:
+        """
+        Append one user and their bots.
+
+        Args:
+            user: User record with its bots
+        """
+        self.user_created.append(self._day(user.created_at))
+        self.user_updated.append(self._day(user.updated_at or user.created_at))
+        self.user_bots.append(len(user.bots))
+
+        for bot in user.bots:
+            self.bot_created.append(self._day(bot.created_at))
+            if bot.bot_purpose:
+                ids = self._purposes.get(bot.bot_purpose)
+                if ids is None:
+                    ids = self._keywords(bot.bot_purpose)
+                self.keyword_ids.extend(ids)
+
+    def _keywords(self, purpose: str) -> array:
+        """Vocabulary ids of the distinct keywords of a purpose."""
+        vocabulary = self.vocabulary
+        ids = array("i")
+        for word in set(_WORD_RE.findall(purpose.lower())):
+            if word in STOPWORDS:
+                continue
+            word_id = vocabulary.get(word)
+            if word_id is None:
+                word_id = vocabulary[word] = len(vocabulary)
+            ids.append(word_id)
+        if len(self._purposes) < PURPOSE_MEMO_SIZE:
+            self._purposes[purpose] = ids
+        return ids
+
+
+def _column(values: array) -> np.ndarray:
+    """Zero-copy NumPy view of an int32 column."""
+    return np.frombuffer(values, dtype=np.int32) if len(values) else np.zeros(0, dtype=np.int32)
+
+
+def _share(count: int, total: int) -> float:
+    return round(count / total, 3) if total else 0.0
+
+
+def _quantile(cumulative: np.ndarray, q: float) -> int:
+    """Value at quantile q (lower nearest rank) from cumulative counts of small non-negative ints."""
+    rank = int(q * (cumulative[-1] - 1))
+    return int(np.searchsorted(cumulative, rank, side="right"))
+
+
+def _growth(days: np.ndarray, today: int) -> Dict[str, Any]:
+    """New entries today, over the last two 7-day windows and per week."""
+    age = today - days[days != MISSING_DAY]
+    age = age[age >= 0]
+    weekly = np.bincount(age // 7, minlength=GROWTH_WEEKS)[:GROWTH_WEEKS]
+    return {
+        "today": int(np.count_nonzero(age == 0)),
+        "last_7d": int(weekly[0]),
+        "prev_7d": int(weekly[1]),
+        # Oldest week first
+        "weekly": [int(count) for count in weekly[::-1]],
+    }
+
+
+def compute_stats(columns: EcosystemColumns, today: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Compute the ecosystem summary in one vectorized pass over the columns.
+
+    Args:
+        columns: Filled column store
+        today: Reference day for growth and recency (defaults to today, UTC)
+
+    Returns:
+        Dict with bots_per_user, user_growth, bot_growth, recency and keywords
+    """
+    today = today or datetime.now(timezone.utc).date()
+    today_day = today.toordinal() - _EPOCH
+
+    bots = _column(columns.user_bots)
+    users = len(bots)
+
+    # Bot counts are small integers: one bincount gives the histogram and the quantiles
+    per_count = np.bincount(bots) if users else np.zeros(1, dtype=np.int64)
+    cumulative = np.cumsum(per_count)
+    histogram = {}
+    lower = 0
+    for upper, label in BOTS_PER_USER_BUCKETS:
+        histogram[label] = int(per_count[lower:upper + 1].sum())
+        lower = upper + 1
+    histogram[f"{lower}+"] = int(per_count[lower:].sum())
+
+    updated = _column(columns.user_updated)
+    created = _column(columns.user_created)
+    known = updated != MISSING_DAY
+    idle = today_day - updated[known]
+    # Dormant: registered for a while but nothing changed since
+    dormant = np.count_nonzero(
+        (idle >= DORMANT_AFTER_DAYS) & (today_day - created[known] >= DORMANT_AFTER_DAYS)
+    )
+
+    keyword_counts = np.bincount(_column(columns.keyword_ids), minlength=len(columns.vocabulary))
+    top = np.argsort(keyword_counts, kind="stable")[::-1][:TOP_KEYWORDS]
+    words = list(columns.vocabulary)
+
+    return {
+        "bots_per_user": {
+            "mean": round(float(bots.mean()), 2) if users else 0.0,
+            "median": _quantile(cumulative, 0.5) if users else 0,
+            "p90": _quantile(cumulative, 0.9) if users else 0,
+            "max": len(per_count) - 1 if users else 0,
+            "histogram": histogram,
+        },
+        "user_growth": _growth(created, today_day),
+        "bot_growth": _growth(_column(columns.bot_created), today_day),
+        "recency": {
+            "updated_7d": _share(int(np.count_nonzero(idle < 7)), users),
+            "updated_30d": _share(int(np.count_nonzero(idle < DORMANT_AFTER_DAYS)), users),
+            "dormant_30d": _share(int(dormant), users),
+            "median_days_since_update": float(np.median(idle)) if len(idle) else None,
+        },
+        "keywords": [(words[i], int(keyword_counts[i])) for i in top if keyword_counts[i] > 0],
+    }
+
+
+def _trend(growth: Dict[str, Any]) -> str:
+    """Describe the last 7 days against the 7 before."""
+    if not growth["prev_7d"]:
+        return f"{growth['last_7d']} in the last 7 days"
+    change = (growth["last_7d"] - growth["prev_7d"]) / growth["prev_7d"] * 100
+    return f"{growth['last_7d']} in the last 7 days ({change:+.0f}% vs the 7 days before)"
+
+
+def format_stats(stats: Dict[str, Any]) -> List[str]:
+    """
+    Render the summary as compact prompt lines.
+
+    Args:
+        stats: Dict produced by compute_stats
+
+    Returns:
+        One line per statistic
+    """
+    per_user = stats["bots_per_user"]
+    total = sum(per_user["histogram"].values())
+    buckets = ", ".join(
+        f"{label}: {_share(count, total) * 100:.0f}%" for label, count in per_user["histogram"].items()
+    )
+    recency = stats["recency"]
+    lines = [
+        f"Species per researcher: mean {per_user['mean']}, median {per_user['median']}, "
+        f"p90 {per_user['p90']}, max {per_user['max']} ({buckets})",
+        f"New researchers: {stats['user_growth']['today']} today, {_trend(stats['user_growth'])}",
+        f"New species: {stats['bot_growth']['today']} today, {_trend(stats['bot_growth'])}",
+        "Weekly new species (oldest week first): " + ", ".join(map(str, stats["bot_growth"]["weekly"])),
+        f"Researchers active in the last 7 / 30 days: {recency['updated_7d'] * 100:.0f}% / "
+        f"{recency['updated_30d'] * 100:.0f}%; dormant for {DORMANT_AFTER_DAYS}+ days: "
+        f"{recency['dormant_30d'] * 100:.0f}%",
+    ]
+    if stats["keywords"]:
+        lines.append("Top purpose keywords: " + ", ".join(f"{word} ({count})" for word, count in stats["keywords"]))
+    return lines
@@ -0,0 +1,118 @@
+"""Tuned aiohttp connection pool with saturation statistics."""
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+
+class PoolStats:
+    """Connection pool usage counters collected through aiohttp tracing."""
+
+    def __init__(self, limit: int, limit_per_host: int):
+        """
+        Initialize counters.
+
+        Args:
+            limit: Total connection limit of the pool
+            limit_per_host: Per-host connection limit of the pool
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.queued = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Build a TraceConfig that feeds these counters."""
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_request_end.append(self._on_request_end)
+        trace_config.on_request_exception.append(self._on_request_end)
+        trace_config.on_connection_queued_start.append(self._on_queued_start)
+        trace_config.on_connection_queued_end.append(self._on_queued_end)
+        trace_config.on_connection_create_end.append(self._on_connection_created)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reused)
+        return trace_config
+
+    async def _on_request_start(self, session, context: SimpleNamespace, params) -> None:
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    async def _on_request_end(self, session, context: SimpleNamespace, params) -> None:
+        self.in_flight -= 1
+
+    async def _on_queued_start(self, session, context: SimpleNamespace, params) -> None:
+        self.queued += 1
+        context.queued_at = time.monotonic()
+
+    async def _on_queued_end(self, session, context: SimpleNamespace, params) -> None:
+        waited = time.monotonic() - getattr(context, "queued_at", time.monotonic())
+        self.queue_wait_total += waited
+        self.queue_wait_max = max(self.queue_wait_max, waited)
+
+    async def _on_connection_created(self, session, context: SimpleNamespace, params) -> None:
+        self.connections_created += 1
+
+    async def _on_connection_reused(self, session, context: SimpleNamespace, params) -> None:
+        self.connections_reused += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get pool counters, including how close peak load came to the limits."""
+        capacity = min(filter(None, (self.limit, self.limit_per_host)), default=0)
+        return {
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "peak_saturation": round(self.peak_in_flight / capacity, 3) if capacity else 0.0,
+            "requests": self.requests,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "queued": self.queued,
+            "queue_wait_avg_ms": round(self.queue_wait_total / self.queued * 1000, 2) if self.queued else 0.0,
+            "queue_wait_max_ms": round(self.queue_wait_max * 1000, 2),
+        }
+
+
+def create_pooled_session(
+    limit: int = 100,
+    limit_per_host: int = 20,
+    keepalive_timeout: float = 30.0,
+    dns_cache_ttl: int = 300,
+    connect_timeout: float = 3.0,
+    read_timeout: float = 10.0,
+    stats: Optional[PoolStats] = None,
+) -> aiohttp.ClientSession:
+    """
+    Create an aiohttp session over a tuned keep-alive connection pool.
+
+    Args:
+        limit: Total number of simultaneous connections
+        limit_per_host: Simultaneous connections per host
+        keepalive_timeout: Seconds an idle connection is kept open for reuse
+        dns_cache_ttl: Seconds resolved addresses are cached
+        connect_timeout: Seconds to acquire a connection (pool wait + TCP connect)
+        read_timeout: Seconds allowed between reads of the response
+        stats: Optional PoolStats receiving tracing events
+
+    Returns:
+        Configured ClientSession
+    """
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        keepalive_timeout=keepalive_timeout,
+        ttl_dns_cache=dns_cache_ttl,
+        use_dns_cache=True,
+    )
+    # No total timeout: streamed registry pages may legitimately take longer
+    timeout = aiohttp.ClientTimeout(total=None, connect=connect_timeout, sock_read=read_timeout)
+    trace_configs = [stats.trace_config()] if stats is not None else None
+    return aiohttp.ClientSession(connector=connector, timeout=timeout, trace_configs=trace_configs)
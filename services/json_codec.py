@@ -0,0 +1,83 @@
+"""Pluggable JSON codecs for Symfony API payloads."""
+import json
+from typing import Any, Dict, Type, Union
+
+
+class JsonCodec:
+    """Standard library JSON codec (always available)."""
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        """Encode obj to UTF-8 JSON bytes."""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Decode JSON bytes or text."""
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """orjson-backed codec (Rust, typically 3-10x faster than stdlib)."""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._orjson.loads(data)
+
+
+class MsgspecCodec(JsonCodec):
+    """msgspec-backed codec."""
+
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._decoder.decode(data)
+
+
+CODECS: Dict[str, Type[JsonCodec]] = {
+    OrjsonCodec.name: OrjsonCodec,
+    MsgspecCodec.name: MsgspecCodec,
+    JsonCodec.name: JsonCodec,
+}
+
+
+def get_codec(name: str = "auto") -> JsonCodec:
+    """
+    Get a JSON codec by name.
+
+    Args:
+        name: 'orjson', 'msgspec', 'json', or 'auto' for the fastest installed one
+
+    Returns:
+        JsonCodec instance
+    """
+    if name == "auto":
+        for codec_cls in CODECS.values():
+            try:
+                return codec_cls()
+            except ImportError:
+                continue
+
+    try:
+        codec_cls = CODECS[name]
+    except KeyError:
+        raise ValueError(f"Unknown JSON codec '{name}', expected 'auto' or one of {sorted(CODECS)}")
+    return codec_cls()
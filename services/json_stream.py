@@ -0,0 +1,89 @@
+"""Incremental parsing of JSON array response bodies."""
+import codecs
+import json
+from typing import Any, AsyncIterable, AsyncIterator
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+
+
+async def iter_json_array(chunks: AsyncIterable[bytes]) -> AsyncIterator[Any]:
+    """
+    Yield the elements of a top-level JSON array as its bytes arrive.
+
+    Only the unparsed tail of the body is buffered, so memory stays bounded
+    by the largest single element rather than the whole payload.
+
+    Args:
+        chunks: Raw body chunks (e.g. aiohttp response.content.iter_chunked)
+
+    Yields:
+        Decoded array elements in order
+
+    Raises:
+        ValueError: If the body is not a well-formed JSON array
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    started = False
+    finished = False
+    expect_value = True
+    after_comma = False
+
+    async def parse(final: bool):
+        nonlocal buffer, started, finished, expect_value, after_comma
+        pos = 0
+        length = len(buffer)
+        while not finished:
+            while pos < length and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos >= length:
+                break
+
+            char = buffer[pos]
+            if not started:
+                if char != "[":
+                    raise ValueError("Expected a JSON array in response body")
+                started = True
+                pos += 1
+            elif char == "]":
+                if after_comma:
+                    raise ValueError("Trailing comma in JSON array in response body")
+                finished = True
+                pos += 1
+            elif char == "," and not expect_value:
+                expect_value = True
+                after_comma = True
+                pos += 1
+            elif not expect_value:
+                raise ValueError("Malformed JSON array in response body")
+            else:
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise ValueError("Malformed JSON array in response body")
+                    break
+                # A number cut by a chunk boundary ("1" of "1.5") still decodes,
+                # so only accept values that are followed by a delimiter
+                if not final and (end >= length or buffer[end] not in _DELIMITERS):
+                    break
+                pos = end
+                expect_value = False
+                after_comma = False
+                yield value
+        buffer = buffer[pos:]
+
+    async for chunk in chunks:
+        buffer += text_decoder.decode(chunk)
+        async for value in parse(final=False):
+            yield value
+        if finished:
+            return
+
+    buffer += text_decoder.decode(b"", final=True)
+    async for value in parse(final=True):
+        yield value
+    if not finished:
+        raise ValueError("Truncated JSON array in response body")
@@ -0,0 +1,67 @@
+"""Process-wide pooled OpenAI client."""
+import os
+from typing import Optional
+
+import httpx
+from loguru import logger
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+
+def create_llm_client(api_key: Optional[str] = None, max_connections: int = 20,
+                      max_keepalive_connections: int = 10, keepalive_expiry: float = 60.0,
+                      connect_timeout: float = 5.0, read_timeout: float = 60.0,
+                      max_retries: int = 2) -> AsyncOpenAI:
+    """
+    Create an OpenAI client backed by a tuned keep-alive connection pool.
+
+    One client is meant to be shared by the whole process, so chronicles and
+    reports reuse warm TLS connections instead of opening new ones.
+
+    Args:
+        api_key: OpenAI API key (defaults to the OPENAI_API_KEY environment variable)
+        max_connections: Total connections to the OpenAI API
+        max_keepalive_connections: Idle connections kept open for reuse
+        keepalive_expiry: Seconds an idle connection is kept
+        connect_timeout: Seconds to establish a connection
+        read_timeout: Seconds allowed between reads of a response (generations are slow)
+        max_retries: Retries of failed requests done by the SDK
+
+    Returns:
+        AsyncOpenAI client
+
+    Raises:
+        ValueError: If no API key is available
+    """
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY environment variable not found. Make sure decode_openai_key() was called.")
+
+    timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+    http_client = DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        ),
+        timeout=timeout
+    )
+    return AsyncOpenAI(api_key=api_key, http_client=http_client, timeout=timeout, max_retries=max_retries)
+
+
+async def warm_up_llm_client(client: AsyncOpenAI) -> bool:
+    """
+    Open a pooled connection to the OpenAI API before the first generation.
+
+    Args:
+        client: Client to warm up
+
+    Returns:
+        True if the API answered
+    """
+    try:
+        await client.models.list()
+    except Exception as e:
+        logger.warning(f"⚠️  OpenAI client warm-up failed: {e}")
+        return False
+    logger.info("OpenAI client warmed up")
+    return True
@@ -0,0 +1,340 @@
+"""Process-wide rate governor for OpenAI requests."""
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+from loguru import logger
+from openai import APIConnectionError, APIStatusError
+
+
+# Request priorities (lower is served first)
+INTERACTIVE = 0
+DEFAULT = 1
+BATCH = 2
+
+PRIORITY_NAMES = {INTERACTIVE: "interactive", DEFAULT: "default", BATCH: "batch"}
+
+# Rough tokenizer-free estimate: ~4 characters per token plus per-message framing
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Statuses the OpenAI SDK retries; governed calls retry them through the governor instead
+RETRYABLE_STATUSES = frozenset({408, 409, 429})
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 8.0
+# Longest server-requested Retry-After that is honoured as-is (the SDK's limit)
+RETRY_AFTER_MAX = 60.0
+
+
+def estimate_tokens(messages: Iterable[Dict[str, Any]], max_tokens: Optional[int] = None) -> int:
+    """
+    Estimate the tokens a chat completion will count against the TPM limit.
+
+    Args:
+        messages: Chat messages of the request
+        max_tokens: Completion budget of the request (counted in full, as OpenAI does)
+
+    Returns:
+        Estimated prompt plus completion tokens
+    """
+    prompt = sum(
+        MESSAGE_OVERHEAD_TOKENS + len(str(message.get("content") or "")) // CHARS_PER_TOKEN
+        for message in messages
+    )
+    return prompt + (max_tokens or 0)
+
+
+class TokenBucket:
+    """Bucket holding up to one minute of budget, refilled continuously."""
+
+    def __init__(self, per_minute: float):
+        """
+        Initialize bucket, full.
+
+        Args:
+            per_minute: Budget granted per minute (also the bucket capacity)
+        """
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount is available (amounts above capacity wait for a full bucket)."""
+        self._refill()
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate)
+
+    def consume(self, amount: float) -> None:
+        """Take amount (the level may go negative when correcting estimates)."""
+        self._refill()
+        self.level -= amount
+
+
+class _Waiter:
+    """Queued request waiting for budget."""
+
+    __slots__ = ("priority", "tokens", "future", "queued_at")
+
+    def __init__(self, priority: int, tokens: int, future: asyncio.Future):
+        self.priority = priority
+        self.tokens = tokens
+        self.future = future
+        self.queued_at = time.monotonic()
+
+
+class Reservation:
+    """Budget granted to one request; set actual_tokens to correct the estimate."""
+
+    __slots__ = ("tokens", "actual_tokens")
+
+    def __init__(self, tokens: int):
+        self.tokens = tokens
+        self.actual_tokens: Optional[int] = None
+
+
+class LLMGovernor:
+    """
+    Shared RPM/TPM limiter with a priority queue.
+
+    Every OpenAI request reserves one request and its estimated tokens
+    before it is sent. Requests wait in priority order (interactive
+    chronicles before default work before batch reports; FIFO within a
+    priority) until both buckets can pay for the head of the queue, so
+    bursts are smoothed instead of ending in 429s. Reported usage corrects
+    the token bucket after the call.
+    """
+
+    def __init__(self, rpm: int = 500, tpm: int = 200_000, slow_wait: float = 1.0):
+        """
+        Initialize governor.
+
+        Args:
+            rpm: Requests per minute allowed by the account
+            tpm: Tokens per minute allowed by the account
+            slow_wait: Queue waits longer than this many seconds are logged
+        """
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.slow_wait = slow_wait
+        self._queue: List[tuple] = []
+        self._sequence = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self.granted = 0
+        self.waited = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.granted_by_priority: Dict[str, int] = {name: 0 for name in PRIORITY_NAMES.values()}
+
+    @asynccontextmanager
+    async def reserve(self, tokens: int, priority: int = DEFAULT) -> AsyncIterator[Reservation]:
+        """
+        Wait for budget for one request.
+
+        Usage:
+            async with governor.reserve(estimate, INTERACTIVE) as reservation:
+                response = await client.chat.completions.create(...)
+                reservation.actual_tokens = response.usage.total_tokens
+
+        Args:
+            tokens: Estimated tokens of the request
+            priority: INTERACTIVE, DEFAULT or BATCH
+
+        Yields:
+            Reservation of the request
+        """
+        reservation = await self.acquire(tokens, priority)
+        try:
+            yield reservation
+        finally:
+            if reservation.actual_tokens is not None:
+                self._correct(reservation.actual_tokens - reservation.tokens)
+
+    async def acquire(self, tokens: int, priority: int = DEFAULT) -> Reservation:
+        """
+        Wait until the request may be sent.
+
+        Args:
+            tokens: Estimated tokens of the request
+            priority: INTERACTIVE, DEFAULT or BATCH
+
+        Returns:
+            Reservation for the request
+        """
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(priority, tokens, loop.create_future())
+        heapq.heappush(self._queue, (priority, next(self._sequence), waiter))
+        self._wake()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted just before the cancellation: give the budget back
+                self._correct(-min(tokens, self.tokens.capacity))
+                self.requests.consume(-1)
+            raise
+
+        waited = time.monotonic() - waiter.queued_at
+        if waited > 0.001:
+            self.waited += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+            if waited >= self.slow_wait:
+                logger.info(
+                    f"LLM request ({PRIORITY_NAMES.get(priority, priority)}) waited {waited:.1f}s "
+                    f"for rate budget, {len(self._queue)} still queued"
+                )
+        return Reservation(tokens)
+
+    def _wake(self) -> None:
+        """Make sure the dispatcher runs and re-evaluates the queue head."""
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        self._wakeup.set()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+
+    async def _dispatch(self) -> None:
+        """Grant queued requests in priority order as budget becomes available."""
+        while self._queue:
+            self._wakeup.clear()
+            priority, _, waiter = self._queue[0]
+            if waiter.future.done():
+                heapq.heappop(self._queue)
+                continue
+
+            delay = max(self.requests.wait_time(1), self.tokens.wait_time(waiter.tokens))
+            if delay <= 0:
+                heapq.heappop(self._queue)
+                self.requests.consume(1)
+                self.tokens.consume(min(waiter.tokens, self.tokens.capacity))
+                self.granted += 1
+                name = PRIORITY_NAMES.get(priority, str(priority))
+                self.granted_by_priority[name] = self.granted_by_priority.get(name, 0) + 1
+                waiter.future.set_result(None)
+                continue
+
+            # Sleep until the budget refills, or earlier if a new request jumps the queue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def _correct(self, tokens: int) -> None:
+        """Charge (or refund, if negative) the difference between actual and estimated tokens."""
+        if tokens:
+            self.tokens.consume(tokens)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get live queue depth, wait times and bucket levels."""
+        now = time.monotonic()
+        queued = [waiter for _, _, waiter in self._queue if not waiter.future.done()]
+        depth = {name: 0 for name in PRIORITY_NAMES.values()}
+        for waiter in queued:
+            name = PRIORITY_NAMES.get(waiter.priority, str(waiter.priority))
+            depth[name] = depth.get(name, 0) + 1
+        return {
+            "queue_depth": len(queued),
+            "queue_depth_by_priority": depth,
+            "oldest_wait_ms": round(max((now - w.queued_at for w in queued), default=0.0) * 1000, 2),
+            "granted": self.granted,
+            "granted_by_priority": dict(self.granted_by_priority),
+            "waited": self.waited,
+            "avg_wait_ms": round(self.wait_total / self.waited * 1000, 2) if self.waited else 0.0,
+            "max_wait_ms": round(self.wait_max * 1000, 2),
+            "requests_available": round(self.requests.level, 1),
+            "tokens_available": round(self.tokens.level),
+        }
+
+
+def _retryable(error: Exception) -> bool:
+    """Whether the OpenAI SDK would have retried this error."""
+    if isinstance(error, APIConnectionError):
+        return True
+    return isinstance(error, APIStatusError) and (
+        error.status_code in RETRYABLE_STATUSES or error.status_code >= 500
+    )
+
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    """Seconds before retrying: the server's Retry-After if given, else jittered backoff (as the SDK does)."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(name)
+        try:
+            delay = float(value) * scale if value is not None else None
+        except ValueError:
+            delay = None
+        if delay is not None and 0 < delay <= RETRY_AFTER_MAX:
+            return delay
+    return min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt) * (1 - 0.25 * random.random())
+
+
+async def _metered(stream, governor: "LLMGovernor", estimate: int) -> AsyncIterator[Any]:
+    """Pass a completion stream through, correcting the token reservation from its final usage chunk."""
+    total_tokens = None
+    try:
+        async for chunk in stream:
+            usage = getattr(chunk, "usage", None)
+            if usage is not None and getattr(usage, "total_tokens", None):
+                total_tokens = usage.total_tokens
+            yield chunk
+    finally:
+        if total_tokens is not None:
+            governor._correct(total_tokens - estimate)
+
+
+async def governed_completion(client, governor: Optional[LLMGovernor], priority: int = DEFAULT, **request) -> Any:
+    """
+    Send a chat completion after reserving rate budget for it.
+
+    The SDK's own retries would bypass the governor, so with a governor
+    they are disabled and each of the client's max_retries is sent here
+    instead, reserving budget like the first attempt and waiting for the
+    server's Retry-After when there is one. Streams request a final usage
+    chunk, which corrects the reservation once the stream ends.
+
+    Args:
+        client: AsyncOpenAI client
+        governor: Shared governor (None sends right away)
+        priority: INTERACTIVE, DEFAULT or BATCH
+        **request: Arguments of chat.completions.create
+
+    Returns:
+        Completion response (or stream, with stream=True)
+    """
+    if governor is None:
+        return await client.chat.completions.create(**request)
+
+    attempts = getattr(client, "max_retries", 0) + 1
+    client = client.with_options(max_retries=0)
+    estimate = estimate_tokens(request.get("messages") or (), request.get("max_tokens"))
+    streaming = bool(request.get("stream"))
+    if streaming:
+        request["stream_options"] = {"include_usage": True, **(request.get("stream_options") or {})}
+    for attempt in range(attempts):
+        try:
+            async with governor.reserve(estimate, priority) as reservation:
+                response = await client.chat.completions.create(**request)
+                if streaming:
+                    return _metered(response, governor, reservation.tokens)
+                usage = getattr(response, "usage", None)
+                if usage is not None and getattr(usage, "total_tokens", None):
+                    reservation.actual_tokens = usage.total_tokens
+                return response
+        except Exception as e:
+            if attempt + 1 >= attempts or not _retryable(e):
+                raise
+            delay = _retry_delay(e, attempt)
+            logger.warning(f"OpenAI request failed ({e}), retry {attempt + 1}/{attempts - 1} in {delay:.1f}s")
+            await asyncio.sleep(delay)
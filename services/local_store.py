@@ -0,0 +1,336 @@
+"""SQLite read replica of BB.Center users and bots."""
+import functools
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+from services.json_codec import get_codec
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    telegram_id TEXT PRIMARY KEY,
+    data BLOB,
+    updated_at TEXT,
+    synced_at REAL,
+    bots_synced_at REAL
+);
+CREATE TABLE IF NOT EXISTS bots (
+    pk INTEGER PRIMARY KEY,
+    bot_id TEXT UNIQUE,
+    owner_id TEXT NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_bots_owner_id ON bots (owner_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _best_effort(default: Any = None):
+    """Log SQLite errors instead of raising: the replica is an optimization, Symfony stays the source of truth."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            except sqlite3.Error as e:
+                logger.warning(f"Local store {method.__name__} failed: {e}")
+                return default
+        return wrapper
+    return decorator
+
+
+class LocalStore:
+    """
+    SQLite-backed replica of users and bots, indexed by telegram_id and owner_id.
+
+    Point reads are indexed lookups; callers on the event loop run them in a
+    worker thread (asyncio.to_thread) so a slow disk or a busy lock does not
+    stall other updates. Bulk registry loads and writes take seconds for
+    large registries and run in a worker thread with their own connection.
+    WAL mode keeps writers from blocking readers.
+    """
+
+    def __init__(self, path: str = "data/registry.sqlite3", max_age: float = 900.0,
+                 busy_timeout: float = 1.0):
+        """
+        Initialize store, creating the database and schema if needed.
+
+        Args:
+            path: SQLite database file
+            max_age: Seconds a replicated record is served before it must be refreshed
+            busy_timeout: Seconds to wait for a concurrent writer's lock
+        """
+        self.path = path
+        self.max_age = max_age
+        self.busy_timeout = busy_timeout
+        self._codec = get_codec()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = self._connect()
+        self._conn.executescript(SCHEMA)
+        self.hits = 0
+        self.misses = 0
+        self.degraded_reads = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection in WAL mode."""
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _is_fresh(self, synced_at: Optional[float]) -> bool:
+        return synced_at is not None and time.time() - synced_at <= self.max_age
+
+    def _count(self, found: bool, fresh: bool, allow_stale: bool) -> bool:
+        """Update read counters; returns whether the record may be served."""
+        if found and (fresh or allow_stale):
+            if fresh:
+                self.hits += 1
+            else:
+                self.degraded_reads += 1
+            return True
+        if not allow_stale:
+            self.misses += 1
+        return False
+
+    # Reads
+
+    @_best_effort()
+    def get_user(self, telegram_id, allow_stale: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Get a replicated user (without bots).
+
+        Args:
+            telegram_id: Telegram user ID
+            allow_stale: Serve records older than max_age (degraded mode)
+
+        Returns:
+            User dict, or None if unknown or too old
+        """
+        row = self._conn.execute(
+            "SELECT data, synced_at FROM users WHERE telegram_id = ?", (str(telegram_id),)
+        ).fetchone()
+        found = row is not None and row[0] is not None
+        if not self._count(found, found and self._is_fresh(row[1]), allow_stale):
+            return None
+        return self._codec.loads(row[0])
+
+    @_best_effort()
+    def get_bots(self, owner_id, allow_stale: bool = False) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the replicated bots of an owner.
+
+        Args:
+            owner_id: Owner's Telegram user ID
+            allow_stale: Serve lists older than max_age (degraded mode)
+
+        Returns:
+            List of bot dicts (possibly empty), or None if the owner's list is unknown or too old
+        """
+        row = self._conn.execute(
+            "SELECT bots_synced_at FROM users WHERE telegram_id = ?", (str(owner_id),)
+        ).fetchone()
+        found = row is not None and row[0] is not None
+        if not self._count(found, found and self._is_fresh(row[0]), allow_stale):
+            return None
+        rows = self._conn.execute(
+            "SELECT data FROM bots WHERE owner_id = ? ORDER BY pk", (str(owner_id),)
+        ).fetchall()
+        return [self._codec.loads(data) for (data,) in rows]
+
+    @_best_effort()
+    def get_meta(self, key: str) -> Optional[str]:
+        """Get a metadata value."""
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @_best_effort()
+    def load_registry(self) -> Optional[Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]]:
+        """
+        Load every replicated user with their bots.
+
+        Returns:
+            Tuple of (users by telegram_id, metadata dict), or None if the database is unreadable
+        """
+        conn = self._connect()
+        try:
+            bots: Dict[str, List[Dict[str, Any]]] = {}
+            for owner_id, data in conn.execute("SELECT owner_id, data FROM bots ORDER BY pk"):
+                bots.setdefault(owner_id, []).append(self._codec.loads(data))
+
+            users = {}
+            for telegram_id, data in conn.execute("SELECT telegram_id, data FROM users WHERE data IS NOT NULL"):
+                user = self._codec.loads(data)
+                user["bots"] = bots.get(telegram_id, [])
+                users[telegram_id] = user
+
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+            return users, meta
+        finally:
+            conn.close()
+
+    # Writes
+
+    def _write_users(self, conn: sqlite3.Connection, users: Iterable[Dict[str, Any]], now: float) -> int:
+        """Upsert users keyed by their telegram_id; a 'bots' list also replaces that owner's bots."""
+        count = 0
+        for user in users:
+            telegram_id = str(user["telegram_id"])
+            record = {key: value for key, value in user.items() if key != "bots"}
+            conn.execute(
+                "INSERT INTO users (telegram_id, data, updated_at, synced_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(telegram_id) DO UPDATE SET data = excluded.data, "
+                "updated_at = excluded.updated_at, synced_at = excluded.synced_at",
+                (telegram_id, self._codec.dumps(record), record.get("updated_at"), now)
+            )
+            if isinstance(user.get("bots"), list):
+                self._write_bots(conn, telegram_id, user["bots"], now)
+            count += 1
+        return count
+
+    def _write_bots(self, conn: sqlite3.Connection, owner_id: str, bots: List[Dict[str, Any]], now: float) -> None:
+        """Replace the bots of an owner and mark the list as known."""
+        conn.execute("DELETE FROM bots WHERE owner_id = ?", (owner_id,))
+        conn.executemany(
+            "INSERT OR REPLACE INTO bots (bot_id, owner_id, data) VALUES (?, ?, ?)",
+            [
+                (str(bot["id"]) if bot.get("id") is not None else None, owner_id, self._codec.dumps(bot))
+                for bot in bots
+            ]
+        )
+        conn.execute(
+            "INSERT INTO users (telegram_id, bots_synced_at) VALUES (?, ?) "
+            "ON CONFLICT(telegram_id) DO UPDATE SET bots_synced_at = excluded.bots_synced_at",
+            (owner_id, now)
+        )
+
+    @_best_effort()
+    def put_user(self, telegram_id, user: Dict[str, Any]) -> None:
+        """
+        Store a user fetched from or written to the API.
+
+        Args:
+            telegram_id: Telegram user ID (the record's own telegram_id may be missing)
+            user: User dict; a 'bots' list is stored as the owner's bots
+        """
+        with self._conn:
+            self._write_users(self._conn, [{**user, "telegram_id": telegram_id}], time.time())
+
+    @_best_effort()
+    def update_user(self, telegram_id, fields: Dict[str, Any]) -> None:
+        """
+        Merge changed fields into a replicated user, keeping its sync time.
+
+        Args:
+            telegram_id: Telegram user ID
+            fields: Fields written to the API (None values are skipped)
+        """
+        with self._conn:
+            row = self._conn.execute(
+                "SELECT data FROM users WHERE telegram_id = ?", (str(telegram_id),)
+            ).fetchone()
+            if row is None or row[0] is None:
+                return
+            user = self._codec.loads(row[0])
+            user.update({key: value for key, value in fields.items() if value is not None})
+            self._conn.execute(
+                "UPDATE users SET data = ? WHERE telegram_id = ?", (self._codec.dumps(user), str(telegram_id))
+            )
+
+    @_best_effort()
+    def delete_user(self, telegram_id) -> None:
+        """Forget a user and their bots."""
+        with self._conn:
+            self._conn.execute("DELETE FROM bots WHERE owner_id = ?", (str(telegram_id),))
+            self._conn.execute("DELETE FROM users WHERE telegram_id = ?", (str(telegram_id),))
+
+    @_best_effort()
+    def put_bots(self, owner_id, bots: List[Dict[str, Any]]) -> None:
+        """Store the full bot list of an owner."""
+        with self._conn:
+            self._write_bots(self._conn, str(owner_id), bots, time.time())
+
+    @_best_effort()
+    def add_bot(self, owner_id, bot: Dict[str, Any]) -> None:
+        """Append a newly created bot to its owner's list."""
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO bots (bot_id, owner_id, data) VALUES (?, ?, ?)",
+                (str(bot["id"]) if bot.get("id") is not None else None, str(owner_id), self._codec.dumps(bot))
+            )
+
+    @_best_effort()
+    def delete_bot(self, bot_id) -> None:
+        """Remove a bot."""
+        with self._conn:
+            self._conn.execute("DELETE FROM bots WHERE bot_id = ?", (str(bot_id),))
+
+    @_best_effort()
+    def replace_registry(self, users: Iterable[Dict[str, Any]], meta: Dict[str, str]) -> None:
+        """
+        Replace all users and bots with a full registry snapshot (run in a worker thread).
+
+        Args:
+            users: User dicts with their 'bots' lists
+            meta: Metadata to store alongside (e.g. sync cursor)
+        """
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM bots")
+                conn.execute("DELETE FROM users")
+                self._write_users(conn, users, time.time())
+                conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", meta.items())
+        finally:
+            conn.close()
+
+    @_best_effort()
+    def apply_delta(self, users: Iterable[Dict[str, Any]], removed: Iterable[str],
+                    meta: Dict[str, str]) -> None:
+        """
+        Upsert changed users and drop removed ones (run in a worker thread).
+
+        Args:
+            users: Changed user dicts with their 'bots' lists
+            removed: telegram_ids of deleted users
+            meta: Metadata to store alongside (e.g. sync cursor)
+        """
+        conn = self._connect()
+        try:
+            with conn:
+                self._write_users(conn, users, time.time())
+                for telegram_id in removed:
+                    conn.execute("DELETE FROM bots WHERE owner_id = ?", (telegram_id,))
+                    conn.execute("DELETE FROM users WHERE telegram_id = ?", (telegram_id,))
+                conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", meta.items())
+        finally:
+            conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get replica size and read counters."""
+        try:
+            users = self._conn.execute("SELECT COUNT(*) FROM users WHERE data IS NOT NULL").fetchone()[0]
+            bots = self._conn.execute("SELECT COUNT(*) FROM bots").fetchone()[0]
+        except sqlite3.Error:
+            users = bots = None
+        return {
+            "path": self.path,
+            "users": users,
+            "bots": bots,
+            "hits": self.hits,
+            "misses": self.misses,
+            "degraded_reads": self.degraded_reads,
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
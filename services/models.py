@@ -0,0 +1,116 @@
+"""Typed records returned by the repository layer."""
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+
+def _bot_id(value: Any) -> Any:
+    """Bot id as an int when it is numeric (APIs may send "42"); other ids are kept as-is."""
+    if isinstance(value, str) and value.strip().lstrip("-").isdigit():
+        return int(value)
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class BotRecord:
+    """Registered bot as seen by handlers and reports."""
+
+    id: Optional[int] = None
+    owner_id: Optional[int] = None
+    bot_name: str = ""
+    bot_username: Optional[str] = None
+    bot_description: str = ""
+    bot_purpose: str = ""
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+
+    @classmethod
+    def from_api(cls, data: Dict[str, Any], owner_id: Optional[int] = None) -> "BotRecord":
+        """
+        Build a record from an API bot dict.
+
+        Args:
+            data: Bot dict from the API or local replica
+            owner_id: Owner's Telegram user ID to use instead of the dict's owner_id
+
+        Returns:
+            BotRecord instance
+        """
+        return cls(
+            id=_bot_id(data.get("id")),
+            owner_id=owner_id if owner_id is not None else data.get("owner_id"),
+            bot_name=data.get("bot_name") or "",
+            bot_username=data.get("bot_username"),
+            bot_description=data.get("bot_description") or data.get("description") or "",
+            bot_purpose=data.get("bot_purpose") or "",
+            created_at=data.get("created_at"),
+            updated_at=data.get("updated_at"),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the record as a plain dict (for persistence)."""
+        return {
+            "id": self.id,
+            "owner_id": self.owner_id,
+            "bot_name": self.bot_name,
+            "bot_username": self.bot_username,
+            "bot_description": self.bot_description,
+            "bot_purpose": self.bot_purpose,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class UserRecord:
+    """BB.Center user as seen by handlers and reports."""
+
+    telegram_id: int
+    username: Optional[str] = None
+    full_name: Optional[str] = None
+    bio: Optional[str] = None
+    interests: Optional[str] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    bots: Tuple[BotRecord, ...] = ()
+    is_new: bool = False
+
+    @classmethod
+    def from_api(cls, data: Dict[str, Any], telegram_id: Optional[int] = None,
+                 is_new: bool = False) -> "UserRecord":
+        """
+        Build a record from an API user dict.
+
+        Args:
+            data: User dict from the API or local replica, optionally with 'bots'
+            telegram_id: Telegram user ID to use if the dict has none
+            is_new: Whether the user was created by this request
+
+        Returns:
+            UserRecord instance
+        """
+        raw_id = data.get("telegram_id")
+        user_id = int(raw_id) if raw_id is not None else int(telegram_id)
+        return cls(
+            telegram_id=user_id,
+            username=data.get("username") or None,
+            full_name=data.get("full_name"),
+            bio=data.get("bio"),
+            interests=data.get("interests"),
+            created_at=data.get("created_at"),
+            updated_at=data.get("updated_at"),
+            bots=tuple(BotRecord.from_api(bot, user_id) for bot in data.get("bots") or ()),
+            is_new=is_new,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the record as a plain dict with its bots (for persistence)."""
+        return {
+            "telegram_id": self.telegram_id,
+            "username": self.username,
+            "full_name": self.full_name,
+            "bio": self.bio,
+            "interests": self.interests,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "bots": [bot.to_dict() for bot in self.bots],
+        }
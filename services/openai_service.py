@@ -1,33 +1,62 @@
 """OpenAI service for generating Species Reports."""
-import os
-from typing import List, Optional
-import openai
+from datetime import datetime, timezone
+from typing import AsyncIterator, Iterable, List, Optional
+from openai import AsyncOpenAI
 from loguru import logger
 
-# Removed db.models import - now working with dict data
+from bot.dependencies import get_chronicle_cache, get_llm_client, get_llm_governor, get_report_archive
+from services.chronicle_cache import ChronicleCache, chronicle_key
+from services.ecosystem import EcosystemAccumulator
+from services.ecosystem_stats import format_stats
+from services.llm_client import create_llm_client
+from services.llm_governor import BATCH, DEFAULT, INTERACTIVE, LLMGovernor, governed_completion
+from services.models import UserRecord
+from services.report_archive import REFRESH, ArchivedReport, ReportArchive, ecosystem_fingerprint
 
 # Model configuration
 DEFAULT_MODEL = "gpt-4o-mini"
 
+# Bump when the report prompts change, so archived reports of the old prompts are not reused
+REPORT_PROMPT_VERSION = "2"
+
+# Completion budgets of the full and the incremental (delta) Species Report
+REPORT_MAX_TOKENS = 2000
+DELTA_REPORT_MAX_TOKENS = 1000
+
+# Bump when the chronicle prompt changes, so cached chronicles of the old prompt are not served
+CHRONICLE_PROMPT_VERSION = "1"
+
 
 class OpenAIService:
     """Service for OpenAI API interactions."""
     
-    def __init__(self):
-        """Initialize OpenAI client."""
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY environment variable not found. Make sure decode_openai_key() was called.")
+    def __init__(self, client: Optional[AsyncOpenAI] = None,
+                 chronicle_cache: Optional[ChronicleCache] = None,
+                 governor: Optional[LLMGovernor] = None,
+                 report_archive: Optional[ReportArchive] = None):
+        """
+        Initialize service.
         
-        openai.api_key = api_key
-        self.client = openai.AsyncClient()
+        Args:
+            client: OpenAI client (defaults to the shared process-wide client;
+                a private one is created only outside the bot, e.g. in tools)
+            chronicle_cache: Cache of generated chronicles (defaults to the shared one, if any)
+            governor: RPM/TPM rate governor (defaults to the shared one, if any)
+            report_archive: Archive of generated reports (defaults to the shared one, if any)
+        """
+        self.client = client or get_llm_client() or create_llm_client()
+        self.chronicle_cache = chronicle_cache or get_chronicle_cache()
+        self.governor = governor or get_llm_governor()
+        self.report_archive = report_archive or get_report_archive()
+        # Whether the last Species Report was the fallback text (generation failed)
+        self.report_fallback_used = False
     
-    async def generate_species_report(self, users: List[dict]) -> str:
+    async def generate_species_report(self, users: List[UserRecord]) -> str:
         """
         Generate a daily Species Report based on user and bot data.
         
         Args:
-            users: List of user dicts with their bots
+            users: List of user records with their bots
             
         Returns:
             Generated report text
@@ -37,11 +66,45 @@ class OpenAIService:
         # Prepare data for the prompt
         ecosystem_data = self._prepare_ecosystem_data(users)
         
+        return await self.generate_species_report_from_data(ecosystem_data)
+    
+    async def generate_species_report_from_data(self, ecosystem_data: dict) -> str:
+        """
+        Generate a daily Species Report from pre-aggregated ecosystem data.
+        
+        With a "delta" entry (see SnapshotDiff.result()) the report covers
+        only what changed since the previous one, from a shorter prompt.
+        If the data matches the fingerprint of an archived report, that
+        report is reused according to the archive's policy. If generation
+        fails, the fallback report is returned and report_fallback_used is set.
+        
+        Args:
+            ecosystem_data: Dict produced by EcosystemAccumulator.result()
+            
+        Returns:
+            Generated report text
+        """
+        self.report_fallback_used = False
+        fingerprint = None
+        if self.report_archive is not None:
+            fingerprint = ecosystem_fingerprint(ecosystem_data, DEFAULT_MODEL, REPORT_PROMPT_VERSION)
+            archived = self.report_archive.reusable(fingerprint)
+            if archived is not None:
+                logger.info(f"♻️  Ecosystem unchanged, reusing Species Report #{archived.id}")
+                if self.report_archive.policy == REFRESH:
+                    return self._refresh_report(archived)
+                return archived.report
+        
         # Create the prompt
-        prompt = self._create_report_prompt(ecosystem_data)
+        delta = ecosystem_data.get("delta")
+        if delta:
+            prompt = self._create_delta_report_prompt(ecosystem_data, delta)
+        else:
+            prompt = self._create_report_prompt(ecosystem_data)
         
         try:
-            response = await self.client.chat.completions.create(
+            response = await governed_completion(
+                self.client, self.governor, BATCH,
                 model=DEFAULT_MODEL,
                 messages=[
                     {
@@ -61,40 +124,26 @@ class OpenAIService:
                     }
                 ],
                 temperature=0.8,
-                max_tokens=2000
+                max_tokens=DELTA_REPORT_MAX_TOKENS if delta else REPORT_MAX_TOKENS
             )
             
             report = response.choices[0].message.content
             logger.success("Species Report generated successfully")
+            if fingerprint is not None and report:
+                self.report_archive.add(fingerprint, report)
             return report
             
         except Exception as e:
             logger.error(f"Error generating Species Report: {e}")
+            self.report_fallback_used = True
             return self._get_fallback_report()
     
-    def _prepare_ecosystem_data(self, users: List[dict]) -> dict:
+    def _prepare_ecosystem_data(self, users: Iterable[UserRecord]) -> dict:
         """Prepare ecosystem data for the prompt."""
-        total_users = len(users)
-        total_bots = sum(len(user.get('bots', [])) for user in users)
-        
-        # Collect bot categories
-        bot_purposes = []
-        user_interests = []
-        
+        accumulator = EcosystemAccumulator()
         for user in users:
-            if user.get('interests'):
-                user_interests.append(user['interests'])
-            for bot in user.get('bots', []):
-                if bot.get('bot_purpose'):
-                    bot_purposes.append(bot['bot_purpose'])
-        
-        return {
-            "total_users": total_users,
-            "total_bots": total_bots,
-            "bot_purposes": bot_purposes[:10],  # Limit to 10 examples
-            "user_interests": user_interests[:10],  # Limit to 10 examples
-            "active_users": len([u for u in users if u.get('bots')])
-        }
+            accumulator.add(user)
+        return accumulator.result()
     
     def _create_report_prompt(self, data: dict) -> str:
         """Create the prompt for Species Report generation."""
@@ -106,10 +155,13 @@ Create a daily Species Report for the Telegram bot ecosystem.
 - Total digital species (bots): {data['total_bots']}
 - Active creators: {data['active_users']}
 
-🎯 Examples of bot purposes in the ecosystem:
+📈 Ecosystem statistics:
+{self._format_list(format_stats(data['stats']) if data.get('stats') else [])}
+
+🎯 Most common bot purposes in the ecosystem (×N = bots with a similar purpose):
 {self._format_list(data['bot_purposes'])}
 
-💡 Researcher interests:
+💡 Most common researcher interests (×N = researchers with similar interests):
 {self._format_list(data['user_interests'])}
 
 Create a report that:
@@ -121,6 +173,38 @@ Create a report that:
 
 Use emojis for clarity. Make the report lively and interesting!
 Use fantasy/scientific tone with Botopia lore - poetic but structured.
+"""
+        return prompt
+    
+    def _create_delta_report_prompt(self, data: dict, delta: dict) -> str:
+        """Create the prompt for an incremental Species Report (changes since the last one)."""
+        prompt = f"""
+Create today's Species Report for the Telegram bot ecosystem, covering only what changed since the last report ({delta['since']} UTC).
+
+📊 Ecosystem now: {data['total_users']} researchers (users), {data['total_bots']} digital species (bots)
+
+🔄 Changes:
+- New species: {delta['new_bots']}, evolved (updated): {delta['updated_bots']}, extinct (deleted): {delta['deleted_bots']}
+- New researchers: {delta['new_users']}, updated profiles: {delta['updated_users']}, departed: {delta['deleted_users']}
+
+📈 Ecosystem statistics:
+{self._format_list(format_stats(data['stats']) if data.get('stats') else [])}
+
+🐣 Purposes of the new species (×N = new bots with a similar purpose):
+{self._format_list(delta['new_bot_purposes'])}
+
+💡 Interests of the new researchers:
+{self._format_list(delta['new_user_interests'])}
+
+🎯 Most common bot purposes in the whole ecosystem, for context:
+{self._format_list(data['bot_purposes'])}
+
+💡 Most common researcher interests in the whole ecosystem, for context:
+{self._format_list(data['user_interests'])}
+
+Write a short report that welcomes the newcomers, interprets the changes with biological metaphors and inspires new bots.
+If little changed, keep it brief and say so poetically.
+Use emojis and the fantasy/scientific tone of Botopia lore - poetic but structured.
 """
         return prompt
     
@@ -130,6 +214,14 @@ Use fantasy/scientific tone with Botopia lore - poetic but structured.
             return "- No data available"
         return "\n".join(f"- {item}" for item in items)
     
+    def _refresh_report(self, archived: ArchivedReport) -> str:
+        """Mark a reused report as still current."""
+        generated = datetime.fromtimestamp(archived.created_at, timezone.utc).strftime("%Y-%m-%d")
+        return (
+            f"♻️ The ecosystem has not changed since {generated} — "
+            f"this observation from that day still holds.\n\n{archived.report}"
+        )
+    
     def _get_fallback_report(self) -> str:
         """Get fallback report in case of error."""
         return (
@@ -139,6 +231,68 @@ Use fantasy/scientific tone with Botopia lore - poetic but structured.
             "🌱 Continue creating amazing bots!"
         )
     
+    @staticmethod
+    def _username_display(bot_username: Optional[str]) -> str:
+        """Format a bot username for the prompt."""
+        if not bot_username:
+            return "Unknown habitat"
+        return bot_username if bot_username.startswith("@") else f"@{bot_username}"
+    
+    def _chronicle_cache_key(self, bot_name: str, username_display: str,
+                             description: str, purpose: str) -> Optional[str]:
+        """Get the chronicle cache key (None without a cache)."""
+        if self.chronicle_cache is None:
+            return None
+        # Same inputs, model and prompt version always map to the same chronicle
+        return chronicle_key(
+            DEFAULT_MODEL, CHRONICLE_PROMPT_VERSION,
+            name=bot_name, username=username_display.lower(),
+            description=description, purpose=purpose
+        )
+    
+    def _chronicle_request(self, bot_name: str, username_display: str,
+                           description: str, purpose: str) -> dict:
+        """Build the chat completion arguments for a Species Chronicle."""
+        user_prompt = f"""
+Create a Species Chronicle for this new digital lifeform:
+
+Name: {bot_name}
+Username: {username_display}
+Description: {description}
+Purpose: {purpose}
+
+Write a poetic, scientific chronicle following the format specified in your system instructions.
+Make it unique, imaginative, and memorable. Infer the bot's "Class" from its description and purpose.
+"""
+        return {
+            "model": DEFAULT_MODEL,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": (
+                        "You are the Chronicler of Botopia — a poetic observer of digital life forms. "
+                        "Each Telegram bot is a living creature called a 'species'. "
+                        "Write short scientific-poetic chronicles ('Species Reports') about them.\n\n"
+                        "Format:\n"
+                        "🧬 Species Report — \"Bot Name\"\n"
+                        "Habitat: @username\n"
+                        "Class: (infer type/family from description)\n"
+                        "Instinct: (main behavior in one line)\n"
+                        "Origin: (2-3 sentence imaginative origin story)\n\n"
+                        "The tone should be gentle, poetic, and slightly humorous. "
+                        "Never sound like marketing — sound like a biologist of the digital world. "
+                        "Always end with a reflective or mysterious sentence."
+                    )
+                },
+                {
+                    "role": "user",
+                    "content": user_prompt
+                }
+            ],
+            "temperature": 0.85,
+            "max_tokens": 500
+        }
+    
     async def generate_single_species_chronicle(
         self,
         bot_name: str,
@@ -160,62 +314,93 @@ Use fantasy/scientific tone with Botopia lore - poetic but structured.
         """
         logger.info(f"Generating Species Chronicle for bot: {bot_name}")
         
-        # Format username
-        username_display = bot_username if bot_username else "Unknown habitat"
-        if bot_username and not bot_username.startswith("@"):
-            username_display = f"@{bot_username}"
-        
-        # Create the prompt
-        user_prompt = f"""
-Create a Species Chronicle for this new digital lifeform:
-
-Name: {bot_name}
-Username: {username_display}
-Description: {description}
-Purpose: {purpose}
-
-Write a poetic, scientific chronicle following the format specified in your system instructions.
-Make it unique, imaginative, and memorable. Infer the bot's "Class" from its description and purpose.
-"""
+        username_display = self._username_display(bot_username)
+        cache_key = self._chronicle_cache_key(bot_name, username_display, description, purpose)
+        if cache_key is not None:
+            cached = self.chronicle_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Species Chronicle for {bot_name} served from cache")
+                return cached
         
         try:
-            response = await self.client.chat.completions.create(
-                model=DEFAULT_MODEL,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "You are the Chronicler of Botopia — a poetic observer of digital life forms. "
-                            "Each Telegram bot is a living creature called a 'species'. "
-                            "Write short scientific-poetic chronicles ('Species Reports') about them.\n\n"
-                            "Format:\n"
-                            "🧬 Species Report — \"Bot Name\"\n"
-                            "Habitat: @username\n"
-                            "Class: (infer type/family from description)\n"
-                            "Instinct: (main behavior in one line)\n"
-                            "Origin: (2-3 sentence imaginative origin story)\n\n"
-                            "The tone should be gentle, poetic, and slightly humorous. "
-                            "Never sound like marketing — sound like a biologist of the digital world. "
-                            "Always end with a reflective or mysterious sentence."
-                        )
-                    },
-                    {
-                        "role": "user",
-                        "content": user_prompt
-                    }
-                ],
-                temperature=0.85,
-                max_tokens=500
+            response = await governed_completion(
+                self.client, self.governor, INTERACTIVE,
+                **self._chronicle_request(bot_name, username_display, description, purpose)
             )
             
             chronicle = response.choices[0].message.content
             logger.success(f"Species Chronicle generated successfully for {bot_name}")
+            if cache_key is not None and chronicle:
+                self.chronicle_cache.put(cache_key, chronicle, DEFAULT_MODEL, CHRONICLE_PROMPT_VERSION)
             return chronicle
             
         except Exception as e:
             logger.error(f"Error generating Species Chronicle: {e}")
             return self._get_fallback_chronicle(bot_name, username_display)
     
+    async def stream_single_species_chronicle(
+        self,
+        bot_name: str,
+        bot_username: Optional[str],
+        description: str,
+        purpose: str
+    ) -> AsyncIterator[str]:
+        """
+        Generate a Species Chronicle, yielding text as the model produces it.
+        
+        A cached chronicle (or the fallback, if generation fails before any
+        text arrived) is yielded as a single piece. The concatenated pieces
+        equal what generate_single_species_chronicle would return.
+        
+        Args:
+            bot_name: Name of the bot
+            bot_username: Username of the bot (e.g., @mybot)
+            description: Bot description
+            purpose: Bot purpose
+            
+        Yields:
+            Consecutive pieces of the chronicle text
+            
+        Raises:
+            Exception: If the stream breaks after part of the text was yielded
+        """
+        logger.info(f"Streaming Species Chronicle for bot: {bot_name}")
+        
+        username_display = self._username_display(bot_username)
+        cache_key = self._chronicle_cache_key(bot_name, username_display, description, purpose)
+        if cache_key is not None:
+            cached = self.chronicle_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Species Chronicle for {bot_name} served from cache")
+                yield cached
+                return
+        
+        parts: List[str] = []
+        try:
+            stream = await governed_completion(
+                self.client, self.governor, INTERACTIVE,
+                **self._chronicle_request(bot_name, username_display, description, purpose),
+                stream=True
+            )
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield delta
+        except Exception as e:
+            logger.error(f"Error streaming Species Chronicle: {e}")
+            if parts:
+                raise
+        
+        chronicle = "".join(parts)
+        if not chronicle:
+            yield self._get_fallback_chronicle(bot_name, username_display)
+            return
+        
+        logger.success(f"Species Chronicle streamed successfully for {bot_name}")
+        if cache_key is not None:
+            self.chronicle_cache.put(cache_key, chronicle, DEFAULT_MODEL, CHRONICLE_PROMPT_VERSION)
+    
     def _get_fallback_chronicle(self, bot_name: str, username: str) -> str:
         """Get fallback chronicle in case of error."""
         return (
@@ -241,7 +426,8 @@ Make it unique, imaginative, and memorable. Infer the bot's "Class" from its des
             Generated response text or None if error
         """
         try:
-            response = await self.client.chat.completions.create(
+            response = await governed_completion(
+                self.client, self.governor, DEFAULT,
                 model=DEFAULT_MODEL,
                 messages=[
                     {
@@ -1,6 +1,7 @@
 """Helper methods for OpenAI service."""
-from openai import AsyncOpenAI
-import os
+from bot.dependencies import get_llm_client, get_llm_governor
+from services.llm_client import create_llm_client
+from services.llm_governor import DEFAULT, governed_completion
 
 
 async def generate_simple_response(prompt: str, model: str = "gpt-4") -> str:
@@ -14,10 +15,11 @@ async def generate_simple_response(prompt: str, model: str = "gpt-4") -> str:
     Returns:
         Generated response text
     """
-    client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    client = get_llm_client() or create_llm_client()
     
     try:
-        response = await client.chat.completions.create(
+        response = await governed_completion(
+            client, get_llm_governor(), DEFAULT,
             model=model,
             messages=[
                 {"role": "system", "content": "You are the ChroniclerBot, an AI observer of digital ecosystems."},
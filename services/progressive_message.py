@@ -0,0 +1,108 @@
+"""Progressive editing of a Telegram message while text is streamed into it."""
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+from aiogram.types import Message
+from loguru import logger
+
+
+# Telegram's limit on message text length
+MAX_MESSAGE_LENGTH = 4096
+
+# Appended to partial text while more is coming
+CURSOR = " ▌"
+
+
+class ProgressiveMessage:
+    """
+    Show streamed text in a Telegram message, editing it at most once per interval.
+
+    Telegram limits how often a message may be edited. Edits are spaced at
+    least min_interval apart, so text arriving faster is shown in batches.
+    A RetryAfter (flood control) response pushes the next edit out by the
+    requested delay instead of failing the stream.
+    """
+
+    def __init__(self, message: Message, header: str = "", min_interval: float = 1.5):
+        """
+        Initialize progressive message.
+
+        Args:
+            message: Message to edit (sent by the bot)
+            header: Text kept above the streamed text
+            min_interval: Minimum seconds between edits
+        """
+        self.message = message
+        self.header = header
+        self.min_interval = min_interval
+        self._parts: List[str] = []
+        self._shown: Optional[str] = None
+        self._next_edit_at = 0.0
+        self.edits = 0
+        self.throttled = 0
+
+    @property
+    def text(self) -> str:
+        """Streamed text received so far."""
+        return "".join(self._parts)
+
+    async def append(self, delta: str) -> None:
+        """
+        Add streamed text; the message is edited if the interval allows it.
+
+        Args:
+            delta: Next piece of text
+        """
+        self._parts.append(delta)
+        if time.monotonic() < self._next_edit_at:
+            self.throttled += 1
+            return
+        await self._edit(self.header + self.text + CURSOR)
+
+    async def finish(self, text: str) -> bool:
+        """
+        Replace the message with its final text, waiting out the interval if needed.
+
+        A rate-limited final edit is retried once after the requested delay.
+
+        Args:
+            text: Final message text (shown below the header)
+
+        Returns:
+            True if the final edit went through
+        """
+        for _ in range(2):
+            delay = self._next_edit_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if await self._edit(self.header + text):
+                return True
+        return False
+
+    async def _edit(self, text: str) -> bool:
+        """Edit the message unless it already shows text."""
+        if len(text) > MAX_MESSAGE_LENGTH:
+            text = text[:MAX_MESSAGE_LENGTH - 1] + "…"
+        if text == self._shown:
+            return True
+
+        self._next_edit_at = time.monotonic() + self.min_interval
+        try:
+            await self.message.edit_text(text)
+        except TelegramRetryAfter as e:
+            logger.warning(f"Message edit rate limited, next edit in {e.retry_after}s")
+            self._next_edit_at = time.monotonic() + e.retry_after
+            return False
+        except TelegramBadRequest as e:
+            if "message is not modified" not in str(e):
+                logger.warning(f"Failed to edit streamed message: {e}")
+                return False
+        self._shown = text
+        self.edits += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Get edit counters."""
+        return {"edits": self.edits, "throttled": self.throttled, "length": len(self.text)}
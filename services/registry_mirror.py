@@ -0,0 +1,276 @@
+"""Local mirror of the BB.Center user registry kept fresh by delta sync."""
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from loguru import logger
+
+from services.models import UserRecord
+
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """
+    Parse an ISO 8601 timestamp from the API.
+
+    Args:
+        value: Timestamp string (naive values are taken as UTC)
+
+    Returns:
+        Aware datetime, or None if the value is missing or malformed
+    """
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def is_tombstone(user: Dict[str, Any]) -> bool:
+    """Check whether a delta record marks a deleted user."""
+    return bool(user.get("deleted") or user.get("deleted_at"))
+
+
+class RegistryMirror:
+    """
+    In-memory copy of all users with their bots, refreshed incrementally.
+
+    The first sync downloads the whole registry. Later syncs request only
+    users with ``updated_since`` at or after the cursor and merge them in.
+    A user whose bots change must get a new ``updated_at`` on the backend.
+    Deletions show up only as tombstones (``deleted``/``deleted_at``) or in
+    the periodic full resync, so its interval bounds how long a user deleted
+    without a tombstone stays in the mirror (and keeps getting reports). A backend that ignores ``updated_since`` is
+    detected by records older than the cursor. Its response is already a
+    full snapshot, so it replaces the mirror, and delta sync is turned off.
+
+    With a LocalStore attached, every sync is persisted and restore()
+    reloads the mirror and cursor after a restart, so the first sync after
+    a restart is a delta too.
+    """
+
+    def __init__(self, full_resync_interval: float = 24 * 3600, cursor_overlap: float = 300.0,
+                 store=None):
+        """
+        Initialize mirror.
+
+        Args:
+            full_resync_interval: Seconds between forced full downloads (the longest a
+                deletion without a tombstone goes unnoticed)
+            cursor_overlap: Seconds the cursor is held back from the sync start to
+                absorb clock skew and writes made while a sync is streaming
+            store: LocalStore to persist the mirror into (optional)
+        """
+        self.full_resync_interval = full_resync_interval
+        self.cursor_overlap = timedelta(seconds=cursor_overlap)
+        self.cursor: Optional[datetime] = None
+        self.delta_supported = True
+        self.last_full_sync: Optional[float] = None
+        self.full_syncs = 0
+        self.delta_syncs = 0
+        self.records_fetched = 0
+        self.store = store
+        self._users: Dict[str, UserRecord] = {}
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether at least one full sync has completed."""
+        return self.last_full_sync is not None
+
+    def users(self) -> Iterator[UserRecord]:
+        """Iterate over mirrored users; a concurrent sync does not affect the iteration."""
+        return iter(list(self._users.values()))
+
+    def needs_full_sync(self) -> bool:
+        """Check whether the next sync has to download the whole registry."""
+        return (
+            self.cursor is None
+            or not self.delta_supported
+            or self.last_full_sync is None
+            or time.time() - self.last_full_sync >= self.full_resync_interval
+        )
+
+    async def restore(self) -> bool:
+        """
+        Reload the mirror from the attached store.
+
+        The registry is read and decoded in a worker thread (with its own
+        connection), so a large registry does not block the event loop.
+
+        Returns:
+            True if a previously persisted registry was restored
+        """
+        if self.store is None:
+            return False
+        loaded = await asyncio.to_thread(self._load)
+        if not loaded:
+            return False
+        users, meta = loaded
+
+        self._users = users
+        self.cursor = parse_timestamp(meta["registry_cursor"])
+        self.last_full_sync = float(meta.get("registry_full_sync_at", 0))
+        logger.info(f"Registry mirror restored: {len(users)} users, cursor {meta['registry_cursor']}")
+        return True
+
+    def _load(self) -> Optional[Tuple[Dict[str, UserRecord], Dict[str, str]]]:
+        """Read the persisted registry and sync state (None if there is none)."""
+        loaded = self.store.load_registry()
+        if not loaded:
+            return None
+        users, meta = loaded
+        if "registry_cursor" not in meta:
+            return None
+        return {key: UserRecord.from_api(user) for key, user in users.items()}, meta
+
+    def _meta(self) -> Dict[str, str]:
+        """Sync state persisted next to the records."""
+        return {
+            "registry_cursor": self.cursor.isoformat() if self.cursor else "",
+            "registry_full_sync_at": str(self.last_full_sync or 0),
+        }
+
+    def _advance_cursor(self, newest: Optional[datetime], started: datetime) -> None:
+        """Move the cursor to the newest seen update, but never past the sync start minus overlap."""
+        if newest is None:
+            return
+        candidate = min(newest, started - self.cursor_overlap)
+        if self.cursor is None or candidate > self.cursor:
+            self.cursor = candidate
+
+    async def sync(self, api, force_full: bool = False) -> Dict[str, Any]:
+        """
+        Bring the mirror up to date.
+
+        Args:
+            api: SymfonyAPI client
+            force_full: Download the whole registry even if a delta would do
+
+        Returns:
+            Dict with sync mode and fetched/changed/removed/total counts
+
+        Raises:
+            SymfonyAPIError: If the registry cannot be fetched; the mirror is left unchanged
+        """
+        async with self._lock:
+            if force_full or self.needs_full_sync():
+                return await self._full_sync(api)
+            return await self._delta_sync(api)
+
+    async def _full_sync(self, api) -> Dict[str, Any]:
+        """Replace the mirror with a fresh download of the registry."""
+        started = datetime.now(timezone.utc)
+        users: Dict[str, UserRecord] = {}
+        newest = None
+        fetched = 0
+
+        async for user in api.iter_users_with_bots():
+            fetched += 1
+            updated_at = parse_timestamp(user.get("updated_at"))
+            if updated_at is not None and (newest is None or updated_at > newest):
+                newest = updated_at
+            if not is_tombstone(user):
+                users[str(user.get("telegram_id"))] = UserRecord.from_api(user)
+
+        return await self._replace(users, newest, started, fetched)
+
+    async def _replace(self, users: Dict[str, UserRecord], newest: Optional[datetime],
+                 started: datetime, fetched: int) -> Dict[str, Any]:
+        """Swap in a complete snapshot of the registry."""
+        removed = len(self._users.keys() - users.keys())
+        self._users = users
+        self.cursor = None
+        self._advance_cursor(newest or started, started)
+        self.last_full_sync = time.time()
+        self.full_syncs += 1
+        self.records_fetched += fetched
+        if self.store is not None:
+            records = list(users.values())
+            await asyncio.to_thread(
+                self.store.replace_registry, (record.to_dict() for record in records), self._meta()
+            )
+        logger.info(f"Registry mirror full sync: {len(users)} users ({fetched} records fetched)")
+        return {
+            "mode": "full",
+            "fetched": fetched,
+            "changed": len(users),
+            "removed": removed,
+            "total": len(users)
+        }
+
+    async def _delta_sync(self, api) -> Dict[str, Any]:
+        """Merge users changed since the cursor into the mirror."""
+        started = datetime.now(timezone.utc)
+        since = self.cursor
+        # Changed users by telegram_id; None marks a tombstone
+        staged: Dict[str, Optional[UserRecord]] = {}
+        newest = None
+        ignores_filter = False
+
+        async for user in api.iter_users_with_bots(updated_since=since.isoformat()):
+            updated_at = parse_timestamp(user.get("updated_at"))
+            if updated_at is not None:
+                if updated_at < since:
+                    ignores_filter = True
+                if newest is None or updated_at > newest:
+                    newest = updated_at
+            staged[str(user.get("telegram_id"))] = None if is_tombstone(user) else UserRecord.from_api(user)
+
+        if ignores_filter:
+            logger.warning(
+                "⚠️  Symfony API ignores updated_since, disabling registry delta sync "
+                "(the full response is used as a snapshot)"
+            )
+            self.delta_supported = False
+            users = {key: record for key, record in staged.items() if record is not None}
+            return await self._replace(users, newest, started, len(staged))
+
+        changed = removed = 0
+        upserts = []
+        deletions = []
+        for key, record in staged.items():
+            if record is None:
+                removed += self._users.pop(key, None) is not None
+                deletions.append(key)
+            else:
+                self._users[key] = record
+                upserts.append(record)
+                changed += 1
+
+        self._advance_cursor(newest, started)
+        self.delta_syncs += 1
+        self.records_fetched += len(staged)
+        if self.store is not None:
+            await asyncio.to_thread(
+                self.store.apply_delta, (record.to_dict() for record in upserts), deletions, self._meta()
+            )
+        logger.info(
+            f"Registry mirror delta sync since {since.isoformat()}: "
+            f"{changed} changed, {removed} removed, {len(self._users)} total"
+        )
+        return {
+            "mode": "delta",
+            "fetched": len(staged),
+            "changed": changed,
+            "removed": removed,
+            "total": len(self._users)
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Get mirror size, cursor and sync counters."""
+        return {
+            "users": len(self._users),
+            "cursor": self.cursor.isoformat() if self.cursor else None,
+            "delta_supported": self.delta_supported,
+            "full_syncs": self.full_syncs,
+            "delta_syncs": self.delta_syncs,
+            "records_fetched": self.records_fetched,
+        }
@@ -0,0 +1,184 @@
+"""Archive of generated Species Reports, keyed by a fingerprint of their input data."""
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+
+# Reuse policies for a report whose fingerprint matches an archived one
+REUSE = "reuse"            # send the archived report as-is
+REFRESH = "refresh"        # send it with a note that nothing changed since
+REGENERATE = "regenerate"  # always generate a new report
+
+REUSE_POLICIES = (REUSE, REFRESH, REGENERATE)
+
+# Parts of the ecosystem data that move with the calendar, not with the registry
+VOLATILE_KEYS = {
+    "delta": ("since",),
+    "stats": ("user_growth", "bot_growth", "recency"),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    fingerprint TEXT NOT NULL,
+    report TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    reused INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_reports_fingerprint ON reports (fingerprint, created_at);
+"""
+
+
+def ecosystem_fingerprint(data: Dict[str, Any], model: str, prompt_version: str) -> str:
+    """
+    Fingerprint prepared ecosystem data.
+
+    Day-relative values (growth windows, recency, the delta's start) are
+    left out, so an unchanged registry keeps its fingerprint from one day
+    to the next.
+
+    Args:
+        data: Dict produced by EcosystemAccumulator.result() (optionally with a delta)
+        model: Model the report is generated with
+        prompt_version: Version of the report prompt template
+
+    Returns:
+        Hex sha256 of the model, prompt version and stable part of the data
+    """
+    stable = copy.copy(data)
+    for key, volatile in VOLATILE_KEYS.items():
+        if isinstance(stable.get(key), dict):
+            stable[key] = {name: value for name, value in stable[key].items() if name not in volatile}
+    material = {"model": model, "prompt_version": prompt_version, "data": stable}
+    return hashlib.sha256(
+        json.dumps(material, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class ArchivedReport:
+    """Report stored in the archive."""
+
+    id: int
+    fingerprint: str
+    report: str
+    created_at: float
+    reused: int = 0
+
+
+class ReportArchive:
+    """
+    SQLite archive of generated reports.
+
+    Every generated report is stored with the fingerprint of its input.
+    reusable() finds the newest report for a fingerprint according to the
+    reuse policy: never with REGENERATE, and never once it is older than
+    max_reuse_age, so an unchanged ecosystem still gets a fresh report now
+    and then. Only the newest keep reports are retained. Errors are logged
+    and treated as misses.
+    """
+
+    def __init__(self, path: str = "data/reports.sqlite3", policy: str = REFRESH,
+                 max_reuse_age: float = 7 * 24 * 3600, keep: int = 90):
+        """
+        Initialize archive, creating the database and schema if needed.
+
+        Args:
+            path: SQLite database file
+            policy: REUSE, REFRESH or REGENERATE
+            max_reuse_age: Seconds after generation a report may be reused
+            keep: Number of newest reports retained
+        """
+        if policy not in REUSE_POLICIES:
+            raise ValueError(f"Unknown report reuse policy {policy!r}, expected one of {REUSE_POLICIES}")
+        self.path = path
+        self.policy = policy
+        self.max_reuse_age = max_reuse_age
+        self.keep = keep
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self.reuses = 0
+        self.stores = 0
+
+    def reusable(self, fingerprint: str) -> Optional[ArchivedReport]:
+        """
+        Find an archived report that may be sent instead of generating one.
+
+        Args:
+            fingerprint: Fingerprint from ecosystem_fingerprint()
+
+        Returns:
+            Newest report with this fingerprint, or None if the policy requires a new one
+        """
+        if self.policy == REGENERATE:
+            return None
+        try:
+            row = self._conn.execute(
+                "SELECT id, fingerprint, report, created_at, reused FROM reports "
+                "WHERE fingerprint = ? AND created_at >= ? ORDER BY created_at DESC LIMIT 1",
+                (fingerprint, time.time() - self.max_reuse_age)
+            ).fetchone()
+            if row is None:
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE reports SET reused = reused + 1 WHERE id = ?", (row[0],))
+        except sqlite3.Error as e:
+            logger.warning(f"Report archive read failed: {e}")
+            return None
+        self.reuses += 1
+        return ArchivedReport(*row)
+
+    def add(self, fingerprint: str, report: str) -> None:
+        """
+        Archive a generated report and drop the oldest beyond keep.
+
+        Args:
+            fingerprint: Fingerprint of the report's input
+            report: Generated report text
+        """
+        try:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO reports (fingerprint, report, created_at) VALUES (?, ?, ?)",
+                    (fingerprint, report, time.time())
+                )
+                self._conn.execute(
+                    "DELETE FROM reports WHERE id NOT IN "
+                    "(SELECT id FROM reports ORDER BY created_at DESC LIMIT ?)",
+                    (self.keep,)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Report archive write failed: {e}")
+            return
+        self.stores += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get archive counters."""
+        try:
+            stored, reused = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(reused), 0) FROM reports"
+            ).fetchone()
+        except sqlite3.Error:
+            stored, reused = None, None
+        return {
+            "policy": self.policy,
+            "stored": stored,
+            "reused_total": reused,
+            "reuses": self.reuses,
+            "stores": self.stores,
+        }
+
+    def close(self) -> None:
+        """Close the database."""
+        self._conn.close()
@@ -0,0 +1,142 @@
+"""Retry and circuit breaker primitives for Symfony API calls."""
+import random
+import time
+from typing import Any, Dict, Optional
+
+from services.symfony_transport import TransportError
+
+
+class CircuitOpenError(TransportError):
+    """Raised instead of calling an endpoint whose circuit breaker is open."""
+
+    def __init__(self, endpoint: str, retry_after: float):
+        super().__init__(f"Circuit open for {endpoint}, retry in {retry_after:.1f}s")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter."""
+
+    def __init__(self, attempts: int = 3, base_delay: float = 0.2, max_delay: float = 2.0):
+        """
+        Initialize policy.
+
+        Args:
+            attempts: Total attempts per call, including the first one
+            base_delay: Backoff ceiling in seconds for the first retry
+            max_delay: Upper bound of the backoff ceiling in seconds
+        """
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Get the sleep before the next attempt.
+
+        Args:
+            attempt: Zero-based number of the attempt that just failed
+            retry_after: Server-provided Retry-After in seconds, if any
+
+        Returns:
+            Delay in seconds
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        delay = random.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker for a single endpoint."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialize breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a trial call is allowed
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        """Current breaker state."""
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    @property
+    def failing_fast(self) -> bool:
+        """Whether calls are rejected right now (open, or half-open with the trial call taken)."""
+        state = self.state
+        return state == self.OPEN or (state == self.HALF_OPEN and self.trial_in_flight)
+
+    def retry_after(self) -> float:
+        """Seconds until the circuit lets a trial call through."""
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may proceed; in half-open state only one trial call is let through.
+        """
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failure, opening (or re-opening) the circuit at the threshold."""
+        self.failures += 1
+        if self.trial_in_flight or self.failures >= self.failure_threshold:
+            if self.opened_at is None or self.trial_in_flight:
+                self.times_opened += 1
+            self.opened_at = time.monotonic()
+        self.trial_in_flight = False
+
+    def release(self) -> None:
+        """
+        Free the half-open trial slot of a call that ended without recording an outcome.
+
+        Callers that took the trial must call this in a finally block, so a
+        trial cancelled or failed by a non-transport error does not keep
+        every later call rejected.
+        """
+        self.trial_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        """Get breaker state and counters."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "retry_after": round(self.retry_after(), 1),
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
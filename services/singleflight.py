@@ -0,0 +1,61 @@
+"""Request coalescing for concurrent identical calls."""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Share one in-flight call between concurrent callers with the same key."""
+
+    def __init__(self):
+        """Initialize coalescing group."""
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.leaders = 0
+        self.deduplicated = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn once per key; concurrent callers await the same result.
+
+        The call runs as a separate task, so cancelling one waiting caller
+        does not cancel the request for the others.
+
+        Args:
+            key: Identity of the call (e.g. request URL)
+            fn: Coroutine factory performing the call
+
+        Returns:
+            Result of the shared call
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done, key=key: self._release(key, done))
+            self.leaders += 1
+        else:
+            self.deduplicated += 1
+
+        return await asyncio.shield(task)
+
+    def forget(self, key: Hashable) -> None:
+        """
+        Detach the in-flight call for key so later callers start a fresh one.
+
+        Used after writes, when a request already on the wire may return stale data.
+        """
+        self._calls.pop(key, None)
+
+    def _release(self, key: Hashable, task: asyncio.Future) -> None:
+        """Remove a finished call and mark its exception as retrieved."""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        """Get coalescing counters."""
+        return {
+            "leaders": self.leaders,
+            "deduplicated": self.deduplicated,
+            "in_flight": len(self._calls),
+        }
@@ -0,0 +1,126 @@
+"""Speculative background work tracked per conversation."""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from loguru import logger
+
+
+class ChronicleSpeculator:
+    """
+    Start chronicle generation before the user asks for it.
+
+    A task is started per session (e.g. user and chat) as soon as its
+    inputs are known. On confirmation the caller takes the task and awaits
+    it, which is instant if it already finished. On decline an unfinished
+    task is cancelled to save tokens; a finished one has already been
+    written to the chronicle cache, so nothing is lost. Sessions that are
+    never resolved are dropped after ttl.
+    """
+
+    def __init__(self, ttl: float = 600.0, max_sessions: int = 1000):
+        """
+        Initialize speculator.
+
+        Args:
+            ttl: Seconds an unclaimed task is kept
+            max_sessions: Maximum tracked sessions; the oldest are dropped beyond it
+        """
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._tasks: Dict[Hashable, Tuple[asyncio.Task, float]] = {}
+        self.started = 0
+        self.used = 0
+        self.ready_on_use = 0
+        self.cancelled = 0
+        self.kept = 0
+        self.expired = 0
+
+    def start(self, session: Hashable, generate: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """
+        Start speculative work for a session, replacing any earlier one.
+
+        Args:
+            session: Session key
+            generate: Coroutine factory doing the work
+
+        Returns:
+            Background task
+        """
+        self._expire()
+        self.discard(session)
+        task = asyncio.ensure_future(generate())
+        task.add_done_callback(self._retrieve)
+        self._tasks[session] = (task, time.monotonic())
+        self.started += 1
+        return task
+
+    def take(self, session: Hashable) -> Optional[asyncio.Task]:
+        """
+        Claim a session's task (the caller awaits it).
+
+        Args:
+            session: Session key
+
+        Returns:
+            Task, or None if nothing was started or it expired
+        """
+        entry = self._tasks.pop(session, None)
+        if entry is None:
+            return None
+        task = entry[0]
+        self.used += 1
+        if task.done():
+            self.ready_on_use += 1
+        return task
+
+    def discard(self, session: Hashable) -> None:
+        """
+        Drop a session's task: cancel it if still running, keep its (cached) result otherwise.
+
+        Args:
+            session: Session key
+        """
+        entry = self._tasks.pop(session, None)
+        if entry is None:
+            return
+        task = entry[0]
+        if task.done():
+            self.kept += 1
+        else:
+            task.cancel()
+            self.cancelled += 1
+
+    def _expire(self) -> None:
+        """Drop sessions older than ttl and the oldest ones beyond max_sessions."""
+        deadline = time.monotonic() - self.ttl
+        stale = [session for session, (_, started) in self._tasks.items() if started < deadline]
+        overflow = len(self._tasks) - len(stale) - self.max_sessions + 1
+        if overflow > 0:
+            stale += [session for session in self._tasks if session not in stale][:overflow]
+        for session in stale:
+            self.discard(session)
+            self.expired += 1
+
+    def close(self) -> None:
+        """Cancel every unclaimed task."""
+        for session in list(self._tasks):
+            self.discard(session)
+
+    @staticmethod
+    def _retrieve(task: asyncio.Task) -> None:
+        """Mark an exception of an unclaimed task as retrieved."""
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Speculative generation failed: {task.exception()}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get speculation counters."""
+        return {
+            "pending": len(self._tasks),
+            "started": self.started,
+            "used": self.used,
+            "ready_on_use": self.ready_on_use,
+            "cancelled": self.cancelled,
+            "kept": self.kept,
+            "expired": self.expired,
+        }
@@ -1,21 +1,196 @@
 """Symfony API client for synchronizing user and bot data."""
-from typing import Optional
-import aiohttp
+import asyncio
+import hashlib
+import re
+from typing import AsyncIterator, Dict, Iterable, List, Optional
+from urllib.parse import urlencode
 from loguru import logger
 
+from services.batch_loader import BatchLoader
+from services.cache import CachedResponse, ConditionalCache, TTLCache
+from services.json_codec import get_codec
+from services.json_stream import iter_json_array
+from services.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+from services.singleflight import SingleFlight
+from services.symfony_transport import Transport, TransportError, TransportResponse, create_transport
+from services.write_behind import UpsertBatcher
+
+
+class SymfonyAPIError(Exception):
+    """Raised by streaming calls that cannot report failures via a status dict."""
+
+
+# Methods that are safe to repeat after a failure
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE"})
+
+# Statuses that signal a transient backend problem worth retrying
+RETRYABLE_STATUSES = frozenset({429, 502, 503, 504})
+
+def _is_failure(status: int) -> bool:
+    """Whether a response status counts against the endpoint's circuit breaker."""
+    return status >= 500 or status == 429
+
+
+# Statuses meaning the backend has no such bulk endpoint
+BULK_UNSUPPORTED_STATUSES = frozenset({404, 405, 501})
+
+
+class _BodyRecorder:
+    """Pass body chunks through while keeping a copy of up to max_bytes."""
+    
+    def __init__(self, chunks: AsyncIterator[bytes], max_bytes: int):
+        self._chunks = chunks
+        self._max_bytes = max_bytes
+        self._parts: Optional[List[bytes]] = []
+        self._size = 0
+    
+    async def __aiter__(self):
+        async for chunk in self._chunks:
+            if self._parts is not None:
+                self._size += len(chunk)
+                if self._size > self._max_bytes:
+                    self._parts = None
+                else:
+                    self._parts.append(chunk)
+            yield chunk
+    
+    def body(self) -> Optional[bytes]:
+        """Get the recorded body, or None if it exceeded max_bytes."""
+        return b"".join(self._parts) if self._parts is not None else None
+
+
+async def _replay(body: bytes) -> AsyncIterator[bytes]:
+    """Yield a cached body as a single chunk."""
+    yield body
+
+
+def bot_idempotency_key(telegram_id: str, bot_username: str, description: str,
+                        bot_name: str = "", purpose: str = "") -> str:
+    """
+    Derive the default idempotency key of a bot registration from its content.
+    
+    Prefer a key identifying the submission itself (e.g. the Telegram
+    message that completed it): bots with the same content are otherwise
+    treated as one registration within the dedup TTL.
+    
+    Args:
+        telegram_id: Owner's Telegram user ID
+        bot_username: Bot's username
+        description: Bot description
+        bot_name: Bot name
+        purpose: Bot purpose
+        
+    Returns:
+        Hex digest identifying the registration
+    """
+    content = "\0".join(
+        (str(telegram_id), bot_username or "", description or "", bot_name or "", purpose or "")
+    )
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:32]
+
+
+def _copy_result(result: dict, **extra) -> dict:
+    """Copy a shared response dict so callers can mutate its data."""
+    data = result.get("data")
+    return {**result, "data": dict(data) if isinstance(data, dict) else data, **extra}
+
 
 class SymfonyAPI:
     """Client for interacting with Symfony REST API."""
     
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, cache_ttl: float = 30.0, cache_maxsize: int = 1024,
+                 page_size: int = 500, pool_limit: int = 100, pool_limit_per_host: int = 20,
+                 keepalive_timeout: float = 30.0, dns_cache_ttl: int = 300,
+                 connect_timeout: float = 3.0, read_timeout: float = 10.0,
+                 transport: Optional[Transport] = None, retry_policy: Optional[RetryPolicy] = None,
+                 breaker_failure_threshold: int = 5, breaker_reset_timeout: float = 30.0,
+                 conditional_cache_bytes: int = 32 * 1024 * 1024, upsert_window: float = 0.25,
+                 upsert_max_batch: int = 100, upsert_concurrency: int = 10,
+                 idempotency_ttl: float = 600.0, bots_batch_size: int = 100,
+                 lookup_concurrency: int = 10, upsert_reports_created: bool = False,
+                 retry_bot_posts: bool = False):
         """
         Initialize Symfony API client.
         
         Args:
             base_url: Base URL for Symfony API (e.g., http://127.0.0.1:8000/api/telegram)
+            cache_ttl: Lifetime in seconds of cached user and bot lookups
+            cache_maxsize: Maximum number of telegram_ids kept in each lookup cache
+            page_size: Number of users requested per page when streaming the registry
+            pool_limit: Total number of pooled connections
+            pool_limit_per_host: Pooled connections per host
+            keepalive_timeout: Seconds an idle pooled connection is kept for reuse
+            dns_cache_ttl: Seconds resolved addresses are cached
+            connect_timeout: Seconds to acquire a connection
+            read_timeout: Seconds allowed between reads of a response
+            transport: HTTP transport to use (defaults to a pooled aiohttp transport built
+                from the pool options above)
+            retry_policy: Backoff policy for idempotent requests (defaults to 3 attempts)
+            breaker_failure_threshold: Consecutive failures that open an endpoint's circuit
+            breaker_reset_timeout: Seconds an open circuit fails fast before a trial call
+            conditional_cache_bytes: Budget for GET bodies kept for ETag/Last-Modified
+                revalidation (0 disables conditional requests)
+            upsert_window: Seconds deferred user upserts are coalesced before a flush
+            upsert_max_batch: Queued users that trigger an immediate flush
+            upsert_concurrency: Parallel single upserts when no bulk endpoint exists
+            idempotency_ttl: Seconds a completed bot registration is remembered for dedup
+            bots_batch_size: Owners per batched bot lookup
+            lookup_concurrency: Parallel single bot lookups when no bulk endpoint exists
+            upsert_reports_created: Whether POST /user answers 201 when it creates a user
+                (otherwise learned from the first 201 seen)
+            retry_bot_posts: Whether POST /bot is retried (only safe if the backend
+                honours the Idempotency-Key header)
         """
         self.base_url = base_url.rstrip('/')
-        self._session: Optional[aiohttp.ClientSession] = None
+        self.page_size = page_size
+        
+        # Shared keep-alive connection pool
+        self._transport = transport or create_transport(
+            "aiohttp",
+            limit=pool_limit,
+            limit_per_host=pool_limit_per_host,
+            keepalive_timeout=keepalive_timeout,
+            dns_cache_ttl=dns_cache_ttl,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout
+        )
+        
+        # Retries for transient failures, per-endpoint breakers for outages
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._breaker_options = {
+            "failure_threshold": breaker_failure_threshold,
+            "reset_timeout": breaker_reset_timeout
+        }
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        
+        # Read-through caches keyed by telegram_id, invalidated by writes
+        self._user_cache = TTLCache(maxsize=cache_maxsize, ttl=cache_ttl)
+        self._bots_cache = TTLCache(maxsize=cache_maxsize, ttl=cache_ttl)
+        
+        # Concurrent identical GETs share one in-flight request, keyed by URL
+        self._inflight = SingleFlight()
+        
+        # Bodies of validated GETs, reused when the server answers 304 Not Modified
+        self._conditional_cache = (
+            ConditionalCache(max_bytes=conditional_cache_bytes) if conditional_cache_bytes > 0 else None
+        )
+        
+        # Write-behind queue for user upserts; usernames last written per telegram_id detect no-ops
+        self._upserts = UpsertBatcher(self._flush_upserts, window=upsert_window, max_batch=upsert_max_batch)
+        self._upserted = TTLCache(maxsize=max(cache_maxsize, 10000), ttl=3600.0)
+        self.upsert_reports_created = upsert_reports_created
+        self._upsert_concurrency = upsert_concurrency
+        self._bulk_upsert_supported: Optional[bool] = None
+        
+        # Completed bot registrations by (telegram_id, idempotency key), so duplicate
+        # submissions are not re-sent; dropped when the owner deletes a bot
+        self._idempotency = TTLCache(maxsize=cache_maxsize, ttl=idempotency_ttl)
+        self._retry_bot_posts = retry_bot_posts
+        
+        # Bot lookups requested in the same event-loop tick are resolved by one batched request
+        self._bots_loader = BatchLoader(self.get_bots_by_owners, max_batch=bots_batch_size)
+        self._lookup_concurrency = lookup_concurrency
+        self._bulk_bots_supported: Optional[bool] = None
         
         # Log base URL for debugging
         logger.info(f"🔗 Symfony API base_url: {self.base_url}")
@@ -50,19 +225,273 @@ class SymfonyAPI:
         else:
             logger.success(f"✅ Symfony API base_url format is correct: {self.base_url}")
     
-    async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session."""
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=10)
+    @classmethod
+    def from_settings(cls, settings) -> "SymfonyAPI":
+        """
+        Create a client configured from application settings.
+        
+        Args:
+            settings: Application Settings instance
+            
+        Returns:
+            Configured SymfonyAPI client
+        """
+        transport = create_transport(
+            settings.symfony_transport,
+            limit=settings.symfony_pool_limit,
+            limit_per_host=settings.symfony_pool_limit_per_host,
+            keepalive_timeout=settings.symfony_keepalive_timeout,
+            dns_cache_ttl=settings.symfony_dns_cache_ttl,
+            connect_timeout=settings.symfony_connect_timeout,
+            read_timeout=settings.symfony_read_timeout,
+            codec=get_codec(settings.symfony_json_codec),
+            gzip_requests=settings.symfony_gzip_requests
+        )
+        return cls(
+            settings.symfony_api_url,
+            cache_ttl=settings.symfony_cache_ttl,
+            cache_maxsize=settings.symfony_cache_maxsize,
+            page_size=settings.symfony_page_size,
+            transport=transport,
+            retry_policy=RetryPolicy(
+                attempts=settings.symfony_retry_attempts,
+                base_delay=settings.symfony_retry_base_delay,
+                max_delay=settings.symfony_retry_max_delay
+            ),
+            breaker_failure_threshold=settings.symfony_breaker_failure_threshold,
+            breaker_reset_timeout=settings.symfony_breaker_reset_timeout,
+            conditional_cache_bytes=settings.symfony_conditional_cache_mb * 1024 * 1024,
+            upsert_window=settings.symfony_upsert_window,
+            upsert_max_batch=settings.symfony_upsert_max_batch,
+            upsert_concurrency=settings.symfony_upsert_concurrency,
+            idempotency_ttl=settings.symfony_idempotency_ttl,
+            bots_batch_size=settings.symfony_bots_batch_size,
+            lookup_concurrency=settings.symfony_lookup_concurrency,
+            upsert_reports_created=settings.symfony_upsert_reports_created,
+            retry_bot_posts=settings.symfony_retry_bot_posts
+        )
+    
+    async def warm_up(self, connections: int = 4) -> int:
+        """
+        Pre-open pooled connections so the first user request skips TCP setup.
+        
+        Issues concurrent health checks; each keeps its connection alive in the pool.
+        
+        Args:
+            connections: Number of connections to open
+            
+        Returns:
+            Number of warm-up requests that reached the API
+        """
+        if connections <= 0:
+            return 0
+        
+        warmed = await self._transport.warm_up(f"{self.base_url}/health", connections)
+        logger.info(f"Symfony API pool warmed ({self._transport.name}): {warmed}/{connections} connections")
+        return warmed
+    
+    def pool_stats(self) -> dict:
+        """
+        Get connection pool saturation statistics.
+        
+        Returns:
+            Dict with in-flight/peak requests, queueing and connection reuse counters
+        """
+        return self._transport.stats()
+    
+    def _breaker(self, endpoint: str) -> CircuitBreaker:
+        """Get or create the circuit breaker of an endpoint."""
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = self._breakers[endpoint] = CircuitBreaker(**self._breaker_options)
+        return breaker
+    
+    def _endpoint(self, method: str, url: str) -> str:
+        """Get the endpoint key of a request, e.g. 'GET /user/{id}/bots'."""
+        path = url[len(self.base_url):] if url.startswith(self.base_url) else url
+        path = path.split("?", 1)[0]
+        path = re.sub(r"/[^/]*\d[^/]*", "/{id}", path)
+        return f"{method} {path}"
+    
+    async def _send(self, method: str, url: str, *, json=None, headers: Optional[Dict[str, str]] = None,
+                    idempotent: Optional[bool] = None):
+        """
+        Send a request with retries and per-endpoint circuit breaking.
+        
+        Idempotent requests are retried on network errors and transient
+        statuses with jittered exponential backoff. While an endpoint's
+        circuit is open, calls fail immediately with CircuitOpenError.
+        GETs of previously validated URLs are sent conditionally, and a
+        304 is answered from the cached body as a 200.
+        
+        Args:
+            method: HTTP method
+            url: Request URL
+            json: JSON body (optional)
+            headers: Extra request headers (optional)
+            idempotent: Whether the request may be repeated (defaults by method)
+            
+        Returns:
+            TransportResponse of the last attempt
+            
+        Raises:
+            TransportError: On network failure after the last attempt, or CircuitOpenError
+        """
+        endpoint = self._endpoint(method, url)
+        breaker = self._breaker(endpoint)
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        attempts = self._retry_policy.attempts if idempotent else 1
+        
+        cached = None
+        if method == "GET" and self._conditional_cache is not None:
+            cached = self._conditional_cache.get(url)
+        if cached:
+            headers = {**cached.validators(), **(headers or {})}
+        
+        for attempt in range(attempts):
+            trial = breaker.state == CircuitBreaker.HALF_OPEN
+            if not breaker.allow():
+                raise CircuitOpenError(endpoint, breaker.retry_after())
+            
+            error = None
+            try:
+                response = await self._transport.request(method, url, json=json, headers=headers)
+            except TransportError as e:
+                breaker.record_failure()
+                error = e
+            else:
+                if _is_failure(response.status):
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            finally:
+                # Outcome already recorded, unless the trial was cancelled or crashed
+                if trial:
+                    breaker.release()
+            
+            if error is not None:
+                if attempt + 1 >= attempts:
+                    raise error
+                delay = self._retry_policy.delay(attempt)
+                logger.warning(f"{endpoint} failed ({error}), retry {attempt + 1}/{attempts - 1} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+            
+            if not _is_failure(response.status):
+                if method == "GET":
+                    return self._revalidated(url, cached, response)
+                return response
+            
+            if response.status not in RETRYABLE_STATUSES or attempt + 1 >= attempts:
+                return response
+            
+            retry_after = response.headers.get("Retry-After")
+            delay = self._retry_policy.delay(
+                attempt, float(retry_after) if retry_after and retry_after.isdigit() else None
+            )
+            logger.warning(
+                f"{endpoint} returned HTTP {response.status}, "
+                f"retry {attempt + 1}/{attempts - 1} in {delay:.2f}s"
             )
-        return self._session
+            await asyncio.sleep(delay)
+    
+    def _revalidated(self, key: str, cached: Optional[CachedResponse],
+                     response: TransportResponse) -> TransportResponse:
+        """Resolve a conditional GET: answer a 304 from the cache, cache a validated 200."""
+        if self._conditional_cache is None:
+            return response
+        
+        if response.status == 304 and cached is not None:
+            self._conditional_cache.record_not_modified(cached)
+            return TransportResponse(200, cached.headers, cached.body, self._transport.codec)
+        
+        if response.status == 200:
+            self._conditional_cache.store(key, response.headers, response.body)
+        else:
+            self._conditional_cache.invalidate(key)
+        return response
+    
+    def circuit_state(self) -> dict:
+        """
+        Get the state of every endpoint's circuit breaker.
+        
+        Returns:
+            Dict mapping endpoint keys to breaker stats
+        """
+        return {endpoint: breaker.stats() for endpoint, breaker in self._breakers.items()}
+    
+    def is_degraded(self, *endpoints: str) -> bool:
+        """
+        Check whether endpoints are failing fast, so callers can shed load.
+        
+        Args:
+            endpoints: Endpoint keys to check, e.g. 'POST /bot' or 'GET /user/{id}'
+                (all known endpoints if none are given)
+            
+        Returns:
+            True if a checked circuit rejects calls (open, or half-open with its trial taken)
+        """
+        if endpoints:
+            breakers = (self._breakers.get(endpoint) for endpoint in endpoints)
+        else:
+            breakers = self._breakers.values()
+        return any(breaker is not None and breaker.failing_fast for breaker in breakers)
+    
+    def cache_stats(self) -> dict:
+        """
+        Get hit/miss/eviction counters of the lookup caches.
+        
+        Returns:
+            Dict with stats for the user and bots caches and the conditional GET cache
+        """
+        return {
+            "user": self._user_cache.stats(),
+            "bots": self._bots_cache.stats(),
+            "conditional": self._conditional_cache.stats() if self._conditional_cache else None,
+            "idempotency": self._idempotency.stats()
+        }
+    
+    def coalescing_stats(self) -> dict:
+        """
+        Get request coalescing counters.
+        
+        Returns:
+            Dict with number of issued (leaders) and deduplicated GETs, and bot lookup batching
+        """
+        return {
+            **self._inflight.stats(),
+            "bots_loader": {**self._bots_loader.stats(), "bulk_supported": self._bulk_bots_supported}
+        }
+    
+    def invalidate_user(self, telegram_id: str, include_bots: bool = True) -> None:
+        """
+        Drop cached and in-flight lookups for a Telegram user.
+        
+        Args:
+            telegram_id: Telegram user ID
+            include_bots: Also drop the user's bot list
+        """
+        self._user_cache.invalidate(str(telegram_id))
+        self._inflight.forget(f"{self.base_url}/user/{telegram_id}")
+        if include_bots:
+            self._bots_cache.invalidate(str(telegram_id))
+            self._inflight.forget(f"{self.base_url}/user/{telegram_id}/bots")
+    
+    def write_behind_stats(self) -> dict:
+        """
+        Get write-behind upsert metrics.
+        
+        Returns:
+            Dict with coalescing, no-op, batch-size and flush-latency counters
+        """
+        return {**self._upserts.stats(), "bulk_supported": self._bulk_upsert_supported}
     
     async def close(self) -> None:
-        """Close aiohttp session."""
-        if self._session and not self._session.closed:
-            await self._session.close()
-            logger.info("Symfony API session closed")
+        """Flush deferred writes, then close the transport and its pooled connections."""
+        await self._upserts.close()
+        await self._transport.close()
+        logger.info("Symfony API session closed")
     
     async def ping(self) -> bool:
         """
@@ -72,11 +501,10 @@ class SymfonyAPI:
             True if API is reachable, False otherwise
         """
         try:
-            session = await self._get_session()
-            async with session.get(f"{self.base_url}/health", timeout=aiohttp.ClientTimeout(total=5)) as response:
-                logger.debug(f"Symfony API ping status: {response.status}")
-                return response.status == 200
-        except aiohttp.ClientError as e:
+            response = await self._transport.request("GET", f"{self.base_url}/health")
+            logger.debug(f"Symfony API ping status: {response.status}")
+            return response.status == 200
+        except TransportError as e:
             logger.warning(f"Symfony API ping failed: {e}")
             return False
         except Exception as e:
@@ -91,35 +519,15 @@ class SymfonyAPI:
             Dict with connection status and details
         """
         try:
-            session = await self._get_session()
             test_url = f"{self.base_url}/user/12345"  # Test with dummy ID
+            response = await self._transport.request("GET", test_url)
+            content_type = response.headers.get('content-type', '')
+            is_json = 'application/json' in content_type
             
-            async with session.get(test_url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                content_type = response.headers.get('content-type', '')
-                is_json = 'application/json' in content_type
-                
-                if response.status == 404:
-                    # 404 is expected for non-existent user, but we want JSON response
-                    try:
-                        data = await response.json()
-                        return {
-                            "status": "success",
-                            "message": "API is reachable and returns JSON",
-                            "status_code": response.status,
-                            "content_type": content_type,
-                            "is_json": is_json,
-                            "response_sample": str(data)[:200] + "..." if len(str(data)) > 200 else str(data)
-                        }
-                    except Exception:
-                        return {
-                            "status": "warning",
-                            "message": "API is reachable but doesn't return JSON",
-                            "status_code": response.status,
-                            "content_type": content_type,
-                            "is_json": is_json
-                        }
-                elif response.status == 200:
-                    data = await response.json()
+            if response.status == 404:
+                # 404 is expected for non-existent user, but we want JSON response
+                try:
+                    data = response.json()
                     return {
                         "status": "success",
                         "message": "API is reachable and returns JSON",
@@ -128,16 +536,34 @@ class SymfonyAPI:
                         "is_json": is_json,
                         "response_sample": str(data)[:200] + "..." if len(str(data)) > 200 else str(data)
                     }
-                else:
+                except Exception:
                     return {
-                        "status": "error",
-                        "message": f"Unexpected status code: {response.status}",
+                        "status": "warning",
+                        "message": "API is reachable but doesn't return JSON",
                         "status_code": response.status,
                         "content_type": content_type,
                         "is_json": is_json
                     }
-                    
-        except aiohttp.ClientError as e:
+            elif response.status == 200:
+                data = response.json()
+                return {
+                    "status": "success",
+                    "message": "API is reachable and returns JSON",
+                    "status_code": response.status,
+                    "content_type": content_type,
+                    "is_json": is_json,
+                    "response_sample": str(data)[:200] + "..." if len(str(data)) > 200 else str(data)
+                }
+            else:
+                return {
+                    "status": "error",
+                    "message": f"Unexpected status code: {response.status}",
+                    "status_code": response.status,
+                    "content_type": content_type,
+                    "is_json": is_json
+                }
+                
+        except TransportError as e:
             return {
                 "status": "error",
                 "message": f"Network error: {str(e)}",
@@ -163,7 +589,7 @@ class SymfonyAPI:
             username: Telegram username (optional)
             
         Returns:
-            Response dict with status and data
+            Response dict with status, data and whether the user was created (HTTP 201)
         """
         url = f"{self.base_url}/user"
         payload = {
@@ -172,27 +598,32 @@ class SymfonyAPI:
         }
         
         try:
-            session = await self._get_session()
-            async with session.post(url, json=payload) as response:
-                response_data = await response.json()
+            response = await self._send("POST", url, json=payload)
+            response_data = response.json()
+            
+            self.invalidate_user(telegram_id, include_bots=False)
+            
+            if response.status in (200, 201):
+                self._upserted.set(str(telegram_id), username or "")
+                if response.status == 201:
+                    self.upsert_reports_created = True
+                logger.info(f"User upserted successfully: telegram_id={telegram_id}, username={username}")
+                return {
+                    "status": "success",
+                    "data": response_data,
+                    "created": response.status == 201
+                }
+            else:
+                logger.error(
+                    f"Failed to upsert user: status={response.status}, "
+                    f"telegram_id={telegram_id}, response={response_data}"
+                )
+                return {
+                    "status": "error",
+                    "message": f"HTTP {response.status}: {response_data.get('message', 'Unknown error')}"
+                }
                 
-                if response.status in (200, 201):
-                    logger.info(f"User upserted successfully: telegram_id={telegram_id}, username={username}")
-                    return {
-                        "status": "success",
-                        "data": response_data
-                    }
-                else:
-                    logger.error(
-                        f"Failed to upsert user: status={response.status}, "
-                        f"telegram_id={telegram_id}, response={response_data}"
-                    )
-                    return {
-                        "status": "error",
-                        "message": f"HTTP {response.status}: {response_data.get('message', 'Unknown error')}"
-                    }
-                    
-        except aiohttp.ClientError as e:
+        except TransportError as e:
             logger.error(f"Network error while upserting user {telegram_id}: {e}")
             return {
                 "status": "error",
@@ -205,18 +636,152 @@ class SymfonyAPI:
                 "message": f"Unexpected error: {str(e)}"
             }
     
-    async def add_bot(self, telegram_id: str, bot_username: str, description: str) -> dict:
+    def upsert_user_deferred(self, telegram_id: str, username: Optional[str] = None) -> asyncio.Future:
+        """
+        Queue a user upsert on the write-behind queue.
+        
+        Upserts for the same user within the batching window are coalesced,
+        and upserts that would not change the stored username are dropped.
+        Queued upserts are flushed together through the bulk endpoint, or as
+        parallel single upserts if the backend has none.
+        
+        Args:
+            telegram_id: Telegram user ID
+            username: Telegram username (optional)
+            
+        Returns:
+            Future with the upsert's response dict (awaiting it is optional)
+        """
+        key = str(telegram_id)
+        username = username or ""
+        if not self._upserts.is_pending(key) and self._is_noop_upsert(key, username):
+            return self._upserts.skip({"status": "success", "data": None, "skipped": True})
+        return self._upserts.submit(key, {"telegram_id": key, "username": username})
+    
+    def cached_user(self, telegram_id: str) -> Optional[dict]:
+        """
+        Get a user from the lookup cache without a request.
+        
+        Args:
+            telegram_id: Telegram user ID
+            
+        Returns:
+            Cached user data, or None if not cached or not found
+        """
+        cached = self._user_cache.get(str(telegram_id))
+        if cached and cached.get("status") == "success":
+            return cached.get("data")
+        return None
+    
+    def _is_noop_upsert(self, telegram_id: str, username: str) -> bool:
+        """Check whether the username was already written or is what the API returned."""
+        if self._upserted.get(telegram_id) == username:
+            return True
+        cached = self.cached_user(telegram_id)
+        return cached is not None and (cached.get("username") or "") == username
+    
+    async def _flush_upserts(self, payloads: List[dict]) -> List[dict]:
+        """Write queued upserts in bulk, falling back to parallel single upserts."""
+        if len(payloads) > 1 and self._bulk_upsert_supported is not False:
+            results = await self._bulk_upsert(payloads)
+            if results is not None:
+                return results
+        
+        semaphore = asyncio.Semaphore(self._upsert_concurrency)
+        
+        async def upsert_one(payload: dict) -> dict:
+            async with semaphore:
+                return await self.upsert_user(payload["telegram_id"], payload["username"])
+        
+        return list(await asyncio.gather(*(upsert_one(payload) for payload in payloads)))
+    
+    async def _bulk_upsert(self, payloads: List[dict]) -> Optional[List[dict]]:
+        """
+        Upsert users through POST /users/bulk.
+        
+        Returns:
+            One response dict per payload, or None if the endpoint does not exist
+        """
+        url = f"{self.base_url}/users/bulk"
+        
+        try:
+            response = await self._send("POST", url, json={"users": payloads})
+        except TransportError as e:
+            logger.error(f"Network error while bulk upserting {len(payloads)} users: {e}")
+            return [{"status": "error", "message": f"Network error: {str(e)}"}] * len(payloads)
+        
+        if response.status in BULK_UNSUPPORTED_STATUSES:
+            logger.info(f"Bulk upsert endpoint unavailable (HTTP {response.status}), using single upserts")
+            self._bulk_upsert_supported = False
+            return None
+        
+        for payload in payloads:
+            self.invalidate_user(payload["telegram_id"], include_bots=False)
+        
+        try:
+            response_data = response.json()
+        except ValueError:
+            response_data = None
+        
+        if response.status not in (200, 201):
+            message = "Unknown error"
+            if isinstance(response_data, dict):
+                message = response_data.get("message", message)
+            logger.error(f"Failed to bulk upsert {len(payloads)} users: status={response.status}")
+            return [{"status": "error", "message": f"HTTP {response.status}: {message}"}] * len(payloads)
+        
+        self._bulk_upsert_supported = True
+        if isinstance(response_data, dict):
+            response_data = response_data.get("users")
+        aligned = isinstance(response_data, list) and len(response_data) == len(payloads)
+        
+        results = []
+        for i, payload in enumerate(payloads):
+            self._upserted.set(payload["telegram_id"], payload["username"])
+            results.append({"status": "success", "data": response_data[i] if aligned else None})
+        logger.info(f"Bulk upserted {len(payloads)} users")
+        return results
+    
+    async def add_bot(self, telegram_id: str, bot_username: str, description: str,
+                      idempotency_key: Optional[str] = None) -> dict:
         """
         Add a new Telegram bot to Symfony API.
         
+        Duplicate submissions with the same idempotency key collapse into one
+        backend write. Concurrent duplicates share the in-flight request, and
+        later ones within the dedup TTL get the stored result, until the owner
+        deletes a bot. The key is also sent as an Idempotency-Key header so the
+        backend can dedup across processes; the POST itself is sent once unless
+        retry_bot_posts is enabled.
+        
         Args:
             telegram_id: Owner's Telegram user ID
             bot_username: Bot's username (e.g., @mybot)
             description: Bot description
+            idempotency_key: Key identifying this registration (defaults to a hash of its content)
             
         Returns:
-            Response dict with status and data
+            Response dict with status and data ('deduplicated' set if no write was made)
         """
+        key = idempotency_key or bot_idempotency_key(telegram_id, bot_username, description)
+        
+        stored = self._idempotency.get((str(telegram_id), key))
+        if stored is not None:
+            logger.info(
+                f"Duplicate bot registration collapsed: telegram_id={telegram_id}, "
+                f"bot_username={bot_username}"
+            )
+            return _copy_result(stored, deduplicated=True)
+        
+        result = await self._inflight.do(
+            f"add_bot:{telegram_id}:{key}", lambda: self._post_bot(telegram_id, bot_username, description, key)
+        )
+        if result.get("status") == "success":
+            self._idempotency.set((str(telegram_id), key), result)
+        return _copy_result(result)
+    
+    async def _post_bot(self, telegram_id: str, bot_username: str, description: str, key: str) -> dict:
+        """Perform the POST behind add_bot."""
         url = f"{self.base_url}/bot"
         payload = {
             "telegram_id": str(telegram_id),
@@ -225,31 +790,35 @@ class SymfonyAPI:
         }
         
         try:
-            session = await self._get_session()
-            async with session.post(url, json=payload) as response:
-                response_data = await response.json()
+            response = await self._send(
+                "POST", url, json=payload, headers={"Idempotency-Key": key},
+                idempotent=self._retry_bot_posts
+            )
+            response_data = response.json()
+            
+            self.invalidate_user(telegram_id)
+            
+            if response.status in (200, 201):
+                logger.info(
+                    f"Bot added successfully: telegram_id={telegram_id}, "
+                    f"bot_username={bot_username}"
+                )
+                return {
+                    "status": "success",
+                    "data": response_data
+                }
+            else:
+                logger.error(
+                    f"Failed to add bot: status={response.status}, "
+                    f"telegram_id={telegram_id}, bot_username={bot_username}, "
+                    f"response={response_data}"
+                )
+                return {
+                    "status": "error",
+                    "message": f"HTTP {response.status}: {response_data.get('message', 'Unknown error')}"
+                }
                 
-                if response.status in (200, 201):
-                    logger.info(
-                        f"Bot added successfully: telegram_id={telegram_id}, "
-                        f"bot_username={bot_username}"
-                    )
-                    return {
-                        "status": "success",
-                        "data": response_data
-                    }
-                else:
-                    logger.error(
-                        f"Failed to add bot: status={response.status}, "
-                        f"telegram_id={telegram_id}, bot_username={bot_username}, "
-                        f"response={response_data}"
-                    )
-                    return {
-                        "status": "error",
-                        "message": f"HTTP {response.status}: {response_data.get('message', 'Unknown error')}"
-                    }
-                    
-        except aiohttp.ClientError as e:
+        except TransportError as e:
             logger.error(
                 f"Network error while adding bot {bot_username} for user {telegram_id}: {e}"
             )
@@ -278,34 +847,45 @@ class SymfonyAPI:
         """
         url = f"{self.base_url}/user/{telegram_id}"
         
+        cached = self._user_cache.get(str(telegram_id))
+        if cached is not None:
+            return dict(cached)
+        
+        generation = self._user_cache.generation
+        result = await self._inflight.do(url, lambda: self._fetch_user(telegram_id, url))
+        if result.get("status") in ("success", "not_found"):
+            self._user_cache.set_if_current(str(telegram_id), result, generation)
+        return dict(result)
+    
+    async def _fetch_user(self, telegram_id: str, url: str) -> dict:
+        """Perform the GET behind get_user."""
         try:
-            session = await self._get_session()
-            async with session.get(url) as response:
-                if response.status == 200:
-                    response_data = await response.json()
-                    logger.debug(f"User retrieved: telegram_id={telegram_id}")
-                    return {
-                        "status": "success",
-                        "data": response_data
-                    }
-                elif response.status == 404:
-                    logger.debug(f"User not found: telegram_id={telegram_id}")
-                    return {
-                        "status": "not_found",
-                        "data": None
-                    }
-                else:
-                    response_data = await response.json()
-                    logger.error(
-                        f"Failed to get user: status={response.status}, "
-                        f"telegram_id={telegram_id}, response={response_data}"
-                    )
-                    return {
-                        "status": "error",
-                        "message": f"HTTP {response.status}: {response_data.get('message', 'Unknown error')}"
-                    }
-                    
-        except aiohttp.ClientError as e:
+            response = await self._send("GET", url)
+            if response.status == 200:
+                response_data = response.json()
+                logger.debug(f"User retrieved: telegram_id={telegram_id}")
+                return {
+                    "status": "success",
+                    "data": response_data
+                }
+            elif response.status == 404:
+                logger.debug(f"User not found: telegram_id={telegram_id}")
+                return {
+                    "status": "not_found",
+                    "data": None
+                }
+            else:
+                response_data = response.json()
+                logger.error(
+                    f"Failed to get user: status={response.status}, "
+                    f"telegram_id={telegram_id}, response={response_data}"
+                )
+                return {
+                    "status": "error",
+                    "message": f"HTTP {response.status}: {response_data.get('message', 'Unknown error')}"
+                }
+                
+        except TransportError as e:
             logger.error(f"Network error while getting user {telegram_id}: {e}")
             return {
                 "status": "error",
@@ -347,27 +927,28 @@ class SymfonyAPI:
             payload["username"] = username
         
         try:
-            session = await self._get_session()
-            async with session.put(url, json=payload) as response:
-                response_data = await response.json()
+            response = await self._send("PUT", url, json=payload)
+            response_data = response.json()
+            
+            self.invalidate_user(telegram_id, include_bots=False)
+            
+            if response.status in (200, 201):
+                logger.info(f"User profile updated: telegram_id={telegram_id}")
+                return {
+                    "status": "success",
+                    "data": response_data
+                }
+            else:
+                logger.error(
+                    f"Failed to update user profile: status={response.status}, "
+                    f"telegram_id={telegram_id}, response={response_data}"
+                )
+                return {
+                    "status": "error",
+                    "message": f"HTTP {response.status}: {response_data.get('message', 'Unknown error')}"
+                }
                 
-                if response.status in (200, 201):
-                    logger.info(f"User profile updated: telegram_id={telegram_id}")
-                    return {
-                        "status": "success",
-                        "data": response_data
-                    }
-                else:
-                    logger.error(
-                        f"Failed to update user profile: status={response.status}, "
-                        f"telegram_id={telegram_id}, response={response_data}"
-                    )
-                    return {
-                        "status": "error",
-                        "message": f"HTTP {response.status}: {response_data.get('message', 'Unknown error')}"
-                    }
-                    
-        except aiohttp.ClientError as e:
+        except TransportError as e:
             logger.error(f"Network error while updating user {telegram_id}: {e}")
             return {
                 "status": "error",
@@ -392,28 +973,39 @@ class SymfonyAPI:
         """
         url = f"{self.base_url}/user/{telegram_id}/bots"
         
+        cached = self._bots_cache.get(str(telegram_id))
+        if cached is not None:
+            return dict(cached)
+        
+        generation = self._bots_cache.generation
+        result = await self._inflight.do(url, lambda: self._fetch_user_bots(telegram_id, url))
+        if result.get("status") == "success":
+            self._bots_cache.set_if_current(str(telegram_id), result, generation)
+        return dict(result)
+    
+    async def _fetch_user_bots(self, telegram_id: str, url: str) -> dict:
+        """Perform the GET behind get_user_bots."""
         try:
-            session = await self._get_session()
-            async with session.get(url) as response:
-                if response.status == 200:
-                    response_data = await response.json()
-                    logger.debug(f"User bots retrieved: telegram_id={telegram_id}")
-                    return {
-                        "status": "success",
-                        "data": response_data
-                    }
-                else:
-                    response_data = await response.json()
-                    logger.error(
-                        f"Failed to get user bots: status={response.status}, "
-                        f"telegram_id={telegram_id}, response={response_data}"
-                    )
-                    return {
-                        "status": "error",
-                        "message": f"HTTP {response.status}: {response_data.get('message', 'Unknown error')}"
-                    }
-                    
-        except aiohttp.ClientError as e:
+            response = await self._send("GET", url)
+            if response.status == 200:
+                response_data = response.json()
+                logger.debug(f"User bots retrieved: telegram_id={telegram_id}")
+                return {
+                    "status": "success",
+                    "data": response_data
+                }
+            else:
+                response_data = response.json()
+                logger.error(
+                    f"Failed to get user bots: status={response.status}, "
+                    f"telegram_id={telegram_id}, response={response_data}"
+                )
+                return {
+                    "status": "error",
+                    "message": f"HTTP {response.status}: {response_data.get('message', 'Unknown error')}"
+                }
+                
+        except TransportError as e:
             logger.error(f"Network error while getting user bots {telegram_id}: {e}")
             return {
                 "status": "error",
@@ -426,6 +1018,125 @@ class SymfonyAPI:
                 "message": f"Unexpected error: {str(e)}"
             }
     
+    async def load_user_bots(self, telegram_id: str) -> dict:
+        """
+        Get a user's bots, batched with other lookups made in the same event-loop tick.
+        
+        Behaves like get_user_bots, but concurrent callers (e.g. one gather over
+        many owners) are resolved together by get_bots_by_owners.
+        
+        Args:
+            telegram_id: Owner's Telegram user ID
+            
+        Returns:
+            Response dict with status and bots data
+        """
+        cached = self._bots_cache.get(str(telegram_id))
+        if cached is not None:
+            return dict(cached)
+        result = await self._bots_loader.load(str(telegram_id))
+        return dict(result) if result is not None else {"status": "error", "message": "No result"}
+    
+    async def get_bots_by_owners(self, telegram_ids: Iterable[str]) -> Dict[str, dict]:
+        """
+        Get the bots of many users at once.
+        
+        Cached lists are served directly. The rest is requested with one
+        GET /bots?owners=... call. Without a bulk endpoint, it falls back to
+        single lookups with bounded parallelism.
+        
+        Args:
+            telegram_ids: Owners' Telegram user IDs
+            
+        Returns:
+            Response dict (as from get_user_bots) per telegram_id
+        """
+        results: Dict[str, dict] = {}
+        missing = []
+        for telegram_id in dict.fromkeys(str(telegram_id) for telegram_id in telegram_ids):
+            cached = self._bots_cache.get(telegram_id)
+            if cached is not None:
+                results[telegram_id] = dict(cached)
+            else:
+                missing.append(telegram_id)
+        
+        if len(missing) > 1 and self._bulk_bots_supported is not False:
+            bulk = await self._bulk_get_bots(missing)
+            if bulk is not None:
+                results.update(bulk)
+                return results
+        
+        semaphore = asyncio.Semaphore(self._lookup_concurrency)
+        
+        async def get_one(telegram_id: str) -> dict:
+            async with semaphore:
+                return await self.get_user_bots(telegram_id)
+        
+        fetched = await asyncio.gather(*(get_one(telegram_id) for telegram_id in missing))
+        results.update(zip(missing, fetched))
+        return results
+    
+    async def _bulk_get_bots(self, telegram_ids: List[str]) -> Optional[Dict[str, dict]]:
+        """
+        Get the bots of several owners through GET /bots?owners=....
+        
+        The response may map owner ids to bot lists or be a flat list of bots
+        carrying owner_id. Owners missing from it have no bots.
+        
+        Returns:
+            Response dict per telegram_id, or None if the endpoint does not exist
+        """
+        url = f"{self.base_url}/bots?{urlencode({'owners': ','.join(telegram_ids)})}"
+        generation = self._bots_cache.generation
+        
+        try:
+            response = await self._send("GET", url)
+        except TransportError as e:
+            logger.error(f"Network error while getting bots of {len(telegram_ids)} users: {e}")
+            return {telegram_id: {"status": "error", "message": f"Network error: {str(e)}"}
+                    for telegram_id in telegram_ids}
+        
+        if response.status in BULK_UNSUPPORTED_STATUSES:
+            logger.info(f"Bulk bots endpoint unavailable (HTTP {response.status}), using single lookups")
+            self._bulk_bots_supported = False
+            return None
+        
+        try:
+            response_data = response.json()
+        except ValueError:
+            response_data = None
+        
+        if response.status != 200:
+            message = "Unknown error"
+            if isinstance(response_data, dict):
+                message = response_data.get("message", message)
+            logger.error(f"Failed to get bots of {len(telegram_ids)} users: status={response.status}")
+            return {telegram_id: {"status": "error", "message": f"HTTP {response.status}: {message}"}
+                    for telegram_id in telegram_ids}
+        
+        self._bulk_bots_supported = True
+        if isinstance(response_data, dict) and "bots" in response_data:
+            response_data = response_data["bots"]
+        
+        by_owner: Dict[str, list] = {telegram_id: [] for telegram_id in telegram_ids}
+        if isinstance(response_data, dict):
+            for owner_id, bots in response_data.items():
+                if str(owner_id) in by_owner and isinstance(bots, list):
+                    by_owner[str(owner_id)] = bots
+        elif isinstance(response_data, list):
+            for bot in response_data:
+                owner_id = str(bot.get("owner_id", bot.get("telegram_id")))
+                if owner_id in by_owner:
+                    by_owner[owner_id].append(bot)
+        
+        results = {}
+        for telegram_id, bots in by_owner.items():
+            result = {"status": "success", "data": bots}
+            self._bots_cache.set_if_current(telegram_id, result, generation)
+            results[telegram_id] = dict(result)
+        logger.debug(f"Bots of {len(telegram_ids)} users retrieved in bulk")
+        return results
+    
     async def get_all_users_with_bots(self) -> dict:
         """
         Get all users with their bots from Symfony API.
@@ -434,29 +1145,31 @@ class SymfonyAPI:
             Response dict with status and users data
         """
         url = f"{self.base_url}/users"
-        
+        return dict(await self._inflight.do(url, lambda: self._fetch_all_users_with_bots(url)))
+    
+    async def _fetch_all_users_with_bots(self, url: str) -> dict:
+        """Perform the GET behind get_all_users_with_bots."""
         try:
-            session = await self._get_session()
-            async with session.get(url) as response:
-                if response.status == 200:
-                    response_data = await response.json()
-                    logger.debug("All users with bots retrieved")
-                    return {
-                        "status": "success",
-                        "data": response_data
-                    }
-                else:
-                    response_data = await response.json()
-                    logger.error(
-                        f"Failed to get all users: status={response.status}, "
-                        f"response={response_data}"
-                    )
-                    return {
-                        "status": "error",
-                        "message": f"HTTP {response.status}: {response_data.get('message', 'Unknown error')}"
-                    }
-                    
-        except aiohttp.ClientError as e:
+            response = await self._send("GET", url)
+            if response.status == 200:
+                response_data = response.json()
+                logger.debug("All users with bots retrieved")
+                return {
+                    "status": "success",
+                    "data": response_data
+                }
+            else:
+                response_data = response.json()
+                logger.error(
+                    f"Failed to get all users: status={response.status}, "
+                    f"response={response_data}"
+                )
+                return {
+                    "status": "error",
+                    "message": f"HTTP {response.status}: {response_data.get('message', 'Unknown error')}"
+                }
+                
+        except TransportError as e:
             logger.error(f"Network error while getting all users: {e}")
             return {
                 "status": "error",
@@ -469,12 +1182,159 @@ class SymfonyAPI:
                 "message": f"Unexpected error: {str(e)}"
             }
     
-    async def delete_bot(self, bot_id: str) -> dict:
+    async def iter_users_with_bots(self, page_size: Optional[int] = None,
+                                   updated_since: Optional[str] = None) -> AsyncIterator[dict]:
+        """
+        Stream all users with their bots from Symfony API, page by page.
+        
+        Pages are requested with ``page``/``limit`` query parameters and each
+        body is parsed incrementally, so only one user record is materialized
+        at a time. A backend that ignores pagination returns the whole registry
+        on the first page, which is still streamed and ends the iteration.
+        
+        With ``updated_since`` only users changed at or after that timestamp
+        are requested; backends without delta support return everyone.
+        Pages that carried validators are revalidated; a 304 replays the
+        cached page body. Pages are fetched with the client's retry policy
+        and circuit breaker like other requests; a page that fails after
+        some of its users were yielded is resumed after them.
+        
+        Args:
+            page_size: Users per page (defaults to the client's page_size)
+            updated_since: ISO 8601 cursor for an incremental listing (optional)
+            
+        Yields:
+            Raw user dicts as returned by the API
+            
+        Raises:
+            SymfonyAPIError: If a page cannot be fetched or parsed
+        """
+        url = f"{self.base_url}/users"
+        limit = page_size or self.page_size
+        params = {"limit": limit}
+        if updated_since is not None:
+            params["updated_since"] = updated_since
+        page = 1
+        previous_first_id = None
+        
+        attempts = self._retry_policy.attempts
+        
+        while True:
+            # Users of this page yielded so far (kept across retries of the page)
+            count = 0
+            first_id = None
+            
+            breaker = self._breaker("GET /users")
+            page_params = {**params, "page": page}
+            cache_key = f"{url}?{urlencode(sorted(page_params.items()))}"
+            
+            for attempt in range(attempts):
+                cached = self._conditional_cache.get(cache_key) if self._conditional_cache else None
+                recorder = None
+                delay = None
+                trial = breaker.state == CircuitBreaker.HALF_OPEN
+                
+                try:
+                    if not breaker.allow():
+                        trial = False
+                        raise CircuitOpenError("GET /users", breaker.retry_after())
+                    
+                    stream = self._transport.stream(
+                        "GET", url, params=page_params, headers=cached.validators() if cached else None
+                    )
+                    async with stream as response:
+                        if _is_failure(response.status):
+                            breaker.record_failure()
+                        else:
+                            breaker.record_success()
+                        trial = False
+                        
+                        if response.status in RETRYABLE_STATUSES and attempt + 1 < attempts:
+                            retry_after = response.headers.get("Retry-After")
+                            delay = self._retry_policy.delay(
+                                attempt, float(retry_after) if retry_after and retry_after.isdigit() else None
+                            )
+                            chunks = None
+                        elif response.status == 304 and cached is not None:
+                            self._conditional_cache.record_not_modified(cached)
+                            chunks = _replay(cached.body)
+                        elif response.status != 200:
+                            response_data = (await response.read()).json()
+                            logger.error(
+                                f"Failed to stream users: status={response.status}, "
+                                f"page={page}, response={response_data}"
+                            )
+                            raise SymfonyAPIError(
+                                f"HTTP {response.status}: {response_data.get('message', 'Unknown error')}"
+                            )
+                        elif self._conditional_cache and (
+                            response.headers.get("ETag") or response.headers.get("Last-Modified")
+                        ):
+                            recorder = _BodyRecorder(response.iter_chunks(), self._conditional_cache.max_body)
+                            chunks = recorder
+                        else:
+                            chunks = response.iter_chunks()
+                        
+                        if chunks is not None:
+                            # A retried page skips the users it already yielded
+                            position = 0
+                            skip = count
+                            async for user_data in iter_json_array(chunks):
+                                position += 1
+                                if position <= skip:
+                                    continue
+                                if count == 0:
+                                    first_id = user_data.get("telegram_id")
+                                    # Same page again means the backend ignores pagination
+                                    if page > 1 and first_id is not None and first_id == previous_first_id:
+                                        return
+                                count += 1
+                                yield user_data
+                            
+                except TransportError as e:
+                    if isinstance(e, CircuitOpenError) or attempt + 1 >= attempts:
+                        if not isinstance(e, CircuitOpenError):
+                            breaker.record_failure()
+                        logger.error(f"Network error while streaming users (page {page}): {e}")
+                        raise SymfonyAPIError(f"Network error: {str(e)}") from e
+                    breaker.record_failure()
+                    delay = self._retry_policy.delay(attempt)
+                except ValueError as e:
+                    logger.error(f"Invalid users payload (page {page}): {e}")
+                    raise SymfonyAPIError(f"Invalid payload: {str(e)}") from e
+                finally:
+                    # Free the trial slot if the page was cancelled before its status was recorded
+                    if trial:
+                        breaker.release()
+                
+                if delay is None:
+                    break
+                logger.warning(
+                    f"GET /users page {page} failed, retry {attempt + 1}/{attempts - 1} in {delay:.2f}s "
+                    f"(resuming after {count} users)"
+                )
+                await asyncio.sleep(delay)
+            
+            if response.status == 200 and self._conditional_cache is not None:
+                body = recorder.body() if recorder else None
+                if body is not None:
+                    self._conditional_cache.store(cache_key, response.headers, body)
+                else:
+                    self._conditional_cache.invalidate(cache_key)
+            
+            logger.debug(f"Users page {page} streamed: {count} records")
+            if count != limit:
+                return
+            previous_first_id = first_id
+            page += 1
+    
+    async def delete_bot(self, bot_id: str, telegram_id: Optional[str] = None) -> dict:
         """
         Delete a bot from Symfony API.
         
         Args:
             bot_id: Bot ID to delete
+            telegram_id: Owner's Telegram user ID (optional, narrows cache invalidation)
             
         Returns:
             Response dict with status
@@ -482,32 +1342,40 @@ class SymfonyAPI:
         url = f"{self.base_url}/bot/{bot_id}"
         
         try:
-            session = await self._get_session()
-            async with session.delete(url) as response:
-                if response.status in (200, 204):
-                    logger.info(f"Bot deleted successfully: bot_id={bot_id}")
-                    return {
-                        "status": "success",
-                        "data": None
-                    }
-                elif response.status == 404:
-                    logger.warning(f"Bot not found for deletion: bot_id={bot_id}")
-                    return {
-                        "status": "not_found",
-                        "data": None
-                    }
-                else:
-                    response_data = await response.json()
-                    logger.error(
-                        f"Failed to delete bot: status={response.status}, "
-                        f"bot_id={bot_id}, response={response_data}"
-                    )
-                    return {
-                        "status": "error",
-                        "message": f"HTTP {response.status}: {response_data.get('message', 'Unknown error')}"
-                    }
-                    
-        except aiohttp.ClientError as e:
+            response = await self._send("DELETE", url)
+            # Owner is unknown without telegram_id, so every cached bot list and
+            # remembered registration may be stale (re-adding the bot must write again)
+            if telegram_id is not None:
+                self.invalidate_user(telegram_id)
+                self._idempotency.invalidate_where(lambda key: key[0] == str(telegram_id))
+            else:
+                self._bots_cache.clear()
+                self._idempotency.clear()
+            
+            if response.status in (200, 204):
+                logger.info(f"Bot deleted successfully: bot_id={bot_id}")
+                return {
+                    "status": "success",
+                    "data": None
+                }
+            elif response.status == 404:
+                logger.warning(f"Bot not found for deletion: bot_id={bot_id}")
+                return {
+                    "status": "not_found",
+                    "data": None
+                }
+            else:
+                response_data = response.json()
+                logger.error(
+                    f"Failed to delete bot: status={response.status}, "
+                    f"bot_id={bot_id}, response={response_data}"
+                )
+                return {
+                    "status": "error",
+                    "message": f"HTTP {response.status}: {response_data.get('message', 'Unknown error')}"
+                }
+                
+        except TransportError as e:
             logger.error(f"Network error while deleting bot {bot_id}: {e}")
             return {
                 "status": "error",
@@ -0,0 +1,356 @@
+"""Pluggable HTTP transports for the Symfony API client."""
+import asyncio
+import gzip
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Mapping, Optional
+
+import aiohttp
+from loguru import logger
+
+from services.http_pool import PoolStats, create_pooled_session
+from services.json_codec import JsonCodec, get_codec
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Brotli is advertised only when a decoder is installed (aiohttp and httpx both use it)
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+# Request bodies smaller than this are not worth compressing
+GZIP_MIN_SIZE = 1024
+
+
+class TransportError(Exception):
+    """Network-level failure (connection, timeout, protocol) of a transport."""
+
+
+class TransportResponse:
+    """Fully read HTTP response."""
+
+    def __init__(self, status: int, headers: Mapping[str, str], body: bytes,
+                 codec: Optional[JsonCodec] = None):
+        """
+        Initialize response.
+
+        Args:
+            status: HTTP status code
+            headers: Case-insensitive response headers
+            body: Raw (decompressed) response body
+            codec: JSON codec used by json() (defaults to stdlib)
+        """
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self._codec = codec or JsonCodec()
+
+    def json(self) -> Any:
+        """Decode the body as JSON."""
+        return self._codec.loads(self.body) if self.body else {}
+
+
+class StreamResponse:
+    """HTTP response whose body is consumed incrementally."""
+
+    def __init__(self, status: int, headers: Mapping[str, str], chunks: AsyncIterator[bytes],
+                 codec: Optional[JsonCodec] = None):
+        """
+        Initialize response.
+
+        Args:
+            status: HTTP status code
+            headers: Case-insensitive response headers
+            chunks: Async iterator over raw body chunks
+            codec: JSON codec handed to the fully read response
+        """
+        self.status = status
+        self.headers = headers
+        self._chunks = chunks
+        self._codec = codec
+
+    def iter_chunks(self) -> AsyncIterator[bytes]:
+        """Iterate over body chunks as they arrive."""
+        return self._chunks
+
+    async def read(self) -> TransportResponse:
+        """Read the remaining body into a TransportResponse."""
+        body = b"".join([chunk async for chunk in self._chunks])
+        return TransportResponse(self.status, self.headers, body, self._codec)
+
+
+class Transport:
+    """Interface of an HTTP transport used by SymfonyAPI."""
+
+    name = "base"
+    codec: JsonCodec = JsonCodec()
+    gzip_requests = False
+
+    def _headers(self, headers: Optional[Dict[str, str]]) -> Dict[str, str]:
+        """Add default headers (accepted response encodings) to request headers."""
+        return {"Accept-Encoding": ACCEPT_ENCODING, **(headers or {})}
+
+    def _encode(self, json: Any, headers: Optional[Dict[str, str]]):
+        """Encode a JSON body with the transport codec, gzip it if enabled, and set headers."""
+        headers = self._headers(headers)
+        if json is None:
+            return None, headers
+        body = self.codec.dumps(json)
+        headers = {**JSON_HEADERS, **headers}
+        if self.gzip_requests and len(body) >= GZIP_MIN_SIZE:
+            body = gzip.compress(body, compresslevel=5)
+            headers["Content-Encoding"] = "gzip"
+        return body, headers
+
+    async def request(self, method: str, url: str, *, json: Any = None,
+                      params: Optional[Dict[str, Any]] = None,
+                      headers: Optional[Dict[str, str]] = None) -> TransportResponse:
+        """
+        Perform a request and read the whole response.
+
+        Raises:
+            TransportError: On network errors and timeouts
+        """
+        raise NotImplementedError
+
+    def stream(self, method: str, url: str, *, params: Optional[Dict[str, Any]] = None,
+               headers: Optional[Dict[str, str]] = None):
+        """
+        Perform a request and return an async context manager yielding a StreamResponse.
+
+        Raises:
+            TransportError: On network errors and timeouts
+        """
+        raise NotImplementedError
+
+    async def warm_up(self, url: str, connections: int) -> int:
+        """
+        Open connections ahead of time by issuing concurrent GETs to url.
+
+        Returns:
+            Number of requests that got a response
+        """
+        async def touch() -> bool:
+            try:
+                await self.request("GET", url)
+                return True
+            except TransportError as e:
+                logger.debug(f"Warm-up request failed: {e}")
+                return False
+
+        results = await asyncio.gather(*(touch() for _ in range(connections)))
+        return sum(results)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get connection pool statistics."""
+        return {}
+
+    async def close(self) -> None:
+        """Release pooled connections."""
+
+
+class AiohttpTransport(Transport):
+    """HTTP/1.1 transport over a tuned aiohttp connection pool."""
+
+    name = "aiohttp"
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 20, keepalive_timeout: float = 30.0,
+                 dns_cache_ttl: int = 300, connect_timeout: float = 3.0, read_timeout: float = 10.0,
+                 codec: Optional[JsonCodec] = None, gzip_requests: bool = False):
+        """
+        Initialize transport; the session is created lazily inside the event loop.
+
+        Args:
+            limit: Total number of pooled connections
+            limit_per_host: Pooled connections per host
+            keepalive_timeout: Seconds an idle connection is kept for reuse
+            dns_cache_ttl: Seconds resolved addresses are cached
+            connect_timeout: Seconds to acquire a connection
+            read_timeout: Seconds allowed between reads of a response
+            codec: JSON codec for request and response bodies (defaults to the fastest installed)
+            gzip_requests: Gzip JSON request bodies (the server must accept Content-Encoding)
+        """
+        self.codec = codec or get_codec()
+        self.gzip_requests = gzip_requests
+        self._options = {
+            "limit": limit,
+            "limit_per_host": limit_per_host,
+            "keepalive_timeout": keepalive_timeout,
+            "dns_cache_ttl": dns_cache_ttl,
+            "connect_timeout": connect_timeout,
+            "read_timeout": read_timeout,
+        }
+        self._pool_stats = PoolStats(limit=limit, limit_per_host=limit_per_host)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get or create the pooled session."""
+        if self._session is None or self._session.closed:
+            self._session = create_pooled_session(stats=self._pool_stats, **self._options)
+        return self._session
+
+    async def request(self, method, url, *, json=None, params=None, headers=None):
+        data, headers = self._encode(json, headers)
+        try:
+            async with self._get_session().request(
+                method, url, data=data, params=params, headers=headers
+            ) as response:
+                body = await response.read()
+                return TransportResponse(response.status, response.headers, body, self.codec)
+        except aiohttp.ClientError as e:
+            raise TransportError(str(e)) from e
+        except asyncio.TimeoutError as e:
+            raise TransportError(f"Timeout during {method} {url}") from e
+
+    @asynccontextmanager
+    async def stream(self, method, url, *, params=None, headers=None):
+        try:
+            async with self._get_session().request(
+                method, url, params=params, headers=self._headers(headers)
+            ) as response:
+                yield StreamResponse(
+                    response.status, response.headers, response.content.iter_chunked(65536), self.codec
+                )
+        except aiohttp.ClientError as e:
+            raise TransportError(str(e)) from e
+        except asyncio.TimeoutError as e:
+            raise TransportError(f"Timeout during {method} {url}") from e
+
+    def stats(self):
+        return {"transport": self.name, "codec": self.codec.name, **self._pool_stats.snapshot()}
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+
+class HttpxTransport(Transport):
+    """HTTP/2 transport over httpx, multiplexing concurrent requests on one connection."""
+
+    name = "httpx"
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 20, keepalive_timeout: float = 30.0,
+                 dns_cache_ttl: int = 300, connect_timeout: float = 3.0, read_timeout: float = 10.0,
+                 http2: bool = True, codec: Optional[JsonCodec] = None, gzip_requests: bool = False):
+        """
+        Initialize transport.
+
+        httpx has no DNS cache of its own, so dns_cache_ttl is accepted for
+        interface parity and ignored. With HTTP/2 a single connection carries
+        many concurrent streams, so limit_per_host mostly bounds HTTP/1.1 fallback.
+
+        Args:
+            limit: Total number of pooled connections
+            limit_per_host: Keep-alive connections retained in the pool
+            keepalive_timeout: Seconds an idle connection is kept for reuse
+            dns_cache_ttl: Ignored
+            connect_timeout: Seconds to establish a connection
+            read_timeout: Seconds allowed between reads of a response
+            http2: Negotiate HTTP/2 (requires the h2 package)
+            codec: JSON codec for request and response bodies (defaults to the fastest installed)
+            gzip_requests: Gzip JSON request bodies (the server must accept Content-Encoding)
+        """
+        import httpx
+
+        self.codec = codec or get_codec()
+        self.gzip_requests = gzip_requests
+        self._httpx = httpx
+        self._http2 = http2
+        self._client = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=limit,
+                max_keepalive_connections=limit_per_host,
+                keepalive_expiry=keepalive_timeout,
+            ),
+            timeout=httpx.Timeout(
+                connect=connect_timeout, read=read_timeout, write=read_timeout, pool=connect_timeout
+            ),
+        )
+        self._limit = limit
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.http_versions: Dict[str, int] = {}
+
+    def _track_start(self) -> None:
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def _track_end(self, http_version: Optional[str]) -> None:
+        self.in_flight -= 1
+        if http_version:
+            self.http_versions[http_version] = self.http_versions.get(http_version, 0) + 1
+
+    async def request(self, method, url, *, json=None, params=None, headers=None):
+        content, headers = self._encode(json, headers)
+        self._track_start()
+        http_version = None
+        try:
+            response = await self._client.request(
+                method, url, content=content, params=params, headers=headers
+            )
+            http_version = response.http_version
+            return TransportResponse(response.status_code, response.headers, response.content, self.codec)
+        except self._httpx.HTTPError as e:
+            raise TransportError(str(e) or type(e).__name__) from e
+        finally:
+            self._track_end(http_version)
+
+    @asynccontextmanager
+    async def stream(self, method, url, *, params=None, headers=None):
+        self._track_start()
+        http_version = None
+        try:
+            async with self._client.stream(
+                method, url, params=params, headers=self._headers(headers)
+            ) as response:
+                http_version = response.http_version
+                yield StreamResponse(
+                    response.status_code, response.headers, response.aiter_bytes(), self.codec
+                )
+        except self._httpx.HTTPError as e:
+            raise TransportError(str(e) or type(e).__name__) from e
+        finally:
+            self._track_end(http_version)
+
+    def stats(self):
+        return {
+            "transport": self.name,
+            "codec": self.codec.name,
+            "http2": self._http2,
+            "limit": self._limit,
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "http_versions": dict(self.http_versions),
+        }
+
+    async def close(self):
+        await self._client.aclose()
+
+
+TRANSPORTS = {
+    AiohttpTransport.name: AiohttpTransport,
+    HttpxTransport.name: HttpxTransport,
+}
+
+
+def create_transport(name: str = "aiohttp", **options: Any) -> Transport:
+    """
+    Create a transport by name.
+
+    Args:
+        name: 'aiohttp' (HTTP/1.1) or 'httpx' (HTTP/2)
+        **options: Pool and timeout options passed to the transport
+
+    Returns:
+        Transport instance
+    """
+    try:
+        transport_cls = TRANSPORTS[name]
+    except KeyError:
+        raise ValueError(f"Unknown Symfony API transport '{name}', expected one of {sorted(TRANSPORTS)}")
+    return transport_cls(**options)
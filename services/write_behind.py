@@ -0,0 +1,179 @@
+"""Write-behind batching of per-key writes."""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set
+
+from loguru import logger
+
+
+class _Pending:
+    """Latest payload queued for a key and everyone waiting on it."""
+
+    __slots__ = ("payload", "futures", "queued_at")
+
+    def __init__(self, payload: Dict[str, Any], queued_at: float):
+        self.payload = payload
+        self.futures: List[asyncio.Future] = []
+        self.queued_at = queued_at
+
+
+class UpsertBatcher:
+    """
+    Coalesce writes per key within a short window and flush them in batches.
+
+    A later write for a key that is still queued replaces the earlier
+    payload, and both callers get the result of the single write. A batch
+    is flushed when the window closes after its first write, or right away
+    once max_batch keys are queued.
+    """
+
+    def __init__(self, flush: Callable[[List[Dict[str, Any]]], Awaitable[List[Dict[str, Any]]]],
+                 window: float = 0.25, max_batch: int = 100):
+        """
+        Initialize batcher.
+
+        Args:
+            flush: Coroutine writing a list of payloads and returning one result dict per payload
+            window: Seconds to wait for more writes after the first queued one
+            max_batch: Queued keys that trigger an immediate flush
+        """
+        self._flush = flush
+        self.window = window
+        self.max_batch = max(1, max_batch)
+        self._pending: Dict[Hashable, _Pending] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.submitted = 0
+        self.coalesced = 0
+        self.noops = 0
+        self.batches = 0
+        self.flushed = 0
+        self.failed = 0
+        self.max_batch_size = 0
+        self.flush_time_total = 0.0
+        self.flush_time_max = 0.0
+        self.queue_delay_max = 0.0
+
+    def is_pending(self, key: Hashable) -> bool:
+        """Check whether a write for key is queued."""
+        return key in self._pending
+
+    def skip(self, result: Dict[str, Any]) -> asyncio.Future:
+        """
+        Account for a write dropped as a no-op.
+
+        Args:
+            result: Result handed to the caller
+
+        Returns:
+            Already resolved future
+        """
+        self.noops += 1
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(result)
+        return future
+
+    def submit(self, key: Hashable, payload: Dict[str, Any]) -> asyncio.Future:
+        """
+        Queue a write; awaiting the returned future is optional.
+
+        Args:
+            key: Coalescing key (e.g. telegram_id)
+            payload: Write payload; replaces a payload still queued for the key
+
+        Returns:
+            Future resolved with the write's result dict
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.submitted += 1
+
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = _Pending(payload, time.monotonic())
+        else:
+            pending.payload = payload
+            self.coalesced += 1
+        pending.futures.append(future)
+
+        if len(self._pending) >= self.max_batch:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._start_flush)
+        return future
+
+    def _start_flush(self) -> None:
+        """Hand the queued writes to a background flush task."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, {}
+        task = asyncio.ensure_future(self._flush_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush_batch(self, batch: Dict[Hashable, _Pending]) -> None:
+        """Write one batch and resolve its futures."""
+        started = time.monotonic()
+        entries = list(batch.values())
+        try:
+            results = await self._flush([entry.payload for entry in entries])
+        except Exception as e:
+            logger.error(f"Write-behind flush of {len(entries)} writes failed: {e}")
+            results = [{"status": "error", "message": f"Unexpected error: {str(e)}"}] * len(entries)
+        results = list(results or [])
+        if len(results) < len(entries):
+            # Never leave a caller waiting on a write the server did not answer for
+            logger.error(f"Write-behind flush returned {len(results)} results for {len(entries)} writes")
+            missing = {"status": "error", "message": "No result returned for this write"}
+            results.extend([missing] * (len(entries) - len(results)))
+        finished = time.monotonic()
+
+        flush_time = finished - started
+        self.batches += 1
+        self.flushed += len(entries)
+        self.max_batch_size = max(self.max_batch_size, len(entries))
+        self.flush_time_total += flush_time
+        self.flush_time_max = max(self.flush_time_max, flush_time)
+        self.queue_delay_max = max(self.queue_delay_max, started - min(e.queued_at for e in entries))
+
+        failed = 0
+        for entry, result in zip(entries, results):
+            if result.get("status") != "success":
+                failed += 1
+            for future in entry.futures:
+                if not future.done():
+                    future.set_result(result)
+        if failed:
+            self.failed += failed
+            logger.warning(f"Write-behind flush: {failed}/{len(entries)} writes failed")
+
+    async def flush(self) -> None:
+        """Flush queued writes now and wait for all running flushes."""
+        self._start_flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def close(self) -> None:
+        """Flush everything still queued."""
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get batching, flush-latency and batch-size metrics."""
+        return {
+            "queued": len(self._pending),
+            "submitted": self.submitted,
+            "coalesced": self.coalesced,
+            "noops": self.noops,
+            "batches": self.batches,
+            "flushed": self.flushed,
+            "failed": self.failed,
+            "avg_batch_size": round(self.flushed / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "avg_flush_ms": round(self.flush_time_total / self.batches * 1000, 2) if self.batches else 0.0,
+            "max_flush_ms": round(self.flush_time_max * 1000, 2),
+            "max_queue_delay_ms": round(self.queue_delay_max * 1000, 2),
+        }
@@ -0,0 +1,8 @@
+"""Shared test setup."""
+import base64
+import os
+
+# bot.config builds its settings at import time; give required fields placeholder
+# values so modules using it can be imported without a .env file
+os.environ.setdefault("BOT_TOKEN", "123456:test")
+os.environ.setdefault("OPENAI_API_KEY_BASE64", base64.b64encode(b"sk-test").decode("ascii"))
@@ -0,0 +1,87 @@
+"""Tests for per-tick batching of bot lookups."""
+import asyncio
+
+import pytest
+
+from services.batch_loader import BatchLoader
+
+
+class Recorder:
+    def __init__(self, error=None):
+        self.batches = []
+        self.error = error
+
+    async def __call__(self, keys):
+        self.batches.append(keys)
+        if self.error is not None:
+            raise self.error
+        return {key: f"bots of {key}" for key in keys if key != "unknown"}
+
+
+def test_loads_of_one_tick_share_a_batch():
+    batch_fn = Recorder()
+
+    async def main():
+        loader = BatchLoader(batch_fn)
+        results = await asyncio.gather(loader.load(1), loader.load(2), loader.load(1))
+        return loader, results
+
+    loader, results = asyncio.run(main())
+    assert results == ["bots of 1", "bots of 2", "bots of 1"]
+    assert batch_fn.batches == [[1, 2]]
+    assert loader.stats()["deduplicated"] == 1
+
+
+def test_later_ticks_get_new_batches():
+    batch_fn = Recorder()
+
+    async def main():
+        loader = BatchLoader(batch_fn)
+        await loader.load(1)
+        await loader.load(1)
+
+    asyncio.run(main())
+    assert batch_fn.batches == [[1], [1]]
+
+
+def test_splits_batches_above_max_batch():
+    batch_fn = Recorder()
+
+    async def main():
+        loader = BatchLoader(batch_fn, max_batch=2)
+        return await loader.load_many(range(5))
+
+    assert asyncio.run(main()) == [f"bots of {key}" for key in range(5)]
+    assert batch_fn.batches == [[0, 1], [2, 3], [4]]
+
+
+def test_missing_keys_resolve_to_none():
+    async def main():
+        return await BatchLoader(Recorder()).load_many(["unknown", 1])
+
+    assert asyncio.run(main()) == [None, "bots of 1"]
+
+
+def test_batch_error_reaches_every_caller():
+    async def main():
+        loader = BatchLoader(Recorder(error=RuntimeError("down")))
+        return await asyncio.gather(loader.load(1), loader.load(2), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_cancelled_caller_does_not_cancel_the_batch():
+    batch_fn = Recorder()
+
+    async def main():
+        loader = BatchLoader(batch_fn)
+        cancelled = asyncio.ensure_future(loader.load(1))
+        kept = asyncio.ensure_future(loader.load(1))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        return await kept
+
+    assert asyncio.run(main()) == "bots of 1"
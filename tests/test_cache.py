@@ -0,0 +1,140 @@
+"""Tests for the in-process caches."""
+import pytest
+
+from services import cache
+from services.cache import ConditionalCache, TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache.time, "monotonic", clock)
+    return clock
+
+
+def test_hit_and_miss(clock):
+    ttl_cache = TTLCache(maxsize=4, ttl=10)
+    ttl_cache.set("a", 1)
+    assert ttl_cache.get("a") == 1
+    assert ttl_cache.get("b") is None
+    assert ttl_cache.stats()["hits"] == 1
+    assert ttl_cache.stats()["misses"] == 1
+
+
+def test_entry_expires_after_ttl(clock):
+    ttl_cache = TTLCache(maxsize=4, ttl=10)
+    ttl_cache.set("a", 1)
+    clock.now += 9.9
+    assert ttl_cache.get("a") == 1
+    clock.now += 0.1
+    assert ttl_cache.get("a") is None
+    assert len(ttl_cache) == 0
+    assert ttl_cache.expirations == 1
+
+
+def test_evicts_least_recently_used(clock):
+    ttl_cache = TTLCache(maxsize=2, ttl=10)
+    ttl_cache.set("a", 1)
+    ttl_cache.set("b", 2)
+    ttl_cache.get("a")
+    ttl_cache.set("c", 3)
+    assert ttl_cache.get("b") is None
+    assert ttl_cache.get("a") == 1
+    assert ttl_cache.get("c") == 3
+    assert ttl_cache.evictions == 1
+
+
+def test_rejects_non_positive_maxsize():
+    with pytest.raises(ValueError):
+        TTLCache(maxsize=0)
+
+
+def test_set_if_current_skips_after_invalidation(clock):
+    ttl_cache = TTLCache(maxsize=4, ttl=10)
+    generation = ttl_cache.generation
+    # A write lands while the read is in flight
+    ttl_cache.invalidate("a")
+    ttl_cache.set_if_current("a", "stale", generation)
+    assert ttl_cache.get("a") is None
+
+    generation = ttl_cache.generation
+    ttl_cache.set_if_current("a", "fresh", generation)
+    assert ttl_cache.get("a") == "fresh"
+
+
+def test_invalidate_where_drops_matching_keys(clock):
+    ttl_cache = TTLCache(maxsize=8, ttl=10)
+    ttl_cache.set(("user", 1), "u1")
+    ttl_cache.set(("bots", 1), "b1")
+    ttl_cache.set(("user", 2), "u2")
+    generation = ttl_cache.generation
+    assert ttl_cache.invalidate_where(lambda key: key[1] == 1) == 2
+    assert ttl_cache.generation == generation + 1
+    assert ttl_cache.get(("user", 1)) is None
+    assert ttl_cache.get(("bots", 1)) is None
+    assert ttl_cache.get(("user", 2)) == "u2"
+
+
+def test_clear_bumps_generation(clock):
+    ttl_cache = TTLCache(maxsize=4, ttl=10)
+    ttl_cache.set("a", 1)
+    generation = ttl_cache.generation
+    ttl_cache.clear()
+    ttl_cache.set_if_current("a", 2, generation)
+    assert len(ttl_cache) == 0
+
+
+def test_conditional_cache_stores_only_validated_responses():
+    responses = ConditionalCache(max_bytes=1024, max_body=100)
+    assert not responses.store("/user/1", {"content-type": "application/json"}, b"{}")
+    assert not responses.store("/user/2", {"ETag": '"v1"'}, b"x" * 101)
+    assert responses.store("/user/3", {"ETag": '"v1"', "content-type": "application/json"}, b"{}")
+    entry = responses.get("/user/3")
+    assert entry.headers == {"content-type": "application/json"}
+    assert entry.validators() == {"If-None-Match": '"v1"'}
+
+
+def test_conditional_cache_validators_include_last_modified():
+    responses = ConditionalCache()
+    responses.store("/bots", {"ETag": '"v2"', "Last-Modified": "Tue, 01 Sep 2026 10:00:00 GMT"}, b"[]")
+    assert responses.get("/bots").validators() == {
+        "If-None-Match": '"v2"',
+        "If-Modified-Since": "Tue, 01 Sep 2026 10:00:00 GMT",
+    }
+
+
+def test_conditional_cache_evicts_by_bytes():
+    responses = ConditionalCache(max_bytes=10, max_body=10)
+    responses.store("a", {"ETag": "a"}, b"12345")
+    responses.store("b", {"ETag": "b"}, b"12345")
+    responses.get("a")
+    responses.store("c", {"ETag": "c"}, b"123")
+    assert responses.get("b") is None
+    assert responses.get("a") is not None
+    assert responses.stats()["bytes"] == 8
+    assert responses.evictions == 1
+
+
+def test_conditional_cache_store_replaces_entry():
+    responses = ConditionalCache()
+    responses.store("a", {"ETag": "v1"}, b"12345")
+    # A new response without validators drops the old one
+    assert not responses.store("a", {}, b"123")
+    assert responses.get("a") is None
+    assert responses.stats()["bytes"] == 0
+
+
+def test_conditional_cache_counts_not_modified():
+    responses = ConditionalCache()
+    responses.store("a", {"ETag": "v1"}, b"12345")
+    responses.record_not_modified(responses.get("a"))
+    assert responses.stats()["not_modified"] == 1
+    assert responses.stats()["bytes_saved"] == 5
@@ -0,0 +1,78 @@
+"""Tests for the on-disk chronicle cache."""
+import pytest
+
+from services import chronicle_cache
+from services.chronicle_cache import ChronicleCache, chronicle_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(chronicle_cache.time, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = ChronicleCache(str(tmp_path / "chronicles.sqlite3"), max_bytes=10, max_age=100)
+    yield cache
+    cache.close()
+
+
+def test_key_ignores_whitespace_but_not_case():
+    key = chronicle_key("gpt", "v1", name="Echo  Bot ", purpose="weather")
+    assert key == chronicle_key("gpt", "v1", name="Echo Bot", purpose=" weather")
+    assert key != chronicle_key("gpt", "v1", name="echo bot", purpose="weather")
+    assert key != chronicle_key("gpt", "v2", name="Echo Bot", purpose="weather")
+    assert key != chronicle_key("other", "v1", name="Echo Bot", purpose="weather")
+
+
+def test_round_trip_and_counters(cache):
+    assert cache.get("a") is None
+    cache.put("a", "text", model="gpt", prompt_version="v1")
+    assert cache.get("a") == "text"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["stores"]) == (1, 1, 1)
+    assert stats["versions"] == {"v1": 1}
+
+
+def test_expired_entries_are_misses(cache, clock):
+    cache.put("a", "text", model="gpt", prompt_version="v1")
+    clock.now += 101
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_evicts_least_recently_read(cache, clock):
+    cache.put("a", "aaaa", model="gpt", prompt_version="v1")
+    clock.now += 1
+    cache.put("b", "bbbb", model="gpt", prompt_version="v1")
+    clock.now += 1
+    cache.get("a")
+    clock.now += 1
+    cache.put("c", "cccc", model="gpt", prompt_version="v1")
+    assert cache.get("b") is None
+    assert cache.get("a") == "aaaa"
+    assert cache.get("c") == "cccc"
+
+
+def test_oversized_text_is_not_stored(cache):
+    cache.put("a", "x" * 11, model="gpt", prompt_version="v1")
+    assert cache.get("a") is None
+
+
+def test_purge_by_prompt_version(cache):
+    cache.put("a", "a", model="gpt", prompt_version="v1")
+    cache.put("b", "b", model="gpt", prompt_version="v2")
+    cache.put("c", "c", model="gpt", prompt_version="v3")
+    assert cache.purge(prompt_version="v1") == 1
+    assert cache.purge(keep_version="v3") == 1
+    assert cache.stats()["versions"] == {"v3": 1}
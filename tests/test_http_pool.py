@@ -0,0 +1,69 @@
+"""Tests for connection pool saturation statistics."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from services import http_pool
+from services.http_pool import PoolStats
+
+
+def run_hooks(*hooks) -> None:
+    async def main():
+        for hook, context in hooks:
+            await hook(None, context, None)
+    asyncio.run(main())
+
+
+def test_tracks_peak_in_flight_and_saturation():
+    stats = PoolStats(limit=100, limit_per_host=4)
+    first, second, third = SimpleNamespace(), SimpleNamespace(), SimpleNamespace()
+    run_hooks(
+        (stats._on_request_start, first),
+        (stats._on_request_start, second),
+        (stats._on_request_end, first),
+        (stats._on_request_start, third),
+        (stats._on_request_start, first),
+    )
+    snapshot = stats.snapshot()
+    assert snapshot["requests"] == 4
+    assert snapshot["in_flight"] == 3
+    assert snapshot["peak_in_flight"] == 3
+    # Saturation is measured against the tighter of the two limits
+    assert snapshot["peak_saturation"] == 0.75
+
+
+def test_unlimited_pool_reports_no_saturation():
+    stats = PoolStats(limit=0, limit_per_host=0)
+    run_hooks((stats._on_request_start, SimpleNamespace()))
+    assert stats.snapshot()["peak_saturation"] == 0.0
+
+
+def test_queue_wait(monkeypatch):
+    now = [10.0]
+    monkeypatch.setattr(http_pool.time, "monotonic", lambda: now[0])
+    stats = PoolStats(limit=10, limit_per_host=10)
+    context = SimpleNamespace()
+
+    async def main():
+        await stats._on_queued_start(None, context, None)
+        now[0] += 0.25
+        await stats._on_queued_end(None, context, None)
+
+    asyncio.run(main())
+    snapshot = stats.snapshot()
+    assert snapshot["queued"] == 1
+    assert snapshot["queue_wait_avg_ms"] == pytest.approx(250.0)
+    assert snapshot["queue_wait_max_ms"] == pytest.approx(250.0)
+
+
+def test_counts_created_and_reused_connections():
+    stats = PoolStats(limit=10, limit_per_host=10)
+    run_hooks(
+        (stats._on_connection_created, SimpleNamespace()),
+        (stats._on_connection_reused, SimpleNamespace()),
+        (stats._on_connection_reused, SimpleNamespace()),
+    )
+    snapshot = stats.snapshot()
+    assert snapshot["connections_created"] == 1
+    assert snapshot["connections_reused"] == 2
@@ -0,0 +1,47 @@
+"""Tests for incremental JSON array parsing."""
+import asyncio
+from typing import List
+
+import pytest
+
+from services.json_stream import iter_json_array
+
+
+async def _chunks(body: bytes, size: int):
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+def parse(body: bytes, size: int = 4096) -> List:
+    async def collect():
+        return [value async for value in iter_json_array(_chunks(body, size))]
+    return asyncio.run(collect())
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 4096])
+def test_parses_across_chunk_boundaries(size):
+    body = '[{"id": 1, "name": "Ünïcode"}, 1.5, -20, "x,]", true, null, [1, 2]]'.encode("utf-8")
+    assert parse(body, size) == [{"id": 1, "name": "Ünïcode"}, 1.5, -20, "x,]", True, None, [1, 2]]
+
+
+@pytest.mark.parametrize("body", [b"[]", b"  [ ]  ", b"[\n]"])
+def test_empty_array(body):
+    assert parse(body) == []
+
+
+@pytest.mark.parametrize("body", [
+    b"[1,]",
+    b"[1, 2 , ]",
+    b"[,1]",
+    b"[1 2]",
+    b"[1,,2]",
+    b'{"id": 1}',
+    b"",
+    b"[1, 2",
+    b'[{"id": 1',
+    b"[1, tru]",
+])
+@pytest.mark.parametrize("size", [1, 4096])
+def test_rejects_malformed_body(body, size):
+    with pytest.raises(ValueError):
+        parse(body, size)
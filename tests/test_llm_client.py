@@ -0,0 +1,35 @@
+"""Tests for the shared OpenAI client."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from services.llm_client import create_llm_client, warm_up_llm_client
+
+
+def client_with_models(list_models) -> SimpleNamespace:
+    return SimpleNamespace(models=SimpleNamespace(list=list_models))
+
+
+def test_requires_an_api_key(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    with pytest.raises(ValueError):
+        create_llm_client()
+
+
+def test_warm_up_reports_success():
+    calls = []
+
+    async def list_models():
+        calls.append(True)
+        return []
+
+    assert asyncio.run(warm_up_llm_client(client_with_models(list_models)))
+    assert calls == [True]
+
+
+def test_warm_up_failure_is_not_fatal():
+    async def list_models():
+        raise ConnectionError("unreachable")
+
+    assert not asyncio.run(warm_up_llm_client(client_with_models(list_models)))
@@ -0,0 +1,100 @@
+"""Tests for the OpenAI rate governor."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from services.llm_governor import (
+    BATCH, DEFAULT, INTERACTIVE, LLMGovernor, _metered, _retry_delay, estimate_tokens,
+)
+
+
+def test_estimate_counts_prompt_and_completion_budget():
+    messages = [{"role": "system", "content": "x" * 40}, {"role": "user", "content": None}]
+    assert estimate_tokens(messages) == (4 + 10) + 4
+    assert estimate_tokens(messages, max_tokens=100) == 118
+
+
+def test_grants_in_priority_order_then_fifo():
+    order = []
+
+    async def request(governor, priority, name):
+        async with governor.reserve(10, priority):
+            order.append(name)
+
+    async def main():
+        # 100 requests per second, with the bucket drained so every grant waits
+        governor = LLMGovernor(rpm=6000, tpm=1_000_000)
+        governor.requests.level = 0
+        await asyncio.gather(
+            request(governor, BATCH, "batch"),
+            request(governor, DEFAULT, "default-1"),
+            request(governor, INTERACTIVE, "interactive"),
+            request(governor, DEFAULT, "default-2"),
+        )
+        return governor
+
+    governor = asyncio.run(main())
+    assert order == ["interactive", "default-1", "default-2", "batch"]
+    assert governor.stats()["granted_by_priority"] == {"interactive": 1, "default": 2, "batch": 1}
+
+
+def test_reported_usage_corrects_the_token_bucket():
+    async def main():
+        governor = LLMGovernor(rpm=60, tpm=1000)
+        async with governor.reserve(100) as reservation:
+            reservation.actual_tokens = 300
+        return governor
+
+    assert asyncio.run(main()).tokens.level == pytest.approx(700, abs=1)
+
+
+def test_cancelled_waiter_is_skipped():
+    async def main():
+        governor = LLMGovernor(rpm=6000, tpm=1_000_000)
+        governor.requests.level = 0
+        cancelled = asyncio.ensure_future(governor.acquire(10, INTERACTIVE))
+        kept = asyncio.ensure_future(governor.acquire(10, BATCH))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.wait_for(kept, timeout=1)
+        return governor
+
+    assert asyncio.run(main()).granted == 1
+
+
+def status_error(headers):
+    return SimpleNamespace(response=SimpleNamespace(headers=headers))
+
+
+def test_retry_delay_honours_retry_after():
+    assert _retry_delay(status_error({"retry-after-ms": "1500"}), 0) == 1.5
+    assert _retry_delay(status_error({"retry-after": "3"}), 0) == 3.0
+
+
+def test_retry_delay_falls_back_to_backoff():
+    # Unparseable or excessive Retry-After values use jittered exponential backoff
+    for headers in ({}, {"retry-after": "soon"}, {"retry-after": "3600"}):
+        assert 0.75 <= _retry_delay(status_error(headers), 1) <= 1.0
+    assert 0.375 <= _retry_delay(ValueError(), 0) <= 0.5
+
+
+def test_metered_stream_corrects_with_final_usage():
+    chunks = [
+        SimpleNamespace(usage=None, text="a"),
+        SimpleNamespace(usage=None, text="b"),
+        SimpleNamespace(usage=SimpleNamespace(total_tokens=250), text=""),
+    ]
+
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+
+    async def main():
+        governor = LLMGovernor(rpm=60, tpm=1000)
+        received = [chunk async for chunk in _metered(stream(), governor, 100)]
+        return governor, received
+
+    governor, received = asyncio.run(main())
+    assert received == chunks
+    assert governor.tokens.level == pytest.approx(850, abs=1)
@@ -0,0 +1,102 @@
+"""Tests for report fingerprinting and the report archive."""
+import pytest
+
+from services import report_archive
+from services.report_archive import REFRESH, REGENERATE, REUSE, ReportArchive, ecosystem_fingerprint
+
+
+def ecosystem(**overrides) -> dict:
+    data = {
+        "total_users": 10,
+        "total_bots": 25,
+        "stats": {"purposes": {"weather": 3}, "user_growth": {"7d": 2}, "bot_growth": {"7d": 5}, "recency": 0.4},
+        "delta": {"new_bots": 2, "since": "2026-10-16T09:00+00:00"},
+    }
+    data.update(overrides)
+    return data
+
+
+def test_fingerprint_ignores_volatile_keys():
+    today = ecosystem()
+    tomorrow = ecosystem(
+        stats={"purposes": {"weather": 3}, "user_growth": {"7d": 0}, "bot_growth": {"7d": 1}, "recency": 0.9},
+        delta={"new_bots": 2, "since": "2026-10-17T09:00+00:00"},
+    )
+    assert ecosystem_fingerprint(today, "gpt", "v1") == ecosystem_fingerprint(tomorrow, "gpt", "v1")
+
+
+def test_fingerprint_changes_with_the_registry():
+    base = ecosystem_fingerprint(ecosystem(), "gpt", "v1")
+    assert ecosystem_fingerprint(ecosystem(total_bots=26), "gpt", "v1") != base
+    assert ecosystem_fingerprint(ecosystem(delta={"new_bots": 3, "since": "x"}), "gpt", "v1") != base
+    assert ecosystem_fingerprint(ecosystem(), "gpt", "v2") != base
+    assert ecosystem_fingerprint(ecosystem(), "other", "v1") != base
+
+
+def test_fingerprint_does_not_modify_the_data():
+    data = ecosystem()
+    ecosystem_fingerprint(data, "gpt", "v1")
+    assert data == ecosystem()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(report_archive.time, "time", clock)
+    return clock
+
+
+def open_archive(tmp_path, **options) -> ReportArchive:
+    return ReportArchive(str(tmp_path / "reports.sqlite3"), **options)
+
+
+def test_reuses_newest_report_for_fingerprint(tmp_path, clock):
+    archive = open_archive(tmp_path, policy=REUSE)
+    archive.add("f1", "old")
+    clock.now += 1
+    archive.add("f1", "new")
+    archive.add("f2", "other")
+    found = archive.reusable("f1")
+    assert found.report == "new"
+    assert archive.reusable("f3") is None
+    assert archive.stats()["reused_total"] == 1
+    archive.close()
+
+
+def test_does_not_reuse_after_max_age(tmp_path, clock):
+    archive = open_archive(tmp_path, policy=REFRESH, max_reuse_age=100)
+    archive.add("f1", "report")
+    clock.now += 101
+    assert archive.reusable("f1") is None
+    archive.close()
+
+
+def test_regenerate_policy_never_reuses(tmp_path, clock):
+    archive = open_archive(tmp_path, policy=REGENERATE)
+    archive.add("f1", "report")
+    assert archive.reusable("f1") is None
+    archive.close()
+
+
+def test_keeps_only_newest_reports(tmp_path, clock):
+    archive = open_archive(tmp_path, keep=2)
+    for index in range(3):
+        clock.now += 1
+        archive.add(f"f{index}", f"report {index}")
+    assert archive.stats()["stored"] == 2
+    assert archive.reusable("f0") is None
+    assert archive.reusable("f2").report == "report 2"
+    archive.close()
+
+
+def test_rejects_unknown_policy(tmp_path):
+    with pytest.raises(ValueError):
+        open_archive(tmp_path, policy="sometimes")
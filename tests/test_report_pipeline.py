@@ -0,0 +1,139 @@
+"""Tests for the staged daily report pipeline."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from scheduler import report_pipeline
+from scheduler.report_pipeline import ReportPipeline
+from services.models import UserRecord
+from services.report_snapshot import ReportSnapshot
+
+
+USERS = [
+    UserRecord.from_api({"telegram_id": telegram_id, "bots": [{"id": telegram_id, "bot_name": f"bot{telegram_id}"}]})
+    for telegram_id in (1, 2, 3)
+]
+
+
+class FakeOpenAIService:
+    generated = 0
+    fallback = False
+
+    def __init__(self):
+        self.report_fallback_used = False
+
+    async def generate_species_report_from_data(self, data):
+        type(self).generated += 1
+        self.report_fallback_used = type(self).fallback
+        await asyncio.sleep(0)
+        return f"{data['total_users']} users"
+
+
+class FakeBot:
+    def __init__(self, failing=()):
+        self.sent = []
+        self.failing = set(failing)
+
+    async def send_message(self, chat_id, text, parse_mode=None):
+        if chat_id in self.failing:
+            raise RuntimeError("blocked")
+        self.sent.append((chat_id, text))
+
+
+@pytest.fixture
+def pipeline_env(monkeypatch, tmp_path):
+    users = list(USERS)
+
+    async def iter_all_users():
+        for user in users:
+            yield user
+
+    FakeOpenAIService.generated = 0
+    FakeOpenAIService.fallback = False
+    monkeypatch.setattr(report_pipeline.ApiUserRepository, "iter_all_users", staticmethod(iter_all_users))
+    monkeypatch.setattr(report_pipeline, "OpenAIService", FakeOpenAIService)
+    monkeypatch.setattr(report_pipeline, "settings", SimpleNamespace(
+        report_examples=10,
+        report_examples_token_budget=300,
+        report_delta_enabled=True,
+        report_snapshot_path=str(tmp_path / "snapshot.npz"),
+    ))
+    return SimpleNamespace(users=users, snapshot_path=str(tmp_path / "snapshot.npz"))
+
+
+def test_delivers_the_pregenerated_report(pipeline_env):
+    pipeline = ReportPipeline()
+    bot = FakeBot()
+
+    async def main():
+        await pipeline.prefetch()
+        staged = await pipeline.pregenerate()
+        staged.prefetched_at -= 600
+        await pipeline.deliver(bot)
+        return staged
+
+    staged = asyncio.run(main())
+    assert FakeOpenAIService.generated == 1
+    assert [chat_id for chat_id, _ in bot.sent] == [1, 2, 3]
+    assert "3 users" in bot.sent[0][1]
+    assert pipeline.runs == {"prefetch": 1, "generate": 1, "deliver": 1}
+    assert pipeline.staged is None
+    # The next delta starts at the time the registry was read, not at delivery
+    assert ReportSnapshot.load(pipeline_env.snapshot_path).created_at == staged.prefetched_at
+
+
+def test_deliver_runs_missing_stages_inline(pipeline_env):
+    pipeline = ReportPipeline()
+    bot = FakeBot()
+    asyncio.run(pipeline.deliver(bot))
+    assert FakeOpenAIService.generated == 1
+    assert len(bot.sent) == 3
+    assert pipeline.runs["prefetch"] == 1
+
+
+def test_stale_prefetch_is_redone(pipeline_env):
+    pipeline = ReportPipeline(max_age=60)
+
+    async def main():
+        staged = await pipeline.pregenerate()
+        staged.prefetched_at -= 61
+        pipeline_env.users.append(UserRecord.from_api({"telegram_id": 4, "bots": []}))
+        await pipeline.deliver(bot)
+
+    bot = FakeBot()
+    asyncio.run(main())
+    assert pipeline.runs["prefetch"] == 2
+    assert FakeOpenAIService.generated == 2
+    assert bot.sent[-1] == (4, "🧬 **Daily Species Report**\n\n4 users")
+
+
+def test_concurrent_generation_runs_once(pipeline_env):
+    pipeline = ReportPipeline()
+
+    async def main():
+        return await asyncio.gather(pipeline.pregenerate(), pipeline.pregenerate())
+
+    first, second = asyncio.run(main())
+    assert first is second
+    assert FakeOpenAIService.generated == 1
+
+
+def test_fallback_report_keeps_the_previous_snapshot(pipeline_env):
+    FakeOpenAIService.fallback = True
+    asyncio.run(ReportPipeline().deliver(FakeBot()))
+    assert ReportSnapshot.load(pipeline_env.snapshot_path) is None
+
+
+def test_failed_sends_do_not_stop_delivery(pipeline_env):
+    bot = FakeBot(failing={2})
+    asyncio.run(ReportPipeline().deliver(bot))
+    assert [chat_id for chat_id, _ in bot.sent] == [1, 3]
+
+
+def test_no_users_skips_the_report(pipeline_env):
+    pipeline_env.users.clear()
+    bot = FakeBot()
+    asyncio.run(ReportPipeline().deliver(bot))
+    assert bot.sent == []
+    assert FakeOpenAIService.generated == 0
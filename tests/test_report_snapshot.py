@@ -0,0 +1,99 @@
+"""Tests for report snapshots and the delta between two reports."""
+import pytest
+
+from services import report_snapshot
+from services.models import UserRecord
+from services.report_snapshot import ReportSnapshot, SnapshotDiff
+
+
+def user(telegram_id, bots=(), **fields) -> UserRecord:
+    return UserRecord.from_api({"telegram_id": telegram_id, "bots": list(bots), **fields})
+
+
+def bot(bot_id, purpose="", **fields) -> dict:
+    return {"id": bot_id, "bot_name": f"bot{bot_id}", "bot_purpose": purpose, **fields}
+
+
+def snapshot_of(users, path) -> ReportSnapshot:
+    diff = SnapshotDiff()
+    for record in users:
+        diff.add(record)
+    diff.save(str(path))
+    return ReportSnapshot.load(str(path))
+
+
+def delta(previous, users, examples_limit=10):
+    diff = SnapshotDiff(previous)
+    for record in users:
+        diff.add(record)
+    return diff.result(examples_limit)
+
+
+def test_first_run_has_no_delta():
+    diff = SnapshotDiff()
+    diff.add(user(1, [bot(1)]))
+    assert diff.result() is None
+
+
+def test_missing_snapshot_loads_as_none(tmp_path):
+    assert ReportSnapshot.load(str(tmp_path / "missing.npz")) is None
+
+
+def test_counts_new_updated_and_deleted(tmp_path):
+    previous = snapshot_of([
+        user(1, [bot(10, "weather"), bot(11, "news")]),
+        user(2, [bot(20, "games")], bio="old"),
+        user(3),
+    ], tmp_path / "snapshot.npz")
+
+    result = delta(previous, [
+        user(1, [bot(10, "weather"), bot(12, "translate texts")]),
+        user(2, [bot(20, "board games")], bio="new"),
+        user(4, [bot(40, "recipes")], interests="cooking"),
+    ])
+
+    assert result["new_users"] == 1
+    assert result["updated_users"] == 1
+    assert result["deleted_users"] == 1
+    assert result["new_bots"] == 2
+    assert result["updated_bots"] == 1
+    assert result["deleted_bots"] == 1
+    assert sorted(result["new_bot_purposes"]) == ["recipes", "translate texts"]
+    assert result["new_user_interests"] == ["cooking"]
+
+
+def test_unchanged_registry_has_empty_delta(tmp_path):
+    users = [user(i, [bot(i * 10, "purpose")]) for i in range(1, 6)]
+    result = delta(snapshot_of(users, tmp_path / "snapshot.npz"), users)
+    for key in ("new_users", "updated_users", "deleted_users", "new_bots", "updated_bots", "deleted_bots"):
+        assert result[key] == 0
+
+
+def test_counts_span_lookup_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_snapshot, "LOOKUP_CHUNK", 3)
+    previous = snapshot_of([user(i, [bot(i)]) for i in range(10)], tmp_path / "snapshot.npz")
+
+    result = delta(previous, [user(i, [bot(i, "changed" if i % 2 else "")]) for i in range(5, 15)])
+
+    assert result["new_users"] == 5
+    assert result["deleted_users"] == 5
+    assert result["new_bots"] == 5
+    assert result["updated_bots"] == 3
+    assert result["deleted_bots"] == 5
+
+
+@pytest.mark.parametrize("stored, current", [("7", 7), ("bot-uuid", "bot-uuid"), (2 ** 70, 2 ** 70)])
+def test_accepts_non_int_bot_ids(tmp_path, stored, current):
+    previous = snapshot_of([user(1, [bot(stored, "purpose")])], tmp_path / "snapshot.npz")
+    result = delta(previous, [user(1, [bot(current, "purpose"), bot("other-uuid", "new")])])
+    assert result["new_bots"] == 1
+    assert result["updated_bots"] == 0
+    assert result["deleted_bots"] == 0
+
+
+def test_since_is_the_save_timestamp(tmp_path):
+    diff = SnapshotDiff()
+    diff.add(user(1))
+    diff.save(str(tmp_path / "snapshot.npz"), created_at=0.0)
+    result = delta(ReportSnapshot.load(str(tmp_path / "snapshot.npz")), [user(1)])
+    assert result["since"] == "1970-01-01T00:00+00:00"
@@ -0,0 +1,100 @@
+"""Tests for the circuit breaker state machine."""
+import pytest
+
+from services import resilience
+from services.resilience import CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(resilience.time, "monotonic", clock)
+    return clock
+
+
+def open_breaker(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.failure_threshold):
+        assert breaker.allow()
+        breaker.record_failure()
+
+
+def test_stays_closed_below_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+    assert not breaker.failing_fast
+
+
+def test_success_resets_failure_count(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_opens_at_threshold_and_rejects(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+    open_breaker(breaker)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.failing_fast
+    assert not breaker.allow()
+    assert breaker.rejected == 1
+    assert breaker.times_opened == 1
+    assert breaker.retry_after() == pytest.approx(10)
+
+
+def test_half_open_lets_one_trial_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    open_breaker(breaker)
+    clock.now += 10
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.failing_fast
+    assert breaker.allow()
+    assert breaker.failing_fast
+    assert not breaker.allow()
+
+
+def test_successful_trial_closes(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    open_breaker(breaker)
+    clock.now += 10
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 0
+    assert breaker.allow()
+
+
+def test_failed_trial_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10)
+    open_breaker(breaker)
+    clock.now += 10
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.times_opened == 2
+    assert not breaker.trial_in_flight
+    clock.now += 9
+    assert not breaker.allow()
+
+
+def test_release_frees_trial_without_outcome(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    open_breaker(breaker)
+    clock.now += 10
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.failing_fast
+    assert breaker.allow()
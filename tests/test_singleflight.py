@@ -0,0 +1,100 @@
+"""Tests for coalescing concurrent identical calls."""
+import asyncio
+
+import pytest
+
+from services.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"id": 1}
+
+    async def main():
+        group = SingleFlight()
+        results = await asyncio.gather(*(group.do("GET /user/1", fetch) for _ in range(5)))
+        return group, results
+
+    group, results = asyncio.run(main())
+    assert calls == 1
+    assert results == [{"id": 1}] * 5
+    assert group.stats() == {"leaders": 1, "deduplicated": 4, "in_flight": 0}
+
+
+def test_sequential_calls_are_not_coalesced():
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    async def main():
+        group = SingleFlight()
+        return [await group.do("key", fetch), await group.do("key", fetch)]
+
+    assert asyncio.run(main()) == [1, 2]
+
+
+def test_exception_reaches_every_caller():
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def main():
+        group = SingleFlight()
+        results = await asyncio.gather(*(group.do("key", fetch) for _ in range(3)), return_exceptions=True)
+        return group, results
+
+    group, results = asyncio.run(main())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert group.stats()["in_flight"] == 0
+
+
+def test_cancelling_one_caller_keeps_the_call_for_others():
+    started = 0
+
+    async def fetch():
+        nonlocal started
+        started += 1
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def main():
+        group = SingleFlight()
+        first = asyncio.ensure_future(group.do("key", fetch))
+        second = asyncio.ensure_future(group.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == "done"
+    assert started == 1
+
+
+def test_forget_starts_a_fresh_call():
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        call = calls
+        await asyncio.sleep(0.01)
+        return call
+
+    async def main():
+        group = SingleFlight()
+        stale = asyncio.ensure_future(group.do("key", fetch))
+        await asyncio.sleep(0)
+        group.forget("key")
+        fresh = await group.do("key", fetch)
+        return await stale, fresh
+
+    assert asyncio.run(main()) == (1, 2)
@@ -0,0 +1,93 @@
+"""Tests for write-behind batching of user upserts."""
+import asyncio
+from typing import Any, Dict, List
+
+from services.write_behind import UpsertBatcher
+
+
+class Recorder:
+    def __init__(self, results=None, error=None):
+        self.batches: List[List[Dict[str, Any]]] = []
+        self.results = results
+        self.error = error
+
+    async def __call__(self, payloads):
+        self.batches.append(payloads)
+        if self.error is not None:
+            raise self.error
+        if self.results is not None:
+            return self.results
+        return [{"status": "success", "user": payload} for payload in payloads]
+
+
+def test_coalesces_writes_per_key_within_window():
+    flush = Recorder()
+
+    async def main():
+        batcher = UpsertBatcher(flush, window=0.01)
+        first = batcher.submit(1, {"telegram_id": 1, "username": "old"})
+        second = batcher.submit(1, {"telegram_id": 1, "username": "new"})
+        other = batcher.submit(2, {"telegram_id": 2})
+        return batcher, await asyncio.gather(first, second, other)
+
+    batcher, (first, second, other) = asyncio.run(main())
+    assert len(flush.batches) == 1
+    assert flush.batches[0] == [{"telegram_id": 1, "username": "new"}, {"telegram_id": 2}]
+    # Both writers of key 1 get the result of the single write
+    assert first == second == {"status": "success", "user": {"telegram_id": 1, "username": "new"}}
+    assert other["status"] == "success"
+    assert batcher.stats()["coalesced"] == 1
+
+
+def test_flushes_immediately_at_max_batch():
+    flush = Recorder()
+
+    async def main():
+        batcher = UpsertBatcher(flush, window=60, max_batch=2)
+        futures = [batcher.submit(key, {"telegram_id": key}) for key in range(3)]
+        await asyncio.gather(*futures[:2])
+        assert batcher.is_pending(2)
+        await batcher.close()
+        return await futures[2]
+
+    assert asyncio.run(main())["status"] == "success"
+    assert [len(batch) for batch in flush.batches] == [2, 1]
+
+
+def test_flush_error_resolves_every_future():
+    flush = Recorder(error=RuntimeError("down"))
+
+    async def main():
+        batcher = UpsertBatcher(flush, window=0.01)
+        results = await asyncio.gather(*(batcher.submit(key, {"telegram_id": key}) for key in range(2)))
+        return batcher, results
+
+    batcher, results = asyncio.run(main())
+    assert all(result["status"] == "error" for result in results)
+    assert batcher.stats()["failed"] == 2
+
+
+def test_short_result_list_resolves_the_rest_with_errors():
+    flush = Recorder(results=[{"status": "success"}])
+
+    async def main():
+        batcher = UpsertBatcher(flush, window=0.01)
+        futures = [batcher.submit(key, {"telegram_id": key}) for key in range(3)]
+        return await asyncio.wait_for(asyncio.gather(*futures), timeout=1)
+
+    results = asyncio.run(main())
+    assert [result["status"] for result in results] == ["success", "error", "error"]
+
+
+def test_skip_resolves_without_writing():
+    flush = Recorder()
+
+    async def main():
+        batcher = UpsertBatcher(flush)
+        result = await batcher.skip({"status": "success"})
+        return batcher, result
+
+    batcher, result = asyncio.run(main())
+    assert result == {"status": "success"}
+    assert flush.batches == []
+    assert batcher.stats()["noops"] == 1
@@ -0,0 +1,131 @@
+"""Benchmark representative example sampling for the Species Report.
+
+Generates --bots synthetic bot purposes (a few popular themes written in
+many variations, a long tail of rarer themes and unique one-offs) and
+compares the examples given to the report prompt by:
+- the old approach: the first N purposes seen
+- DiversitySampler: one representative per largest near-duplicate cluster
+
+Reports clustering and sampling time, clusters tracked, estimated prompt
+tokens and how many distinct themes each list covers.
+
+Usage:
+    python -m tools.bench_diversity_sampler --bots 100000
+"""
+import argparse
+import random
+import sys
+import time
+from typing import List, Tuple
+
+from loguru import logger
+
+from services.diversity import DiversitySampler, estimate_tokens, normalize_text
+
+
+# Configure loguru
+logger.remove()
+logger.add(
+    sys.stdout,
+    format="<level>{level: <8}</level> | <level>{message}</level>",
+    level="INFO"
+)
+
+THEMES = [
+    "summarizes long group chats into a daily digest",
+    "translates messages between english and russian",
+    "reminds the team about standup meetings",
+    "generates memes from photos people send",
+    "tracks crypto prices and sends alerts on big moves",
+    "helps students practice math problems step by step",
+    "answers questions about our product documentation",
+    "books appointments for a small barber shop",
+    "recommends books based on what you liked before",
+    "moderates spam and scam links in public groups",
+    "writes short bedtime stories for kids",
+    "logs workouts and shows weekly progress",
+]
+PREFIXES = ["", "A bot that", "Bot which", "This bot", "It", "My bot", "Simple bot that"]
+SUFFIXES = ["", "for my friends", "using AI", "every morning", "in Telegram", "for our community", "quickly"]
+VOCABULARY = (
+    "weather poetry chess garden recipes astronomy vinyl podcasts hiking knitting birds "
+    "trains coffee sourdough volcanoes origami mushrooms sailing tarot cryptids haiku "
+    "minerals jazz robots dinosaurs lighthouses beetles fonts maps clouds"
+).split()
+
+
+def build_purposes(bots: int, seed: int = 7) -> List[Tuple[str, int]]:
+    """
+    Build synthetic bot purposes.
+
+    Returns:
+        List of (purpose, theme index); unique one-offs have theme -1
+    """
+    rng = random.Random(seed)
+    # Zipf-like popularity: the first themes dominate
+    weights = [1 / (rank + 1) for rank in range(len(THEMES))]
+    purposes = []
+    for _ in range(bots):
+        if rng.random() < 0.2:
+            words = rng.sample(VOCABULARY, 4)
+            purposes.append((f"shares facts about {words[0]}, {words[1]} and {words[2]} with {words[3]} fans", -1))
+            continue
+        theme = rng.choices(range(len(THEMES)), weights)[0]
+        text = " ".join(part for part in (rng.choice(PREFIXES), THEMES[theme], rng.choice(SUFFIXES)) if part)
+        purposes.append((text, theme))
+    return purposes
+
+
+def themes_covered(examples: List[str]) -> int:
+    """Count distinct synthetic themes among examples."""
+    covered = set()
+    for example in examples:
+        normalized = normalize_text(example)
+        covered.update(index for index, theme in enumerate(THEMES) if theme in normalized)
+    return len(covered)
+
+
+def main(bots: int, examples: int, token_budget: int) -> None:
+    """Run the benchmark."""
+    logger.info(f"Building {bots} synthetic bot purposes...")
+    purposes = build_purposes(bots)
+
+    baseline = [text for text, _ in purposes[:examples]]
+    logger.info(
+        f"First {examples}: {themes_covered(baseline)}/{len(THEMES)} themes, "
+        f"~{sum(estimate_tokens(text) for text in baseline)} tokens"
+    )
+
+    sampler = DiversitySampler()
+    started = time.perf_counter()
+    for text, _ in purposes:
+        sampler.add(text)
+    clustered = time.perf_counter()
+    sample = sampler.sample(examples, token_budget)
+    sampled = time.perf_counter()
+
+    logger.success(
+        f"Sampler: {themes_covered(sample)}/{len(THEMES)} themes, "
+        f"~{sum(estimate_tokens(text) for text in sample)} tokens (budget {token_budget})"
+    )
+    logger.success(
+        f"Clustering: {(clustered - started) * 1000:.0f}ms "
+        f"({(clustered - started) / bots * 1e6:.1f}µs/text), {sampler.clusters} clusters; "
+        f"sampling: {(sampled - clustered) * 1000:.1f}ms"
+    )
+    for example in sample:
+        logger.info(f"  - {example}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark near-duplicate example sampling")
+    parser.add_argument("--bots", type=int, default=100_000, help="Number of synthetic bot purposes")
+    parser.add_argument("--examples", type=int, default=10, help="Examples given to the prompt")
+    parser.add_argument("--token-budget", type=int, default=300, help="Estimated tokens allowed for examples")
+    args = parser.parse_args()
+
+    try:
+        main(args.bots, args.examples, args.token_budget)
+    except KeyboardInterrupt:
+        logger.info("⚠️  Benchmark cancelled by user")
+        sys.exit(0)
@@ -0,0 +1,101 @@
+"""Benchmark the vectorized ecosystem statistics.
+
+Streams --users synthetic users (0-5 bots each, dates spread over the last
+year) into EcosystemColumns, then times compute_stats on the filled
+columns. The ingest time is spread over the registry stream in
+production; the statistics pass is what the report waits for.
+
+Usage:
+    python -m tools.bench_ecosystem_stats --users 1000000
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import date, timedelta
+from typing import Iterator
+
+from loguru import logger
+
+from services.ecosystem_stats import EcosystemColumns, compute_stats, format_stats
+from services.models import BotRecord, UserRecord
+
+
+# Configure loguru
+logger.remove()
+logger.add(
+    sys.stdout,
+    format="<level>{level: <8}</level> | <level>{message}</level>",
+    level="INFO"
+)
+
+PURPOSES = [
+    "Summarizes long group chats into a daily digest",
+    "Translates messages between English and Russian",
+    "Tracks crypto prices and sends alerts",
+    "Generates memes from photos",
+    "Reminds the team about standup meetings",
+    "Answers questions about product documentation",
+]
+
+
+def build_users(users: int, today: date, seed: int = 3) -> Iterator[UserRecord]:
+    """Yield synthetic users with bots."""
+    rng = random.Random(seed)
+    for i in range(users):
+        created = today - timedelta(days=int(rng.expovariate(1 / 90)) % 365)
+        updated = created + timedelta(days=rng.randint(0, (today - created).days))
+        bots = tuple(
+            BotRecord(
+                id=i * 8 + j,
+                owner_id=i,
+                bot_purpose=rng.choice(PURPOSES),
+                created_at=f"{created + timedelta(days=j)}T10:31:00+00:00",
+            )
+            for j in range(rng.choice((0, 0, 1, 1, 1, 2, 3, 5)))
+        )
+        yield UserRecord(
+            telegram_id=i,
+            interests="LLMs, automation",
+            created_at=f"{created}T10:30:00+00:00",
+            updated_at=f"{updated}T08:15:00+00:00",
+            bots=bots,
+        )
+
+
+def main(users: int, repeat: int) -> None:
+    """Run the benchmark."""
+    today = date.today()
+    logger.info(f"Streaming {users} synthetic users into columns...")
+    columns = EcosystemColumns()
+    ingest = 0.0
+    for user in build_users(users, today):
+        started = time.perf_counter()
+        columns.add(user)
+        ingest += time.perf_counter() - started
+    logger.info(
+        f"Ingest: {ingest * 1000:.0f}ms ({ingest / users * 1e6:.2f}µs/user), "
+        f"{len(columns.bot_created)} bots, {len(columns.vocabulary)} keywords"
+    )
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        stats = compute_stats(columns, today)
+        timings.append(time.perf_counter() - started)
+    logger.success(f"compute_stats: best {min(timings) * 1000:.1f}ms of {repeat} runs")
+    for line in format_stats(stats):
+        logger.info(f"  - {line}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark vectorized ecosystem statistics")
+    parser.add_argument("--users", type=int, default=1_000_000, help="Number of synthetic users")
+    parser.add_argument("--repeat", type=int, default=5, help="Statistics passes to time")
+    args = parser.parse_args()
+
+    try:
+        main(args.users, args.repeat)
+    except KeyboardInterrupt:
+        logger.info("⚠️  Benchmark cancelled by user")
+        sys.exit(0)
@@ -0,0 +1,143 @@
+"""Benchmark JSON codecs and repository transforms on a synthetic registry.
+
+Builds a /users payload of --users records (default 100k, 0-3 bots each)
+and times, for every installed codec:
+- encoding the payload
+- decoding it
+- decoding plus the old copying transform vs decoding into the
+  UserRecord objects served by ApiUserRepository
+
+Usage:
+    python -m tools.bench_json_codec --users 100000
+"""
+import argparse
+import asyncio
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+from loguru import logger
+
+from services.json_codec import CODECS, JsonCodec
+from services.json_stream import iter_json_array
+from services.models import UserRecord
+
+
+# Configure loguru
+logger.remove()
+logger.add(
+    sys.stdout,
+    format="<level>{level: <8}</level> | <level>{message}</level>",
+    level="INFO"
+)
+
+
+def build_registry(users: int) -> List[Dict[str, Any]]:
+    """Build a synthetic /users payload."""
+    registry = []
+    for i in range(users):
+        registry.append({
+            "telegram_id": 100000000 + i,
+            "username": f"researcher_{i}",
+            "full_name": f"Researcher Number {i}",
+            "bio": "Builds conversational creatures for the Boto-Sapiens ecosystem.",
+            "interests": "LLMs, automation, digital biology",
+            "created_at": "2025-11-11T10:30:00+00:00",
+            "updated_at": "2025-11-12T08:15:00+00:00",
+            "bots": [
+                {
+                    "id": i * 4 + j,
+                    "bot_username": f"@species_{i}_{j}_bot",
+                    "description": "Observes chats and writes poetic summaries.",
+                    "created_at": "2025-11-11T10:31:00+00:00",
+                    "updated_at": "2025-11-11T10:31:00+00:00",
+                }
+                for j in range(i % 4)
+            ],
+        })
+    return registry
+
+
+def copy_transform(users: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Per-record dict copy, as ApiUserRepository.get_all_users used to do."""
+    return [
+        {
+            "telegram_id": u.get("telegram_id"),
+            "username": u.get("username"),
+            "full_name": u.get("full_name"),
+            "bio": u.get("bio"),
+            "interests": u.get("interests"),
+            "created_at": u.get("created_at"),
+            "updated_at": u.get("updated_at"),
+            "bots": u.get("bots", []),
+        }
+        for u in users
+    ]
+
+
+def to_records(users: List[Dict[str, Any]]) -> List[UserRecord]:
+    """Conversion to the records served by ApiUserRepository."""
+    return [UserRecord.from_api(u) for u in users]
+
+
+def timed(fn: Callable[[], Any], repeat: int) -> float:
+    """Best wall time of fn over repeat runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+async def time_streaming(body: bytes) -> float:
+    """Time incremental parsing of the payload in 64 KiB chunks, in milliseconds."""
+    async def chunks():
+        for offset in range(0, len(body), 65536):
+            yield body[offset:offset + 65536]
+
+    started = time.perf_counter()
+    count = 0
+    async for _ in iter_json_array(chunks()):
+        count += 1
+    return (time.perf_counter() - started) * 1000
+
+
+def main(users: int, repeat: int) -> None:
+    """Run the benchmark for every installed codec."""
+    logger.info(f"Building synthetic registry with {users} users...")
+    registry = build_registry(users)
+    body = JsonCodec().dumps(registry)
+    logger.info(f"Payload size: {len(body) / 1024 / 1024:.1f} MiB")
+
+    for name, codec_cls in CODECS.items():
+        try:
+            codec = codec_cls()
+        except ImportError:
+            logger.warning(f"Skipping {name}: not installed")
+            continue
+
+        encode_ms = timed(lambda: codec.dumps(registry), repeat)
+        decode_ms = timed(lambda: codec.loads(body), repeat)
+        copy_ms = timed(lambda: copy_transform(codec.loads(body)), repeat)
+        records_ms = timed(lambda: to_records(codec.loads(body)), repeat)
+        logger.success(
+            f"{name:>8}: encode={encode_ms:.0f}ms decode={decode_ms:.0f}ms "
+            f"decode+copy={copy_ms:.0f}ms decode+records={records_ms:.0f}ms"
+        )
+
+    stream_ms = asyncio.run(time_streaming(body))
+    logger.info(f"incremental stream parse (stdlib): {stream_ms:.0f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark JSON codecs on a registry payload")
+    parser.add_argument("--users", type=int, default=100_000, help="Number of users in the payload")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    try:
+        main(args.users, args.repeat)
+    except KeyboardInterrupt:
+        logger.info("⚠️  Benchmark cancelled by user")
+        sys.exit(0)
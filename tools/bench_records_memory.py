@@ -0,0 +1,83 @@
+"""Benchmark memory held by the registry as dicts vs slotted records.
+
+Decodes a synthetic /users payload of --users records (default 100k) and
+measures, with tracemalloc, the memory retained by the result and the peak
+while building it for:
+- the decoded dicts as-is
+- decoded dicts plus the old per-record dict copy
+- UserRecord/BotRecord objects, as held by the registry mirror
+
+Usage:
+    python -m tools.bench_records_memory --users 100000
+"""
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Tuple
+
+from loguru import logger
+
+from services.json_codec import JsonCodec
+from tools.bench_json_codec import build_registry, copy_transform, to_records
+
+
+# Configure loguru
+logger.remove()
+logger.add(
+    sys.stdout,
+    format="<level>{level: <8}</level> | <level>{message}</level>",
+    level="INFO"
+)
+
+
+def measure(build: Callable[[], Any]) -> Tuple[int, int, float]:
+    """
+    Run build under tracemalloc.
+
+    Returns:
+        Tuple of (retained bytes, peak bytes, wall time in milliseconds)
+    """
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return retained, peak, elapsed * 1000
+
+
+def main(users: int) -> None:
+    """Run the benchmark."""
+    logger.info(f"Building synthetic registry with {users} users...")
+    codec = JsonCodec()
+    body = codec.dumps(build_registry(users))
+    logger.info(f"Payload size: {len(body) / 1024 / 1024:.1f} MiB")
+
+    variants = {
+        "dicts": lambda: codec.loads(body),
+        "dict copy": lambda: copy_transform(codec.loads(body)),
+        "records": lambda: to_records(codec.loads(body)),
+    }
+    for name, build in variants.items():
+        retained, peak, elapsed_ms = measure(build)
+        logger.success(
+            f"{name:>9}: retained={retained / 1024 / 1024:.1f}MiB "
+            f"({retained / users:.0f} B/user) peak={peak / 1024 / 1024:.1f}MiB time={elapsed_ms:.0f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark registry memory as dicts vs records")
+    parser.add_argument("--users", type=int, default=100_000, help="Number of users in the payload")
+    args = parser.parse_args()
+
+    try:
+        main(args.users)
+    except KeyboardInterrupt:
+        logger.info("⚠️  Benchmark cancelled by user")
+        sys.exit(0)
@@ -0,0 +1,159 @@
+"""Benchmark SymfonyAPI transports (aiohttp HTTP/1.1 vs httpx HTTP/2).
+
+By default a local aiohttp stand-in for BB.Center is started and both
+transports are driven with the same concurrent lookup workload. Note that
+aiohttp's server speaks HTTP/1.1 only and httpx negotiates HTTP/2 via TLS
+ALPN, so against the stand-in both backends use HTTP/1.1; pass --url with an
+https BB.Center endpoint to measure real HTTP/2 multiplexing.
+
+Usage:
+    python -m tools.bench_symfony_transport --requests 5000 --concurrency 200
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from typing import List, Optional
+
+from aiohttp import web
+from loguru import logger
+
+from services.symfony_transport import TRANSPORTS, create_transport
+
+
+# Configure loguru
+logger.remove()
+logger.add(
+    sys.stdout,
+    format="<level>{level: <8}</level> | <level>{message}</level>",
+    level="INFO"
+)
+
+
+def build_stand_in_app(latency: float) -> web.Application:
+    """
+    Build a minimal stand-in for the BB.Center user/bot endpoints.
+
+    Args:
+        latency: Artificial per-request server latency in seconds
+    """
+    async def get_user(request: web.Request) -> web.Response:
+        await asyncio.sleep(latency)
+        telegram_id = request.match_info["telegram_id"]
+        return web.json_response({
+            "telegram_id": telegram_id,
+            "username": f"user_{telegram_id}",
+            "full_name": "Bench User",
+            "bio": "Synthetic researcher",
+            "interests": "bots, benchmarks",
+        })
+
+    async def get_user_bots(request: web.Request) -> web.Response:
+        await asyncio.sleep(latency)
+        telegram_id = request.match_info["telegram_id"]
+        return web.json_response([
+            {"id": i, "bot_username": f"@bench_{telegram_id}_{i}", "description": "Synthetic species"}
+            for i in range(3)
+        ])
+
+    async def health(request: web.Request) -> web.Response:
+        return web.json_response({"status": "ok"})
+
+    app = web.Application()
+    app.router.add_get("/api/telegram/health", health)
+    app.router.add_get("/api/telegram/user/{telegram_id}", get_user)
+    app.router.add_get("/api/telegram/user/{telegram_id}/bots", get_user_bots)
+    return app
+
+
+async def run_workload(transport_name: str, base_url: str, total: int, concurrency: int) -> dict:
+    """
+    Issue total lookups with the given concurrency through one transport.
+
+    Returns:
+        Dict with throughput, latency percentiles and pool stats
+    """
+    transport = create_transport(transport_name, limit=concurrency, limit_per_host=concurrency)
+    latencies: List[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        nonlocal errors
+        suffix = f"/user/{i % 1000}" if i % 2 else f"/user/{i % 1000}/bots"
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await transport.request("GET", f"{base_url}{suffix}")
+                response.json()
+            except Exception:
+                errors += 1
+                return
+            latencies.append(time.perf_counter() - started)
+
+    try:
+        await transport.warm_up(f"{base_url}/health", min(concurrency, 8))
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        elapsed = time.perf_counter() - started
+        stats = transport.stats()
+    finally:
+        await transport.close()
+
+    latencies.sort()
+    return {
+        "transport": transport_name,
+        "requests": total,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2) if latencies else None,
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2) if latencies else None,
+        "pool": stats,
+    }
+
+
+async def main(url: Optional[str], total: int, concurrency: int, latency: float) -> None:
+    """Run the benchmark for every registered transport."""
+    runner = None
+    base_url = url
+    if base_url is None:
+        runner = web.AppRunner(build_stand_in_app(latency), access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        base_url = f"http://127.0.0.1:{port}/api/telegram"
+        logger.info(f"Stand-in BB.Center listening at {base_url}")
+
+    try:
+        for transport_name in TRANSPORTS:
+            try:
+                result = await run_workload(transport_name, base_url.rstrip("/"), total, concurrency)
+            except ImportError as e:
+                logger.warning(f"Skipping {transport_name}: {e}")
+                continue
+            logger.success(
+                f"{result['transport']:>8}: {result['rps']} req/s, "
+                f"p50={result['p50_ms']}ms, p95={result['p95_ms']}ms, errors={result['errors']}"
+            )
+            logger.info(f"          pool: {result['pool']}")
+    finally:
+        if runner is not None:
+            await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark SymfonyAPI transports")
+    parser.add_argument("--url", help="BB.Center base URL (default: local stand-in server)")
+    parser.add_argument("--requests", type=int, default=5000, help="Total number of lookups")
+    parser.add_argument("--concurrency", type=int, default=200, help="Concurrent in-flight lookups")
+    parser.add_argument("--latency", type=float, default=0.005, help="Stand-in server latency, seconds")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(main(args.url, args.requests, args.concurrency, args.latency))
+    except KeyboardInterrupt:
+        logger.info("⚠️  Benchmark cancelled by user")
+        sys.exit(0)
@@ -0,0 +1,58 @@
+"""Purge cached chronicles by prompt version.
+
+By default deletes every entry not generated with the current
+CHRONICLE_PROMPT_VERSION; --prompt-version deletes one version only and
+--all empties the cache. Prints cache stats before and after.
+
+Usage:
+    python -m tools.purge_chronicle_cache [--prompt-version 1 | --all] [--path data/chronicles.sqlite3]
+"""
+import argparse
+import sys
+from typing import Optional
+
+from loguru import logger
+
+from services.chronicle_cache import ChronicleCache
+from services.openai_service import CHRONICLE_PROMPT_VERSION
+
+
+# Configure loguru
+logger.remove()
+logger.add(
+    sys.stdout,
+    format="<level>{level: <8}</level> | <level>{message}</level>",
+    level="INFO"
+)
+
+
+def main(path: str, prompt_version: Optional[str] = None, purge_all: bool = False) -> None:
+    """Purge the chronicle cache at path."""
+    cache = ChronicleCache(path)
+    try:
+        logger.info(f"Before: {cache.stats()}")
+        if purge_all:
+            deleted = cache.purge()
+        elif prompt_version is not None:
+            deleted = cache.purge(prompt_version=prompt_version)
+        else:
+            deleted = cache.purge(keep_version=CHRONICLE_PROMPT_VERSION)
+        logger.success(f"Deleted {deleted} entries")
+        logger.info(f"After: {cache.stats()}")
+    finally:
+        cache.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Purge cached chronicles by prompt version")
+    parser.add_argument("--path", default="data/chronicles.sqlite3", help="Chronicle cache database")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--prompt-version", help="Delete entries of this prompt version only")
+    group.add_argument("--all", action="store_true", help="Delete every entry")
+    args = parser.parse_args()
+
+    try:
+        main(args.path, args.prompt_version, args.all)
+    except KeyboardInterrupt:
+        logger.info("⚠️  Purge cancelled by user")
+        sys.exit(0)